@@ -46,19 +46,25 @@ __all__ = [
     "account",
     "algod",
     "auction",
+    "cache",
     "check_abi_transaction_type",
+    "confirmation",
     "constants",
     "dryrun_results",
     "encoding",
     "error",
+    "follower",
     "indexer",
     "is_abi_reference_type",
     "is_abi_transaction_type",
     "kmd",
     "logic",
     "mnemonic",
+    "responses",
     "source_map",
+    "submission",
     "transaction",
+    "transport",
     "util",
     "v2client",
     "wallet",
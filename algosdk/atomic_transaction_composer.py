@@ -119,11 +119,10 @@ class AccountTransactionSigner(TransactionSigner):
             txn_group (list[Transaction]): atomic group of transactions
             indexes (list[int]): array of indexes in the atomic transaction group that should be signed
         """
-        stxns = []
-        for i in indexes:
-            stxn = txn_group[i].sign(self.private_key)
-            stxns.append(stxn)
-        return stxns
+        stxns = transaction.sign_many(
+            [txn_group[i] for i in indexes], self.private_key
+        )
+        return cast(List[GenericSignedTransaction], stxns)
 
 
 class LogicSigTransactionSigner(TransactionSigner):
@@ -55,8 +55,8 @@ class Bid:
         Returns:
             SignedBid: signed bid with the signature
         """
-        temp = encoding.msgpack_encode(self)
-        to_sign = constants.bid_prefix + base64.b64decode(temp)
+        temp = encoding.msgpack_encode_bytes(self)
+        to_sign = constants.bid_prefix + temp
         private_key = base64.b64decode(private_key)
         signing_key = SigningKey(private_key[: constants.key_len_bytes])
         signed = signing_key.sign(to_sign)
@@ -68,6 +68,8 @@ KEN_LEN_BYTES = 32
 """int: how long addresses are in bytes"""
 ADDRESS_LEN = 58
 """int: how long addresses are in base32, including the checksum"""
+ADDRESS_CACHE_SIZE = 8192
+"""int: how many addresses encoding caches in each direction by default"""
 MNEMONIC_LEN = 25
 """int: how long mnemonic phrases are"""
 MIN_TXN_FEE = 1000
@@ -1,6 +1,8 @@
 import base64
+import threading
 from collections import OrderedDict
-from typing import Union
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Union
 
 import msgpack
 from Cryptodome.Hash import SHA512
@@ -29,11 +31,144 @@ def msgpack_encode(obj):
         the most recent version of msgpack rather than the older msgpack
         version that had no "bin" family).
     """
-    d = obj
-    if not isinstance(obj, dict):
-        d = obj.dictify()
-    od = _sort_dict(d)
-    return base64.b64encode(msgpack.packb(od, use_bin_type=True)).decode()
+    return base64.b64encode(msgpack_encode_bytes(obj)).decode()
+
+
+def msgpack_encode_bytes(obj):
+    """
+    Encode the object using canonical msgpack, returning the raw bytes.
+
+    This is the same encoding as msgpack_encode, without the base64 wrapping,
+    and is what should be hashed, signed, or sent over the wire.
+
+    Args:
+        obj (Transaction, SignedTransaction, MultisigTransaction, Multisig,\
+            Bid, or SignedBid): object to be encoded
+
+    Returns:
+        bytes: canonical msgpack encoded object
+    """
+    if isinstance(obj, dict):
+        return msgpack.packb(_sort_dict(obj), use_bin_type=True)
+    # classes that declare an _encoded slot (Transaction) memoize their
+    # encoding and are responsible for clearing it when they change
+    encoded = getattr(obj, "_encoded", None)
+    if encoded is not None:
+        return encoded
+    cls = type(obj)
+    plan = _canonical_plan(cls)
+    if plan is None:
+        encoded = msgpack.packb(_sort_dict(obj.dictify()), use_bin_type=True)
+    else:
+        encoded = _encode_with_plan(plan, obj)
+    if hasattr(cls, "_encoded"):
+        obj._encoded = encoded
+    return encoded
+
+
+_canonical_plans: Dict[type, Optional[tuple]] = {}
+
+
+def _canonical_plan(cls):
+    """
+    Compile the canonical encoding plan for a class.
+
+    Classes opt in by declaring `_canonical_fields`, a sequence of
+    (key, getter, nested) tuples mirroring what their `dictify` produces.
+    The fields are sorted and their keys packed once per class. A class
+    whose `dictify` is overridden below the declaration of its fields gets
+    no plan, so it keeps being encoded through `dictify`.
+
+    Args:
+        cls (type): class of the object to be encoded
+
+    Returns:
+        tuple: (packed key, getter, nested) tuples sorted by key, or None
+    """
+    try:
+        return _canonical_plans[cls]
+    except KeyError:
+        pass
+    plan = None
+    fields_owner = _defining_class(cls, "_canonical_fields")
+    if fields_owner is not None and fields_owner is _defining_class(
+        cls, "dictify"
+    ):
+        plan = tuple(
+            (msgpack.packb(key), getter, nested)
+            for key, getter, nested in sorted(
+                cls._canonical_fields, key=lambda field: field[0]
+            )
+        )
+    _canonical_plans[cls] = plan
+    return plan
+
+
+def _defining_class(cls, attr):
+    for klass in cls.__mro__:
+        if attr in vars(klass):
+            return klass
+    return None
+
+
+def _encode_with_plan(plan, obj):
+    """
+    Write the canonical msgpack map for obj directly from its attributes.
+
+    Plain values are omitted when they are zero values. Nested values are
+    objects, dicts or lists of objects which are encoded recursively; they
+    are omitted when None or an empty list, matching `_sort_dict`.
+    """
+    parts = []
+    for key, getter, nested in plan:
+        value = getter(obj)
+        if nested:
+            if value is None:
+                continue
+            if isinstance(value, list):
+                if not value:
+                    continue
+                value = _array_header(len(value)) + b"".join(
+                    msgpack_encode_bytes(v) for v in value
+                )
+            else:
+                value = msgpack_encode_bytes(value)
+        elif not value:
+            continue
+        else:
+            value = _pack_value(value)
+        parts.append(key)
+        parts.append(value)
+    return _map_header(len(parts) // 2) + b"".join(parts)
+
+
+_local = threading.local()
+
+
+def _pack_value(value):
+    # msgpack.packb builds a new Packer per call, which dominates the cost of
+    # packing the many small values of a plan; reuse one per thread instead.
+    try:
+        packer = _local.packer
+    except AttributeError:
+        packer = _local.packer = msgpack.Packer(use_bin_type=True)
+    return packer.pack(value)
+
+
+def _map_header(n):
+    if n < 16:
+        return bytes((0x80 | n,))
+    if n < 0x10000:
+        return b"\xde" + n.to_bytes(2, "big")
+    return b"\xdf" + n.to_bytes(4, "big")
+
+
+def _array_header(n):
+    if n < 16:
+        return bytes((0x90 | n,))
+    if n < 0x10000:
+        return b"\xdc" + n.to_bytes(2, "big")
+    return b"\xdd" + n.to_bytes(4, "big")
 
 
 def _sort_dict(d):
@@ -71,28 +206,84 @@ def msgpack_decode(enc):
         decoded = msgpack.unpackb(base64.b64decode(enc), raw=False)
     if "type" in decoded:
         return transaction.Transaction.undictify(decoded)
-    if "l" in decoded:
-        return transaction.LogicSig.undictify(decoded)
-    if "msig" in decoded:
-        return transaction.MultisigTransaction.undictify(decoded)
-    if "lsig" in decoded:
-        if "txn" in decoded:
-            return transaction.LogicSigTransaction.undictify(decoded)
-        return transaction.LogicSigAccount.undictify(decoded)
-    if "sig" in decoded:
-        return transaction.SignedTransaction.undictify(decoded)
-    if "txn" in decoded:
-        return transaction.Transaction.undictify(decoded["txn"])
-    if "subsig" in decoded:
-        return transaction.Multisig.undictify(decoded)
-    if "txlist" in decoded:
-        return transaction.TxGroup.undictify(decoded)
-    if "t" in decoded:
-        return auction.NoteField.undictify(decoded)
-    if "bid" in decoded:
-        return auction.SignedBid.undictify(decoded)
-    if "auc" in decoded:
-        return auction.Bid.undictify(decoded)
+    shape = frozenset(decoded)
+    decode = _decoders_by_shape.get(shape)
+    if decode is None:
+        decode = _decoder_for(shape)
+        if len(_decoders_by_shape) < _MAX_SHAPES:
+            _decoders_by_shape[shape] = decode
+    return decode(decoded)
+
+
+def decode_as(cls, data):
+    """
+    Decode a msgpack encoded object whose type is known in advance.
+
+    Unlike msgpack_decode, the envelope is not inspected to find out what
+    the data holds.
+
+    Args:
+        cls (type): class to decode as, e.g. SignedTransaction or Transaction
+        data (bytes, str, or dict): raw msgpack bytes, the same encoded as
+            base64, or an already unpacked map
+
+    Returns:
+        cls: decoded object
+
+    Raises:
+        TypeError: if data decodes to a transaction that is not a cls
+    """
+    if isinstance(data, str):
+        data = base64.b64decode(data)
+    if not isinstance(data, dict):
+        data = msgpack.unpackb(data, raw=False)
+    obj = cls.undictify(data)
+    if not isinstance(obj, cls):
+        raise TypeError("{} is not a {}".format(obj, cls.__name__))
+    return obj
+
+
+# Envelopes other than bare transactions, recognized by the first key of
+# each rule that they contain; see msgpack_decode.
+def _decoder_for(shape):
+    for key, decode in _envelopes():
+        if key in shape:
+            return decode
+    return _decode_unknown
+
+
+def _envelopes():
+    global _envelope_rules
+    if _envelope_rules is None:
+        # built on first use, after transaction and auction are imported
+        _envelope_rules = (
+            ("l", transaction.LogicSig.undictify),
+            ("msig", transaction.MultisigTransaction.undictify),
+            ("lsig", _decode_lsig_envelope),
+            ("sig", transaction.SignedTransaction.undictify),
+            ("txn", lambda d: transaction.Transaction.undictify(d["txn"])),
+            ("subsig", transaction.Multisig.undictify),
+            ("txlist", transaction.TxGroup.undictify),
+            ("t", auction.NoteField.undictify),
+            ("bid", auction.SignedBid.undictify),
+            ("auc", auction.Bid.undictify),
+        )
+    return _envelope_rules
+
+
+def _decode_lsig_envelope(d):
+    if "txn" in d:
+        return transaction.LogicSigTransaction.undictify(d)
+    return transaction.LogicSigAccount.undictify(d)
+
+
+def _decode_unknown(d):
+    return None
+
+
+_envelope_rules = None
+_decoders_by_shape: Dict[frozenset, Callable] = {}
+_MAX_SHAPES = 256
 
 
 def is_valid_address(addr):
@@ -122,6 +313,8 @@ def decode_address(addr):
     """
     Decode a string address into its address bytes and checksum.
 
+    Recently used addresses are cached, see address_cache_info.
+
     Args:
         addr (str): base32 address
 
@@ -131,6 +324,10 @@ def decode_address(addr):
     """
     if not addr:
         return addr
+    return _decode_address_cached(addr)
+
+
+def _decode_address(addr):
     if not len(addr) == constants.address_len:
         raise error.WrongKeyLengthError
     decoded = base64.b32decode(_correct_padding(addr))
@@ -149,6 +346,8 @@ def encode_address(addr_bytes):
     Encode a byte address into a string composed of the encoded bytes and the
     checksum.
 
+    Recently used addresses are cached, see address_cache_info.
+
     Args:
         addr_bytes (bytes): address in bytes
 
@@ -157,6 +356,13 @@ def encode_address(addr_bytes):
     """
     if not addr_bytes:
         return addr_bytes
+    if not isinstance(addr_bytes, bytes):
+        # e.g. bytearray or memoryview, which are not hashable
+        addr_bytes = bytes(memoryview(addr_bytes))
+    return _encode_address_cached(addr_bytes)
+
+
+def _encode_address(addr_bytes):
     if not len(addr_bytes) == constants.key_len_bytes:
         raise error.WrongKeyBytesLengthError
     chksum = _checksum(addr_bytes)
@@ -164,6 +370,87 @@ def encode_address(addr_bytes):
     return _undo_padding(addr.decode())
 
 
+def decode_addresses(addrs):
+    """
+    Decode many string addresses, see decode_address.
+
+    Args:
+        addrs (list[str]): base32 addresses
+
+    Returns:
+        list[bytes]: addresses decoded into bytes
+    """
+    decode = _decode_address_cached
+    return [decode(addr) if addr else addr for addr in addrs]
+
+
+def encode_addresses(addrs):
+    """
+    Encode many byte addresses, see encode_address.
+
+    Args:
+        addrs (list[bytes]): addresses in bytes
+
+    Returns:
+        list[str]: base32 encoded addresses
+    """
+    return [encode_address(addr) for addr in addrs]
+
+
+_decode_address_cached = lru_cache(maxsize=constants.ADDRESS_CACHE_SIZE)(
+    _decode_address
+)
+_encode_address_cached = lru_cache(maxsize=constants.ADDRESS_CACHE_SIZE)(
+    _encode_address
+)
+
+
+def set_address_cache_size(maxsize):
+    """
+    Resize the address caches used by encode_address and decode_address,
+    discarding their contents and statistics.
+
+    Args:
+        maxsize (int): number of addresses to keep in each direction; 0
+            disables caching
+    """
+    global _decode_address_cached, _encode_address_cached
+    _decode_address_cached = lru_cache(maxsize=maxsize)(_decode_address)
+    _encode_address_cached = lru_cache(maxsize=maxsize)(_encode_address)
+
+
+def clear_address_cache():
+    """Empty the address caches and reset their statistics."""
+    _decode_address_cached.cache_clear()
+    _encode_address_cached.cache_clear()
+
+
+def address_cache_info():
+    """
+    Get usage statistics for the address caches.
+
+    Returns:
+        dict: for each of "encode" and "decode", a dict with the number of
+            "hits" and "misses", the "hit_rate", and the current and maximum
+            number of cached addresses ("size" and "maxsize")
+    """
+    info = {}
+    for name, cached in (
+        ("encode", _encode_address_cached),
+        ("decode", _decode_address_cached),
+    ):
+        stats = cached.cache_info()
+        lookups = stats.hits + stats.misses
+        info[name] = {
+            "hits": stats.hits,
+            "misses": stats.misses,
+            "hit_rate": stats.hits / lookups if lookups else 0.0,
+            "size": stats.currsize,
+            "maxsize": stats.maxsize,
+        }
+    return info
+
+
 def _checksum(addr):
     """
     Compute the checksum of size checkSumLenBytes for the address.
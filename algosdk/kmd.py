@@ -1,10 +1,9 @@
 import base64
 import json
-import urllib.error
 from urllib import parse
-from urllib.request import Request, urlopen
 
 from . import constants, encoding, error, transaction
+from .v2client import transport as transport_
 
 api_version_path_prefix = "/v1"
 
@@ -16,15 +15,19 @@ class KMDClient:
     Args:
         kmd_token (str): kmd API token
         kmd_address (str): kmd address
+        transport (Transport, optional): sends the requests; defaults to
+            transport.default_transport()
 
     Attributes:
         kmd_token (str)
         kmd_address (str)
+        transport (Transport)
     """
 
-    def __init__(self, kmd_token, kmd_address):
+    def __init__(self, kmd_token, kmd_address, transport=None):
         self.kmd_token = kmd_token
         self.kmd_address = kmd_address
+        self.transport = transport or transport_.default_transport()
 
     def kmd_request(self, method, requrl, params=None, data=None):
         """
@@ -51,19 +54,17 @@ class KMDClient:
         if data:
             data = json.dumps(data, indent=2)
             data = bytearray(data, "utf-8")
-        req = Request(
-            self.kmd_address + requrl, headers=header, method=method, data=data
+        resp = self.transport.request(
+            method, self.kmd_address + requrl, headers=header, data=data
         )
-        resp = None
-        try:
-            resp = urlopen(req)
-        except urllib.error.HTTPError as e:
-            e = e.read().decode("utf-8")
-            try:
-                raise error.KMDHTTPError(json.loads(e)["message"])
-            except:
-                raise error.KMDHTTPError(e)
-        return json.loads(resp.read().decode("utf-8"))
+        with resp:
+            if not 200 <= resp.status < 300:
+                e = resp.read().decode("utf-8")
+                try:
+                    raise error.KMDHTTPError(json.loads(e)["message"])
+                except:
+                    raise error.KMDHTTPError(e)
+            return json.loads(resp.read().decode("utf-8"))
 
     def versions(self):
         """
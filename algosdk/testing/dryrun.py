@@ -6,7 +6,7 @@ from typing import Union, List, Optional
 
 from algosdk.constants import payment_txn, appcall_txn, ZERO_ADDRESS
 from algosdk import transaction
-from algosdk.encoding import encode_address, msgpack_encode
+from algosdk.encoding import encode_address, msgpack_encode_bytes
 from algosdk.v2client.models import (
     DryrunRequest,
     DryrunSource,
@@ -832,8 +832,7 @@ class Helper:
         else:
             fp = name_or_fp
 
-        data = msgpack_encode(req)
-        data = base64.b64decode(data)
+        data = msgpack_encode_bytes(req)
 
         fp.write(data)
         if need_close:
@@ -1,7 +1,12 @@
 import base64
 import binascii
+import io
+import mmap
 import msgpack
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from enum import IntEnum
+from operator import attrgetter
 from typing import List, Union, Optional, cast
 from collections import OrderedDict
 
@@ -11,6 +16,47 @@ from algosdk.v2client import algod, models
 from nacl.exceptions import BadSignatureError
 from nacl.signing import SigningKey, VerifyKey
 
+# Bytes added when an encoded transaction is wrapped in a single signature
+# envelope: {"sig": <64 byte signature>, "txn": <encoded transaction>}
+_SIGNED_TXN_OVERHEAD = (
+    len(msgpack.packb({"sig": bytes(64), "txn": {}}, use_bin_type=True)) - 1
+)
+
+
+# Getters used to declare the `_canonical_fields` of encodable classes, see
+# encoding.msgpack_encode_bytes. Each field is a (key, getter, nested) tuple.
+def _value(key, attr):
+    return (key, attrgetter(attr), False)
+
+
+def _nested(key, attr):
+    return (key, attrgetter(attr), True)
+
+
+def _address(key, attr):
+    get = attrgetter(attr)
+    return (key, lambda obj: encoding.decode_address(get(obj)), False)
+
+
+def _nonzero_address(key, attr):
+    get = attrgetter(attr)
+
+    def getter(obj):
+        decoded = encoding.decode_address(get(obj))
+        return decoded if any(decoded) else None
+
+    return (key, getter, False)
+
+
+def _b64(key, attr):
+    get = attrgetter(attr)
+
+    def getter(obj):
+        value = get(obj)
+        return base64.b64decode(value) if value is not None else None
+
+    return (key, getter, False)
+
 
 class SuggestedParams:
     """
@@ -63,8 +109,17 @@ class SuggestedParams:
 class Transaction:
     """
     Superclass for various transaction types.
+
+    The canonical encoding and the transaction ID are computed at most once
+    per state: assigning (or deleting) any attribute clears them. Mutating a
+    field in place, e.g. appending to app_args, does not; reassign the field
+    instead.
     """
 
+    # memoized canonical encoding and txid, see __setattr__
+    _encoded = None
+    _txid = None
+
     def __init__(self, sender, sp, note, lease, txn_type, rekey_to):
         self.sender = sender
         self.fee = sp.fee
@@ -118,11 +173,14 @@ class Transaction:
         Returns:
             str: transaction ID
         """
-        txn = encoding.msgpack_encode(self)
-        to_sign = constants.txid_prefix + base64.b64decode(txn)
+        if self._txid is not None:
+            return self._txid
+        txn = encoding.msgpack_encode_bytes(self)
+        to_sign = constants.txid_prefix + txn
         txid = encoding.checksum(to_sign)
         txid = base64.b32encode(txid).decode()
-        return encoding._undo_padding(txid)
+        self._txid = encoding._undo_padding(txid)
+        return self._txid
 
     def sign(self, private_key):
         """
@@ -137,27 +195,12 @@ class Transaction:
         sig = self.raw_sign(private_key)
         sig = base64.b64encode(sig).decode()
         authorizing_address = None
-        if not (self.sender == account.address_from_private_key(private_key)):
-            authorizing_address = account.address_from_private_key(private_key)
+        address = account.address_from_private_key(private_key)
+        if not (self.sender == address):
+            authorizing_address = address
         stx = SignedTransaction(self, sig, authorizing_address)
         return stx
 
-    def _sign_and_skip_rekey_check(self, private_key):
-        """
-        Sign the transaction with a private key, skipping rekey check.
-        This is only used for size estimation.
-
-        Args:
-            private_key (str): the private key of the signing account
-
-        Returns:
-            SignedTransaction: signed transaction with the signature
-        """
-        sig = self.raw_sign(private_key)
-        sig = base64.b64encode(sig).decode()
-        stx = SignedTransaction(self, sig)
-        return stx
-
     def raw_sign(self, private_key):
         """
         Sign the transaction.
@@ -169,17 +212,38 @@ class Transaction:
             bytes: signature
         """
         private_key = base64.b64decode(private_key)
-        txn = encoding.msgpack_encode(self)
-        to_sign = constants.txid_prefix + base64.b64decode(txn)
+        txn = encoding.msgpack_encode_bytes(self)
+        to_sign = constants.txid_prefix + txn
         signing_key = SigningKey(private_key[: constants.key_len_bytes])
         signed = signing_key.sign(to_sign)
         sig = signed.signature
         return sig
 
     def estimate_size(self):
-        sk, _ = account.generate_account()
-        stx = self._sign_and_skip_rekey_check(sk)
-        return len(base64.b64decode(encoding.msgpack_encode(stx)))
+        """
+        Estimate the size of the transaction once signed by a single key.
+
+        The signature has a fixed length, so the size is computed from the
+        encoded transaction rather than by actually signing it.
+
+        Returns:
+            int: length in bytes of the encoded signed transaction
+        """
+        return len(encoding.msgpack_encode_bytes(self)) + _SIGNED_TXN_OVERHEAD
+
+    _canonical_fields: tuple = (
+        _value("fee", "fee"),
+        _value("fv", "first_valid_round"),
+        _value("gen", "genesis_id"),
+        _b64("gh", "genesis_hash"),
+        _value("grp", "group"),
+        _value("lv", "last_valid_round"),
+        _value("lx", "lease"),
+        _value("note", "note"),
+        _address("snd", "sender"),
+        _value("type", "type"),
+        _address("rekey", "rekey_to"),
+    )
 
     def dictify(self):
         d = dict()
@@ -206,70 +270,37 @@ class Transaction:
 
     @staticmethod
     def undictify(d):
-        sp = SuggestedParams(
-            d["fee"] if "fee" in d else 0,
-            d["fv"] if "fv" in d else 0,
-            d["lv"],
-            base64.b64encode(d["gh"]).decode(),
-            d["gen"] if "gen" in d else None,
-            flat_fee=True,
-        )
-        args = {
-            "sp": sp,
-            "sender": encoding.encode_address(d["snd"]),
-            "note": d["note"] if "note" in d else None,
-            "lease": d["lx"] if "lx" in d else None,
-            "rekey_to": encoding.encode_address(d["rekey"])
-            if "rekey" in d
-            else None,
-        }
         txn_type = d["type"]
-        if not isinstance(d["type"], str):
+        if not isinstance(txn_type, str):
             txn_type = txn_type.decode()
-        if txn_type == constants.payment_txn:
-            args.update(PaymentTxn._undictify(d))
-            txn = PaymentTxn(**args)
-        elif txn_type == constants.keyreg_txn:
-            if "nonpart" in d and d["nonpart"]:
-                args.update(KeyregNonparticipatingTxn._undictify(d))
-                txn = KeyregNonparticipatingTxn(**args)
-            else:
-                if (
-                    "votekey" not in d
-                    and "selkey" not in d
-                    and "votefst" not in d
-                    and "votelst" not in d
-                    and "votekd" not in d
-                ):
-                    args.update(KeyregOfflineTxn._undictify(d))
-                    txn = KeyregOfflineTxn(**args)
-                else:
-                    args.update(KeyregOnlineTxn._undictify(d))
-                    txn = KeyregOnlineTxn(**args)
-        elif txn_type == constants.assetconfig_txn:
-            args.update(AssetConfigTxn._undictify(d))
-            txn = AssetConfigTxn(**args)
-        elif txn_type == constants.assetfreeze_txn:
-            args.update(AssetFreezeTxn._undictify(d))
-            txn = AssetFreezeTxn(**args)
-        elif txn_type == constants.assettransfer_txn:
-            args.update(AssetTransferTxn._undictify(d))
-            txn = AssetTransferTxn(**args)
-        elif txn_type == constants.appcall_txn:
-            args.update(ApplicationCallTxn._undictify(d))
-            txn = ApplicationCallTxn(**args)
-        elif txn_type == constants.stateproof_txn:
-            # a state proof txn does not have these fields
-            args.pop("note"), args.pop("rekey_to"), args.pop("lease")
-            args.update(StateProofTxn._undictify(d))
-            txn = StateProofTxn(**args)
-        if "grp" in d:
-            txn.group = d["grp"]
+        cls = _transaction_types[txn_type]._undictify_class(d)
+        txn = cls.__new__(cls)
+        # set the attributes directly, in the order the constructors do
+        attrs = txn.__dict__
+        attrs["sender"] = encoding.encode_address(d["snd"])
+        attrs["fee"] = d.get("fee", 0)
+        attrs["first_valid_round"] = d.get("fv", 0)
+        attrs["last_valid_round"] = d["lv"]
+        attrs["note"] = Transaction.as_note(d.get("note"))
+        attrs["genesis_id"] = d.get("gen")
+        attrs["genesis_hash"] = base64.b64encode(d["gh"]).decode()
+        attrs["group"] = d.get("grp")
+        attrs["lease"] = Transaction.as_lease(d.get("lx"))
+        attrs["type"] = txn_type
+        attrs["rekey_to"] = (
+            encoding.encode_address(d["rekey"]) if "rekey" in d else None
+        )
+        attrs.update(cls._undictify(d))
         return txn
 
+    @classmethod
+    def _undictify_class(cls, d):
+        """The class to decode d, a dictified transaction of this type, as."""
+        return cls
+
     def __eq__(self, other):
         if not isinstance(other, Transaction):
-            return False
+            return NotImplemented
         return (
             self.sender == other.sender
             and self.fee == other.fee
@@ -306,8 +337,36 @@ class Transaction:
             raise IndexError(i)
         return i
 
+    def __setattr__(self, name, value):
+        d = self.__dict__
+        if (
+            ("_encoded" in d or "_txid" in d)
+            and name != "_encoded"
+            and name != "_txid"
+        ):
+            self._clear_cache()
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        self._clear_cache()
+        if name != "_encoded" and name != "_txid":
+            object.__delattr__(self, name)
+
+    def _clear_cache(self):
+        d = self.__dict__
+        if "_encoded" in d:
+            del d["_encoded"]
+        if "_txid" in d:
+            del d["_txid"]
+
     def __str__(self):
-        return str(self.__dict__)
+        return str(
+            {
+                k: v
+                for k, v in self.__dict__.items()
+                if k != "_encoded" and k != "_txid"
+            }
+        )
 
 
 class PaymentTxn(Transaction):
@@ -372,6 +431,12 @@ class PaymentTxn(Transaction):
                 self.estimate_size() * self.fee, constants.min_txn_fee
             )
 
+    _canonical_fields = Transaction._canonical_fields + (
+        _value("amt", "amt"),
+        _address("close", "close_remainder_to"),
+        _nonzero_address("rcv", "receiver"),
+    )
+
     def dictify(self):
         d = dict()
         if self.amt:
@@ -390,20 +455,22 @@ class PaymentTxn(Transaction):
 
     @staticmethod
     def _undictify(d):
-        args = {
-            "close_remainder_to": encoding.encode_address(d["close"])
-            if "close" in d
-            else None,
-            "amt": d["amt"] if "amt" in d else 0,
+        amt = d.get("amt", 0)
+        if (not isinstance(amt, int)) or amt < 0:
+            raise error.WrongAmountType
+        return {
             "receiver": encoding.encode_address(d["rcv"])
             if "rcv" in d
             else constants.ZERO_ADDRESS,
+            "amt": amt,
+            "close_remainder_to": encoding.encode_address(d["close"])
+            if "close" in d
+            else None,
         }
-        return args
 
     def __eq__(self, other):
         if not isinstance(other, PaymentTxn):
-            return False
+            return NotImplemented
         return (
             super(PaymentTxn, self).__eq__(other)
             and self.receiver == other.receiver
@@ -484,6 +551,30 @@ class KeyregTxn(Transaction):
                 self.estimate_size() * self.fee, constants.min_txn_fee
             )
 
+    _canonical_fields = Transaction._canonical_fields + (
+        _b64("selkey", "selkey"),
+        _value("votefst", "votefst"),
+        _value("votekd", "votekd"),
+        _b64("votekey", "votepk"),
+        _value("votelst", "votelst"),
+        _value("nonpart", "nonpart"),
+        _b64("sprfkey", "sprfkey"),
+    )
+
+    @classmethod
+    def _undictify_class(cls, d):
+        if d.get("nonpart"):
+            return KeyregNonparticipatingTxn
+        if (
+            "votekey" not in d
+            and "selkey" not in d
+            and "votefst" not in d
+            and "votelst" not in d
+            and "votekd" not in d
+        ):
+            return KeyregOfflineTxn
+        return KeyregOnlineTxn
+
     def dictify(self):
         d = {}
         if self.selkey is not None:
@@ -508,7 +599,7 @@ class KeyregTxn(Transaction):
 
     def __eq__(self, other):
         if not isinstance(other, KeyregTxn):
-            return False
+            return NotImplemented
         return (
             super(KeyregTxn, self).__eq__(other)
             and self.votepk == other.votepk
@@ -613,36 +704,21 @@ class KeyregOnlineTxn(KeyregTxn):
 
     @staticmethod
     def _undictify(d):
-        votekey = base64.b64encode(d["votekey"]).decode()
-        selkey = base64.b64encode(d["selkey"]).decode()
-        votefst = d["votefst"]
-        votelst = d["votelst"]
-        votekd = d["votekd"]
-        if "sprfkey" in d:
-            sprfID = base64.b64encode(d["sprfkey"]).decode()
-
-            args = {
-                "votekey": votekey,
-                "selkey": selkey,
-                "votefst": votefst,
-                "votelst": votelst,
-                "votekd": votekd,
-                "sprfkey": sprfID,
-            }
-        else:
-            args = {
-                "votekey": votekey,
-                "selkey": selkey,
-                "votefst": votefst,
-                "votelst": votelst,
-                "votekd": votekd,
-            }
-
-        return args
+        return {
+            "votepk": base64.b64encode(d["votekey"]).decode(),
+            "selkey": base64.b64encode(d["selkey"]).decode(),
+            "votefst": d["votefst"],
+            "votelst": d["votelst"],
+            "votekd": d["votekd"],
+            "nonpart": False,
+            "sprfkey": base64.b64encode(d["sprfkey"]).decode()
+            if "sprfkey" in d
+            else None,
+        }
 
     def __eq__(self, other):
         if not isinstance(other, KeyregOnlineTxn):
-            return False
+            return NotImplemented
         return super(KeyregOnlineTxn, self).__eq__(other)
 
 
@@ -697,12 +773,19 @@ class KeyregOfflineTxn(KeyregTxn):
 
     @staticmethod
     def _undictify(d):
-        args = {}
-        return args
+        return {
+            "votepk": None,
+            "selkey": None,
+            "votefst": None,
+            "votelst": None,
+            "votekd": None,
+            "nonpart": False,
+            "sprfkey": None,
+        }
 
     def __eq__(self, other):
         if not isinstance(other, KeyregOfflineTxn):
-            return False
+            return NotImplemented
         return super(KeyregOfflineTxn, self).__eq__(other)
 
 
@@ -757,15 +840,92 @@ class KeyregNonparticipatingTxn(KeyregTxn):
 
     @staticmethod
     def _undictify(d):
-        args = {}
-        return args
+        return {
+            "votepk": None,
+            "selkey": None,
+            "votefst": None,
+            "votelst": None,
+            "votekd": None,
+            "nonpart": True,
+            "sprfkey": None,
+        }
 
     def __eq__(self, other):
         if not isinstance(other, KeyregNonparticipatingTxn):
-            return False
+            return NotImplemented
         return super(KeyregNonparticipatingTxn, self).__eq__(other)
 
 
+class _AssetParams:
+    """
+    The asset parameters ("apar") of an asset configuration transaction.
+
+    Args:
+        txn (AssetConfigTxn): transaction holding the parameters
+    """
+
+    def __init__(self, txn):
+        self.txn = txn
+
+    @staticmethod
+    def of(txn):
+        """Return the parameters of txn, or None if it sets none of them."""
+        if (
+            txn.total
+            or txn.default_frozen
+            or txn.unit_name
+            or txn.asset_name
+            or txn.manager
+            or txn.reserve
+            or txn.freeze
+            or txn.clawback
+            or txn.decimals
+        ):
+            return _AssetParams(txn)
+        return None
+
+    _canonical_fields = (
+        _value("am", "txn.metadata_hash"),
+        _value("an", "txn.asset_name"),
+        _value("au", "txn.url"),
+        _address("c", "txn.clawback"),
+        _value("dc", "txn.decimals"),
+        _value("df", "txn.default_frozen"),
+        _address("f", "txn.freeze"),
+        _address("m", "txn.manager"),
+        _address("r", "txn.reserve"),
+        _value("t", "txn.total"),
+        _value("un", "txn.unit_name"),
+    )
+
+    def dictify(self):
+        txn = self.txn
+        apar = OrderedDict()
+        if txn.metadata_hash:
+            apar["am"] = txn.metadata_hash
+        if txn.asset_name:
+            apar["an"] = txn.asset_name
+        if txn.url:
+            apar["au"] = txn.url
+        if txn.clawback:
+            apar["c"] = encoding.decode_address(txn.clawback)
+        if txn.decimals:
+            apar["dc"] = txn.decimals
+        if txn.default_frozen:
+            apar["df"] = txn.default_frozen
+        if txn.freeze:
+            apar["f"] = encoding.decode_address(txn.freeze)
+        if txn.manager:
+            apar["m"] = encoding.decode_address(txn.manager)
+        if txn.reserve:
+            apar["r"] = encoding.decode_address(txn.reserve)
+        if txn.total:
+            apar["t"] = txn.total
+        if txn.unit_name:
+            apar["un"] = txn.unit_name
+        return apar
+
+
 class AssetConfigTxn(Transaction):
     """
     Represents a transaction for asset creation, reconfiguration, or
@@ -890,44 +1050,17 @@ class AssetConfigTxn(Transaction):
                 self.estimate_size() * self.fee, constants.min_txn_fee
             )
 
+    _canonical_fields = Transaction._canonical_fields + (
+        ("apar", _AssetParams.of, True),
+        _value("caid", "index"),
+    )
+
     def dictify(self):
         d = dict()
 
-        if (
-            self.total
-            or self.default_frozen
-            or self.unit_name
-            or self.asset_name
-            or self.manager
-            or self.reserve
-            or self.freeze
-            or self.clawback
-            or self.decimals
-        ):
-            apar = OrderedDict()
-            if self.metadata_hash:
-                apar["am"] = self.metadata_hash
-            if self.asset_name:
-                apar["an"] = self.asset_name
-            if self.url:
-                apar["au"] = self.url
-            if self.clawback:
-                apar["c"] = encoding.decode_address(self.clawback)
-            if self.decimals:
-                apar["dc"] = self.decimals
-            if self.default_frozen:
-                apar["df"] = self.default_frozen
-            if self.freeze:
-                apar["f"] = encoding.decode_address(self.freeze)
-            if self.manager:
-                apar["m"] = encoding.decode_address(self.manager)
-            if self.reserve:
-                apar["r"] = encoding.decode_address(self.reserve)
-            if self.total:
-                apar["t"] = self.total
-            if self.unit_name:
-                apar["un"] = self.unit_name
-            d["apar"] = apar
+        apar = _AssetParams.of(self)
+        if apar:
+            d["apar"] = apar.dictify()
 
         if self.index:
             d["caid"] = self.index
@@ -939,66 +1072,36 @@ class AssetConfigTxn(Transaction):
 
     @staticmethod
     def _undictify(d):
-        index = None
-        total = None
-        default_frozen = None
-        unit_name = None
-        asset_name = None
-        manager = None
-        reserve = None
-        freeze = None
-        clawback = None
-        url = None
-        metadata_hash = None
-        decimals = 0
-
-        if "caid" in d:
-            index = d["caid"]
-        if "apar" in d:
-            if "t" in d["apar"]:
-                total = d["apar"]["t"]
-            if "df" in d["apar"]:
-                default_frozen = d["apar"]["df"]
-            if "un" in d["apar"]:
-                unit_name = d["apar"]["un"]
-            if "an" in d["apar"]:
-                asset_name = d["apar"]["an"]
-            if "m" in d["apar"]:
-                manager = encoding.encode_address(d["apar"]["m"])
-            if "r" in d["apar"]:
-                reserve = encoding.encode_address(d["apar"]["r"])
-            if "f" in d["apar"]:
-                freeze = encoding.encode_address(d["apar"]["f"])
-            if "c" in d["apar"]:
-                clawback = encoding.encode_address(d["apar"]["c"])
-            if "au" in d["apar"]:
-                url = d["apar"]["au"]
-            if "am" in d["apar"]:
-                metadata_hash = d["apar"]["am"]
-            if "dc" in d["apar"]:
-                decimals = d["apar"]["dc"]
-
-        args = {
-            "index": index,
-            "total": total,
-            "default_frozen": default_frozen,
-            "unit_name": unit_name,
-            "asset_name": asset_name,
-            "manager": manager,
-            "reserve": reserve,
-            "freeze": freeze,
-            "clawback": clawback,
-            "url": url,
-            "metadata_hash": metadata_hash,
-            "strict_empty_address_check": False,
+        apar = d.get("apar", {})
+        decimals = int(apar.get("dc", 0))
+        if decimals < 0 or decimals > constants.max_asset_decimals:
+            raise error.OutOfRangeDecimalsError
+        return {
+            "index": Transaction.creatable_index(d.get("caid")),
+            "total": int(apar["t"]) if apar.get("t") else None,
+            "default_frozen": bool(apar.get("df")),
+            "unit_name": apar.get("un"),
+            "asset_name": apar.get("an"),
+            "manager": encoding.encode_address(apar["m"])
+            if "m" in apar
+            else None,
+            "reserve": encoding.encode_address(apar["r"])
+            if "r" in apar
+            else None,
+            "freeze": encoding.encode_address(apar["f"])
+            if "f" in apar
+            else None,
+            "clawback": encoding.encode_address(apar["c"])
+            if "c" in apar
+            else None,
+            "url": apar.get("au"),
+            "metadata_hash": AssetConfigTxn.as_metadata(apar.get("am")),
             "decimals": decimals,
         }
 
-        return args
-
     def __eq__(self, other):
         if not isinstance(other, AssetConfigTxn):
-            return False
+            return NotImplemented
         return (
             super(AssetConfigTxn, self).__eq__(other)
             and self.index == other.index
@@ -1245,6 +1348,12 @@ class AssetFreezeTxn(Transaction):
                 self.estimate_size() * self.fee, constants.min_txn_fee
             )
 
+    _canonical_fields = Transaction._canonical_fields + (
+        _value("afrz", "new_freeze_state"),
+        _address("fadd", "target"),
+        _value("faid", "index"),
+    )
+
     def dictify(self):
         d = dict()
         if self.new_freeze_state:
@@ -1261,17 +1370,15 @@ class AssetFreezeTxn(Transaction):
 
     @staticmethod
     def _undictify(d):
-        args = {
-            "index": d["faid"],
-            "new_freeze_state": d["afrz"] if "afrz" in d else False,
+        return {
+            "index": Transaction.creatable_index(d["faid"], required=True),
             "target": encoding.encode_address(d["fadd"]),
+            "new_freeze_state": d.get("afrz", False),
         }
 
-        return args
-
     def __eq__(self, other):
         if not isinstance(other, AssetFreezeTxn):
-            return False
+            return NotImplemented
         return (
             super(AssetFreezeTxn, self).__eq__(other)
             and self.index == other.index
@@ -1363,6 +1470,14 @@ class AssetTransferTxn(Transaction):
                 self.estimate_size() * self.fee, constants.min_txn_fee
             )
 
+    _canonical_fields = Transaction._canonical_fields + (
+        _value("aamt", "amount"),
+        _address("aclose", "close_assets_to"),
+        _nonzero_address("arcv", "receiver"),
+        _address("asnd", "revocation_target"),
+        _value("xaid", "index"),
+    )
+
     def dictify(self):
         d = dict()
 
@@ -1387,12 +1502,15 @@ class AssetTransferTxn(Transaction):
 
     @staticmethod
     def _undictify(d):
-        args = {
+        amount = d.get("aamt", 0)
+        if (not isinstance(amount, int)) or amount < 0:
+            raise error.WrongAmountType
+        return {
             "receiver": encoding.encode_address(d["arcv"])
             if "arcv" in d
             else constants.ZERO_ADDRESS,
-            "amt": d["aamt"] if "aamt" in d else 0,
-            "index": d["xaid"] if "xaid" in d else None,
+            "amount": amount,
+            "index": Transaction.creatable_index(d.get("xaid"), required=True),
             "close_assets_to": encoding.encode_address(d["aclose"])
             if "aclose" in d
             else None,
@@ -1401,11 +1519,9 @@ class AssetTransferTxn(Transaction):
             else None,
         }
 
-        return args
-
     def __eq__(self, other):
         if not isinstance(other, AssetTransferTxn):
-            return False
+            return NotImplemented
         return (
             super(AssetTransferTxn, self).__eq__(other)
             and self.index == other.index
@@ -1497,6 +1613,11 @@ class StateSchema:
         self.num_uints = num_uints
         self.num_byte_slices = num_byte_slices
 
+    _canonical_fields = (
+        _value("nui", "num_uints"),
+        _value("nbs", "num_byte_slices"),
+    )
+
     def dictify(self):
         d = dict()
         if self.num_uints:
@@ -1668,6 +1789,27 @@ class ApplicationCallTxn(Transaction):
             return None
         return [int(elt) for elt in lst]
 
+    _canonical_fields = Transaction._canonical_fields + (
+        _value("apid", "index"),
+        _value("apan", "on_complete"),
+        _nested("apls", "local_schema"),
+        _nested("apgs", "global_schema"),
+        _value("apap", "approval_program"),
+        _value("apsu", "clear_program"),
+        _value("apaa", "app_args"),
+        (
+            "apat",
+            lambda txn: [encoding.decode_address(a) for a in txn.accounts]
+            if txn.accounts
+            else None,
+            False,
+        ),
+        _value("apfa", "foreign_apps"),
+        _value("apas", "foreign_assets"),
+        _value("apep", "extra_pages"),
+        _nested("apbx", "boxes"),
+    )
+
     def dictify(self):
         d = dict()
         if self.index:
@@ -1704,36 +1846,36 @@ class ApplicationCallTxn(Transaction):
 
     @staticmethod
     def _undictify(d):
-        args = {
-            "index": d["apid"] if "apid" in d else None,
-            "on_complete": d["apan"] if "apan" in d else None,
-            "local_schema": StateSchema.undictify(d["apls"])
+        return {
+            "index": Transaction.creatable_index(d.get("apid")),
+            "on_complete": d.get("apan") or 0,
+            "local_schema": ApplicationCallTxn.state_schema(
+                StateSchema.undictify(d["apls"])
+            )
             if "apls" in d
             else None,
-            "global_schema": StateSchema.undictify(d["apgs"])
+            "global_schema": ApplicationCallTxn.state_schema(
+                StateSchema.undictify(d["apgs"])
+            )
             if "apgs" in d
             else None,
-            "approval_program": d["apap"] if "apap" in d else None,
-            "clear_program": d["apsu"] if "apsu" in d else None,
-            "app_args": d["apaa"] if "apaa" in d else None,
-            "accounts": d["apat"] if "apat" in d else None,
-            "foreign_apps": d["apfa"] if "apfa" in d else None,
-            "foreign_assets": d["apas"] if "apas" in d else None,
-            "extra_pages": d["apep"] if "apep" in d else 0,
+            "approval_program": ApplicationCallTxn.teal_bytes(d.get("apap")),
+            "clear_program": ApplicationCallTxn.teal_bytes(d.get("apsu")),
+            "app_args": ApplicationCallTxn.bytes_list(d.get("apaa")),
+            "accounts": encoding.encode_addresses(d["apat"])
+            if d.get("apat")
+            else None,
+            "foreign_apps": ApplicationCallTxn.int_list(d.get("apfa")),
+            "foreign_assets": ApplicationCallTxn.int_list(d.get("apas")),
+            "extra_pages": d.get("apep", 0),
             "boxes": [BoxReference.undictify(box) for box in d["apbx"]]
             if "apbx" in d
-            else None,
+            else [],
         }
-        if args["accounts"]:
-            args["accounts"] = [
-                encoding.encode_address(account_bytes)
-                for account_bytes in args["accounts"]
-            ]
-        return args
 
     def __eq__(self, other):
         if not isinstance(other, ApplicationCallTxn):
-            return False
+            return NotImplemented
         return (
             super(ApplicationCallTxn, self).__eq__(other)
             and self.index == other.index
@@ -2169,6 +2311,18 @@ class SignedTransaction:
         """
         return self.transaction.get_txid()
 
+    _canonical_fields = (
+        (
+            "sig",
+            lambda stx: base64.b64decode(stx.signature)
+            if stx.signature
+            else None,
+            False,
+        ),
+        _nested("txn", "transaction"),
+        _address("sgnr", "authorizing_address"),
+    )
+
     def dictify(self):
         od = OrderedDict()
         if self.signature:
@@ -2260,6 +2414,12 @@ class MultisigTransaction:
         """
         return self.transaction.get_txid()
 
+    _canonical_fields = (
+        _nested("msig", "multisig"),
+        _address("sgnr", "auth_addr"),
+        _nested("txn", "transaction"),
+    )
+
     def dictify(self):
         od = OrderedDict()
         if self.multisig:
@@ -2418,6 +2578,12 @@ class Multisig:
 
         return True
 
+    _canonical_fields = (
+        _nested("subsig", "subsigs"),
+        _value("thr", "threshold"),
+        _value("v", "version"),
+    )
+
     def dictify(self):
         od = OrderedDict()
         od["subsig"] = [subsig.dictify() for subsig in self.subsigs]
@@ -2473,6 +2639,11 @@ class MultisigSubsig:
         self.public_key = public_key
         self.signature = signature
 
+    _canonical_fields = (
+        _value("pk", "public_key"),
+        _value("s", "signature"),
+    )
+
     def dictify(self):
         od = OrderedDict()
         od["pk"] = self.public_key
@@ -2569,6 +2740,17 @@ class LogicSig:
                 "program bytes are all ASCII printable characters, not looking like Teal byte code"
             )
 
+    _canonical_fields = (
+        _value("arg", "args"),
+        _value("l", "logic"),
+        (
+            "sig",
+            lambda lsig: base64.b64decode(lsig.sig) if lsig.sig else None,
+            False,
+        ),
+        ("msig", lambda lsig: None if lsig.sig else lsig.msig, True),
+    )
+
     def dictify(self):
         od = OrderedDict()
         if self.args:
@@ -2737,6 +2919,11 @@ class LogicSigAccount:
         self.lsig = LogicSig(program, args)
         self.sigkey: Optional[bytes] = None
 
+    _canonical_fields = (
+        _nested("lsig", "lsig"),
+        _value("sigkey", "sigkey"),
+    )
+
     def dictify(self):
         od = OrderedDict()
         od["lsig"] = self.lsig.dictify()
@@ -2924,6 +3111,12 @@ class LogicSigTransaction:
         """
         return self.transaction.get_txid()
 
+    _canonical_fields = (
+        _nested("lsig", "lsig"),
+        _address("sgnr", "auth_addr"),
+        _nested("txn", "transaction"),
+    )
+
     def dictify(self):
         od = OrderedDict()
         if self.lsig:
@@ -2998,6 +3191,12 @@ class StateProofTxn(Transaction):
         self.sprf = state_proof
         self.sprfmsg = state_proof_message
 
+    _canonical_fields = Transaction._canonical_fields + (
+        _value("sptype", "sprf_type"),
+        ("spmsg", lambda txn: txn.sprfmsg or None, True),
+        ("sp", lambda txn: txn.sprf or None, True),
+    )
+
     def dictify(self):
         d = dict()
         if self.sprf_type:
@@ -3013,19 +3212,19 @@ class StateProofTxn(Transaction):
 
     @staticmethod
     def _undictify(d):
-        args = {}
-        if "sptype" in d:
-            args["state_proof_type"] = d["sptype"]
-        if "sp" in d:
-            args["state_proof"] = d["sp"]
-        if "spmsg" in d:
-            args["state_proof_message"] = d["spmsg"]
-
-        return args
+        # a state proof txn does not have these fields
+        return {
+            "note": None,
+            "lease": None,
+            "rekey_to": None,
+            "sprf_type": d.get("sptype"),
+            "sprf": d.get("sp"),
+            "sprfmsg": d.get("spmsg"),
+        }
 
     def __eq__(self, other):
         if not isinstance(other, StateProofTxn):
-            return False
+            return NotImplemented
         return (
             super(StateProofTxn, self).__eq__(other)
             and self.sprf_type == other.sprf_type
@@ -3050,21 +3249,8 @@ def write_to_file(txns, path, overwrite=True):
     Returns:
         bool: true if the transactions have been written to the file
     """
-
-    f = None
-    if overwrite:
-        f = open(path, "wb")
-    else:
-        f = open(path, "ab")
-
-    for txn in txns:
-        if isinstance(txn, Transaction):
-            enc = msgpack.packb({"txn": txn.dictify()}, use_bin_type=True)
-            f.write(enc)
-        else:
-            enc = msgpack.packb(txn.dictify(), use_bin_type=True)
-            f.write(enc)
-    f.close()
+    with TransactionFileWriter(path, overwrite) as writer:
+        writer.write_all(txns)
     return True
 
 
@@ -3079,23 +3265,424 @@ def retrieve_from_file(path):
         Transaction[], SignedTransaction[], or MultisigTransaction[]:\
             can be a mix of the three
     """
+    return list(iter_from_file(path))
+
+
+def iter_from_file(path, start=0, use_mmap=False):
+    """
+    Iterate over the signed or unsigned transactions in a file, reading and
+    decoding them one at a time.
+
+    Args:
+        path (str): file to read from
+        start (int, optional): number of transactions to skip; if the file
+            has an index matching it (see TransactionFileWriter), the reader
+            seeks straight to the transaction, otherwise the preceding ones
+            are skipped without being decoded
+        use_mmap (bool, optional): read the file through a memory map
+
+    Yields:
+        Transaction, SignedTransaction, MultisigTransaction, or\
+            LogicSigTransaction: the transactions in the file, in order
+    """
+    with open(path, "rb") as f:
+        if not use_mmap:
+            yield from _iter_records(f, path, start)
+            return
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from _iter_records(mm, path, start)
+
+
+def _iter_records(f, path, start):
+    offset = read_file_index(path, start) if start else None
+    skip = 0
+    if offset is not None:
+        f.seek(offset)
+    else:
+        skip = start
+    unpacker = msgpack.Unpacker(f, raw=False)
+    for _ in range(skip):
+        try:
+            unpacker.skip()
+        except msgpack.OutOfData:
+            return
+    for record in unpacker:
+        txn = encoding.msgpack_decode(record)
+        if txn is not None:
+            yield txn
+
+
+class TransactionFileWriter:
+    """
+    Buffered writer for files of signed or unsigned transactions, in the
+    format read by iter_from_file and retrieve_from_file.
+
+    Transactions are written in their canonical encoding as they are given,
+    so files of any size can be written with bounded memory. Optionally an
+    index is kept next to the file, at index_path(path), holding the offset
+    of each transaction as an 8 byte big-endian integer, so that readers can
+    seek to the Nth transaction.
+
+    Overwriting a file removes its index, unless a new one is written.
+    Appending to a file keeps its index up to date; an index that no longer
+    matches the file is rebuilt if index is set, and removed otherwise.
+
+    Use it as a context manager, or call close when done.
+
+    Args:
+        path (str): file to write to
+        overwrite (bool, optional): whether or not to overwrite what's
+            already in the file; if False, transactions are appended to it
+        index (bool, optional): also write the offset index; when appending
+            to a file with no index, it is built first
+        buffer_size (int, optional): size in bytes of the write buffer
+
+    Attributes:
+        path (str)
+        count (int): number of transactions written by this writer
+    """
+
+    def __init__(
+        self,
+        path,
+        overwrite=True,
+        index=False,
+        buffer_size=io.DEFAULT_BUFFER_SIZE,
+    ):
+        self.path = path
+        self.count = 0
+        self._index = None
+        mode = "wb" if overwrite or not os.path.exists(path) else "ab"
+        idx_path = index_path(path)
+        if mode == "wb":
+            if not index and os.path.exists(idx_path):
+                os.remove(idx_path)
+        elif not _index_is_current(path):
+            if index:
+                build_file_index(path)
+            elif os.path.exists(idx_path):
+                os.remove(idx_path)
+        elif os.path.exists(idx_path):
+            index = True
+        self._file = open(path, mode, buffering=buffer_size)
+        self._offset = self._file.tell()
+        if index:
+            self._index = open(idx_path, mode, buffering=buffer_size)
+
+    def write(self, txn):
+        """
+        Append a transaction.
+
+        Args:
+            txn (Transaction, SignedTransaction, MultisigTransaction,\
+                LogicSigTransaction, or bytes): transaction to write; bytes
+                are written as is and must be a canonically encoded signed
+                transaction
+        """
+        if isinstance(txn, (bytes, bytearray)):
+            record = txn
+        elif isinstance(txn, (Transaction, TransactionView)):
+            record = _UNSIGNED_RECORD + encoding.msgpack_encode_bytes(txn)
+        else:
+            record = encoding.msgpack_encode_bytes(txn)
+        if self._index is not None:
+            self._index.write(self._offset.to_bytes(8, "big"))
+        self._file.write(record)
+        self._offset += len(record)
+        self.count += 1
+
+    def write_all(self, txns):
+        """
+        Append transactions.
+
+        Args:
+            txns (iterable): transactions to write, see write
+        """
+        for txn in txns:
+            self.write(txn)
+
+    def flush(self):
+        """Write out buffered data."""
+        self._file.flush()
+        if self._index is not None:
+            self._index.flush()
+
+    def close(self):
+        """Flush and close the file, and its index."""
+        self._file.close()
+        if self._index is not None:
+            self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# An unsigned transaction is stored as {"txn": <encoded transaction>}
+_UNSIGNED_RECORD = b"\x81" + msgpack.packb("txn")
+
+
+def index_path(path):
+    """
+    Get the path of the offset index of a transaction file.
+
+    Args:
+        path (str): transaction file
+
+    Returns:
+        str: path of its index
+    """
+    return path + ".idx"
+
+
+def build_file_index(path):
+    """
+    Write the offset index of an existing transaction file, see
+    TransactionFileWriter.
+
+    Args:
+        path (str): transaction file
+
+    Returns:
+        int: number of transactions in the file
+    """
+    count = 0
+    with open(path, "rb") as f, open(index_path(path), "wb") as idx:
+        unpacker = msgpack.Unpacker(f)
+        offset = 0
+        while True:
+            try:
+                unpacker.skip()
+            except msgpack.OutOfData:
+                break
+            idx.write(offset.to_bytes(8, "big"))
+            offset = unpacker.tell()
+            count += 1
+    return count
+
+
+def read_file_index(path, n):
+    """
+    Get the offset of the Nth transaction of a file from its index.
+
+    Args:
+        path (str): transaction file
+        n (int): position of the transaction, starting at 0
+
+    Returns:
+        int: offset of the transaction in the file, or None if the file has
+            no index, an index that does not match it, or fewer than n + 1
+            transactions
+    """
+    if not _index_is_current(path):
+        return None
+    try:
+        with open(index_path(path), "rb") as idx:
+            idx.seek(8 * n)
+            entry = idx.read(8)
+    except FileNotFoundError:
+        return None
+    if len(entry) < 8:
+        return None
+    return int.from_bytes(entry, "big")
+
+
+def _index_is_current(path):
+    """
+    Get whether the index of a transaction file matches it: its last entry
+    is the offset of a transaction ending the file.
+    """
+    try:
+        size = os.path.getsize(path)
+        with open(index_path(path), "rb") as idx:
+            index_size = idx.seek(0, os.SEEK_END)
+            if index_size % 8 or index_size > 8 * size:
+                return False
+            if index_size == 0:
+                return size == 0
+            idx.seek(index_size - 8)
+            last = int.from_bytes(idx.read(8), "big")
+    except FileNotFoundError:
+        return False
+    if last >= size:
+        return False
+    with open(path, "rb") as f:
+        f.seek(last)
+        unpacker = msgpack.Unpacker(f)
+        try:
+            unpacker.skip()
+        except (msgpack.UnpackException, ValueError):
+            return False
+        return last + unpacker.tell() == size
+
+
+# Transaction classes by their "type" field, see Transaction.undictify
+_transaction_types = {
+    constants.payment_txn: PaymentTxn,
+    constants.keyreg_txn: KeyregTxn,
+    constants.assetconfig_txn: AssetConfigTxn,
+    constants.assetfreeze_txn: AssetFreezeTxn,
+    constants.assettransfer_txn: AssetTransferTxn,
+    constants.appcall_txn: ApplicationCallTxn,
+    constants.stateproof_txn: StateProofTxn,
+}
+
+
+def _view_address(d, key, default=None):
+    return encoding.encode_address(d[key]) if key in d else default
+
+
+def _view_value(key, default=None):
+    return lambda d: d.get(key, default)
+
+
+def _view_amount(key):
+    def amount(d):
+        value = d.get(key, 0)
+        if (not isinstance(value, int)) or value < 0:
+            raise error.WrongAmountType
+        return value
+
+    return amount
+
+
+# How TransactionView reads attributes straight from the map, for the common
+# header fields and by transaction type for the most used ones. The others
+# are read from the full transaction. Required fields missing from the map
+# raise as decoding the full transaction does.
+_view_header_fields = {
+    "sender": lambda d: encoding.encode_address(d["snd"]),
+    "fee": _view_value("fee", 0),
+    "first_valid_round": _view_value("fv", 0),
+    "last_valid_round": lambda d: d["lv"],
+    "note": lambda d: d.get("note") or None,
+    "genesis_id": _view_value("gen"),
+    "genesis_hash": lambda d: base64.b64encode(d["gh"]).decode(),
+    "group": _view_value("grp"),
+    "lease": lambda d: Transaction.as_lease(d.get("lx")),
+    "rekey_to": lambda d: _view_address(d, "rekey"),
+}
+_view_fields = {
+    txn_type: {**_view_header_fields, **fields}
+    for txn_type, fields in {
+        constants.payment_txn: {
+            "receiver": lambda d: _view_address(
+                d, "rcv", constants.ZERO_ADDRESS
+            ),
+            "amt": _view_amount("amt"),
+            "close_remainder_to": lambda d: _view_address(d, "close"),
+        },
+        constants.assettransfer_txn: {
+            "receiver": lambda d: _view_address(
+                d, "arcv", constants.ZERO_ADDRESS
+            ),
+            "amount": _view_amount("aamt"),
+            "index": lambda d: Transaction.creatable_index(
+                d.get("xaid"), required=True
+            ),
+            "close_assets_to": lambda d: _view_address(d, "aclose"),
+            "revocation_target": lambda d: _view_address(d, "asnd"),
+        },
+    }.items()
+}
+
+
+class TransactionView:
+    """
+    Read-only view of a transaction, over its msgpack decoded map.
+
+    Attributes are the same as those of the Transaction the map decodes to,
+    but each is only converted (e.g. from address bytes to base32) when it
+    is first read. This makes reading a few fields of many transactions much
+    cheaper than decoding them. Anything not read directly from the map is
+    read from the full transaction, which is then decoded once.
+
+    A view is equal to the Transaction it decodes to, and has the same
+    transaction ID.
+
+    Args:
+        d (dict): decoded transaction map, e.g. the "txn" of a signed
+            transaction unpacked with msgpack.unpackb(data, raw=False)
+        encoded (bytes, optional): the canonical encoding of d, if at hand;
+            it is used as is to compute the transaction ID
+
+    Attributes:
+        type (str)
+        See Transaction and its subclasses for the others
+    """
 
-    f = open(path, "rb")
-    txns = []
-    unp = msgpack.Unpacker(f, raw=False)
-    for txn in unp:
-        if "msig" in txn:
-            txns.append(MultisigTransaction.undictify(txn))
-        elif "sig" in txn:
-            txns.append(SignedTransaction.undictify(txn))
-        elif "lsig" in txn:
-            txns.append(LogicSigTransaction.undictify(txn))
-        elif "type" in txn:
-            txns.append(Transaction.undictify(txn))
-        elif "txn" in txn:
-            txns.append(Transaction.undictify(txn["txn"]))
-    f.close()
-    return txns
+    def __init__(self, d, encoded=None):
+        txn_type = d["type"]
+        if not isinstance(txn_type, str):
+            txn_type = txn_type.decode()
+        attrs = self.__dict__
+        attrs["type"] = txn_type
+        attrs["_d"] = d
+        attrs["_encoded"] = encoded
+        attrs["_txn"] = None
+        attrs["_fields"] = _view_fields.get(txn_type, _view_header_fields)
+
+    def __getattr__(self, name):
+        if name[0] == "_":
+            raise AttributeError(name)
+        field = self._fields.get(name)
+        if field is not None:
+            value = field(self._d)
+        else:
+            value = getattr(self.materialize(), name)
+        self.__dict__[name] = value
+        return value
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TransactionView is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("TransactionView is read-only")
+
+    def materialize(self):
+        """
+        Decode the full transaction.
+
+        Returns:
+            Transaction: the transaction viewed, decoded once and cached; it
+                must not be modified
+        """
+        if self._txn is None:
+            self.__dict__["_txn"] = Transaction.undictify(self._d)
+        return self._txn
+
+    def dictify(self):
+        return self._d
+
+    def get_txid(self):
+        """
+        Get the transaction's ID.
+
+        Returns:
+            str: transaction ID
+        """
+        if self._txn is not None:
+            return self._txn.get_txid()
+        if self._encoded is None:
+            self.__dict__["_encoded"] = encoding.msgpack_encode_bytes(self._d)
+        txid = encoding.checksum(constants.txid_prefix + self._encoded)
+        return encoding._undo_padding(base64.b32encode(txid).decode())
+
+    def __eq__(self, other):
+        if isinstance(other, TransactionView):
+            return self.materialize() == other.materialize()
+        if isinstance(other, Transaction):
+            return self.materialize() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __str__(self):
+        return str(self._d)
 
 
 class TxGroup:
@@ -3111,6 +3698,8 @@ class TxGroup:
             raise error.TransactionGroupSizeError
         self.transactions = txns
 
+    _canonical_fields = (_value("txlist", "transactions"),)
+
     def dictify(self):
         od = OrderedDict()
         od["txlist"] = self.transactions
@@ -3136,14 +3725,14 @@ def calculate_group_id(txns):
         raise error.TransactionGroupSizeError
     txids = []
     for txn in txns:
-        raw_txn = encoding.msgpack_encode(txn)
-        to_hash = constants.txid_prefix + base64.b64decode(raw_txn)
+        raw_txn = encoding.msgpack_encode_bytes(txn)
+        to_hash = constants.txid_prefix + raw_txn
         txids.append(encoding.checksum(to_hash))
 
     group = TxGroup(txids)
 
-    encoded = encoding.msgpack_encode(group)
-    to_sign = constants.tgid_prefix + base64.b64decode(encoded)
+    encoded = encoding.msgpack_encode_bytes(group)
+    to_sign = constants.tgid_prefix + encoded
     gid = encoding.checksum(to_sign)
     return gid
 
@@ -3171,6 +3760,206 @@ def assign_group_id(txns, address=None):
     return result
 
 
+def sign_many(txns, private_key, workers=None, use_processes=False):
+    """
+    Sign many transactions with the same private key.
+
+    Equivalent to calling sign on each transaction, but the key is decoded
+    and the address derived only once. With workers set, the signing itself
+    is spread over a thread pool (or a process pool, if use_processes is
+    True), which helps for large batches.
+
+    Args:
+        txns (list[Transaction]): transactions to sign
+        private_key (str): the private key of the signing account
+        workers (int, optional): number of threads or processes to sign with;
+            if not set, transactions are signed in the calling thread
+        use_processes (bool, optional): sign in a process pool instead of a
+            thread pool
+
+    Returns:
+        list[SignedTransaction]: signed transactions, in the order given
+    """
+    key = base64.b64decode(private_key)
+    seed = key[: constants.key_len_bytes]
+    address = encoding.encode_address(key[constants.key_len_bytes :])
+    messages = [
+        constants.txid_prefix + encoding.msgpack_encode_bytes(txn)
+        for txn in txns
+    ]
+
+    if not workers or workers <= 1 or len(messages) <= 1:
+        sigs = _sign_messages(seed, messages)
+    else:
+        size = -(-len(messages) // workers)
+        chunks = [
+            messages[i : i + size] for i in range(0, len(messages), size)
+        ]
+        pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        with pool(max_workers=workers) as executor:
+            sigs = [
+                sig
+                for chunk in executor.map(
+                    _sign_messages, [seed] * len(chunks), chunks
+                )
+                for sig in chunk
+            ]
+
+    return [
+        SignedTransaction(
+            txn,
+            base64.b64encode(sig).decode(),
+            None if txn.sender == address else address,
+        )
+        for txn, sig in zip(txns, sigs)
+    ]
+
+
+def _sign_messages(seed, messages):
+    # module level so it can be sent to a process pool
+    signing_key = SigningKey(seed)
+    return [signing_key.sign(message).signature for message in messages]
+
+
+def verify_many(stxns, workers=None, use_processes=False):
+    """
+    Verify the signatures of many signed transactions offline.
+
+    Handles SignedTransaction, MultisigTransaction and LogicSigTransaction.
+    Signatures are checked against the authorizing address if one is set,
+    and against the sender otherwise; multisig signatures must also come
+    from that address. Each transaction is encoded once and verify keys are
+    reused across transactions signed by the same account. With workers
+    set, the signature checks are spread over a thread pool (or a process
+    pool, if use_processes is True).
+
+    Args:
+        stxns (list[GenericSignedTransaction]): signed transactions to verify
+        workers (int, optional): number of threads or processes to verify
+            with; if not set, signatures are checked in the calling thread
+        use_processes (bool, optional): verify in a process pool instead of
+            a thread pool
+
+    Returns:
+        list[bool]: for each transaction, in the order given, whether all of
+            its signatures are valid
+    """
+    results = []
+    checks = []
+    owners = []
+    for i, stxn in enumerate(stxns):
+        item_checks = _signature_checks(stxn)
+        results.append(item_checks is not None)
+        if item_checks:
+            checks.extend(item_checks)
+            owners.extend([i] * len(item_checks))
+
+    if not workers or workers <= 1 or len(checks) <= 1:
+        verified = _verify_signatures(checks)
+    else:
+        size = -(-len(checks) // workers)
+        chunks = [checks[i : i + size] for i in range(0, len(checks), size)]
+        pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        with pool(max_workers=workers) as executor:
+            verified = [
+                ok
+                for chunk in executor.map(_verify_signatures, chunks)
+                for ok in chunk
+            ]
+
+    for i, ok in zip(owners, verified):
+        if not ok:
+            results[i] = False
+    return results
+
+
+def _signature_checks(stxn):
+    # The (public key, message, signature) triples that must all verify for
+    # stxn to be valid, or None if it is invalid whatever its signatures.
+    if not isinstance(
+        stxn, (SignedTransaction, MultisigTransaction, LogicSigTransaction)
+    ):
+        raise TypeError("{} is not a signed transaction".format(stxn))
+    txn = stxn.transaction
+    if isinstance(stxn, SignedTransaction):
+        if not stxn.signature:
+            return None
+        public_key = encoding.decode_address(
+            stxn.authorizing_address or txn.sender
+        )
+        message = constants.txid_prefix + encoding.msgpack_encode_bytes(txn)
+        try:
+            signature = base64.b64decode(stxn.signature)
+        except binascii.Error:
+            return None
+        return [(public_key, message, signature)]
+
+    if isinstance(stxn, MultisigTransaction):
+        message = constants.txid_prefix + encoding.msgpack_encode_bytes(txn)
+        return _multisig_checks(
+            stxn.multisig, stxn.auth_addr or txn.sender, message
+        )
+
+    lsig = stxn.lsig
+    address = stxn.auth_addr or txn.sender
+    if lsig.sig and lsig.msig:
+        return None
+    try:
+        LogicSig._sanity_check_program(lsig.logic)
+    except error.InvalidProgram:
+        return None
+    message = constants.logic_prefix + lsig.logic
+    if lsig.sig:
+        try:
+            signature = base64.b64decode(lsig.sig)
+        except binascii.Error:
+            return None
+        public_key = encoding.decode_address(address)
+        return [(public_key, message, signature)]
+    if lsig.msig:
+        return _multisig_checks(lsig.msig, address, message)
+    if encoding.checksum(message) != encoding.decode_address(address):
+        return None
+    return []
+
+
+def _multisig_checks(msig, address, message):
+    try:
+        msig.validate()
+    except (
+        error.UnknownMsigVersionError,
+        error.InvalidThresholdError,
+        error.MultisigAccountSizeError,
+    ):
+        return None
+    if msig.address() != address:
+        return None
+    checks = [
+        (subsig.public_key, message, subsig.signature)
+        for subsig in msig.subsigs
+        if subsig.signature is not None
+    ]
+    if len(checks) < msig.threshold:
+        return None
+    return checks
+
+
+def _verify_signatures(checks):
+    # module level so it can be sent to a process pool
+    verify_keys = {}
+    verified = []
+    for public_key, message, signature in checks:
+        try:
+            verify_key = verify_keys.get(public_key)
+            if verify_key is None:
+                verify_key = verify_keys[public_key] = VerifyKey(public_key)
+            verify_key.verify(message, signature)
+            verified.append(True)
+        except (BadSignatureError, ValueError, TypeError):
+            verified.append(False)
+    return verified
+
+
 def wait_for_confirmation(
     algod_client: algod.AlgodClient, txid: str, wait_rounds: int = 0, **kwargs
 ):
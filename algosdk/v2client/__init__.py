@@ -1,6 +1,21 @@
 from . import algod
+from . import cache
+from . import confirmation
+from . import follower
 from . import indexer
+from . import responses
+from . import submission
+from . import transport
 
-__all__ = ["algod", "indexer"]
+__all__ = [
+    "algod",
+    "cache",
+    "confirmation",
+    "follower",
+    "indexer",
+    "responses",
+    "submission",
+    "transport",
+]
 
 name = "v2client"
@@ -1,7 +1,17 @@
 import base64
+import collections
+import functools
+import inspect
+import io
 import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from typing import (
+    TYPE_CHECKING,
     Any,
+    Deque,
     Dict,
     Final,
     Iterable,
@@ -13,13 +23,15 @@ from typing import (
     Union,
     cast,
 )
-import urllib.error
 from urllib import parse
-from urllib.request import Request, urlopen
+
+import msgpack
 
 from algosdk import constants, encoding, error, transaction, util
+from algosdk.v2client import responses
+from algosdk.v2client import transport as transport_
 
-AlgodResponseType = Union[Dict[str, Any], bytes]
+AlgodResponseType = Union[Dict[str, Any], bytes, responses.Block]
 
 # for compatibility with urllib.parse.urlencode
 ParamsType = Union[Mapping[str, Any], Sequence[Tuple[str, Any]]]
@@ -27,6 +39,18 @@ ParamsType = Union[Mapping[str, Any], Sequence[Tuple[str, Any]]]
 api_version_path_prefix = "/v2"
 
 
+def _wire_params(params: ParamsType) -> ParamsType:
+    """Get the query parameters sent, the decoded format being msgpack."""
+    if isinstance(params, Mapping):
+        if params.get("format") == "decoded":
+            return {**params, "format": "msgpack"}
+        return params
+    return [
+        (k, "msgpack" if k == "format" and v == "decoded" else v)
+        for k, v in params
+    ]
+
+
 class AlgodClient:
     """
     Client class for algod. Handles all algod requests.
@@ -35,11 +59,14 @@ class AlgodClient:
         algod_token (str): algod API token
         algod_address (str): algod address
         headers (dict, optional): extra header name/value for all requests
+        transport (Transport, optional): sends the requests; defaults to
+            transport.default_transport()
 
     Attributes:
         algod_token (str)
         algod_address (str)
         headers (dict)
+        transport (Transport)
     """
 
     def __init__(
@@ -47,10 +74,14 @@ class AlgodClient:
         algod_token: str,
         algod_address: str,
         headers: Optional[Dict[str, str]] = None,
+        transport: Optional[transport_.Transport] = None,
     ):
         self.algod_token: Final[str] = algod_token
         self.algod_address: Final[str] = algod_address
         self.headers: Final[Optional[Dict[str, str]]] = headers
+        self.transport: transport_.Transport = (
+            transport or transport_.default_transport()
+        )
 
     def algod_request(
         self,
@@ -73,9 +104,24 @@ class AlgodClient:
             response_format (str, optional): format of the response
 
         Returns:
-            dict loaded from json response body when response_format == "json"
-            otherwise returns the response body as bytes
+            dict loaded from json response body when response_format == "json",
+            the response decoded by responses.decode_response when
+            response_format == "decoded", otherwise the response body as bytes
         """
+        url, header = self._build_request(requrl, params, headers)
+        with self.transport.request(
+            method, url, headers=header, data=data
+        ) as resp:
+            body = resp.read()
+        return _parse_response(resp.status, body, response_format, requrl)
+
+    def _build_request(
+        self,
+        requrl: str,
+        params: Optional[ParamsType] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[str, Dict[str, str]]:
+        """Get the full url and headers of a request."""
         header = {"User-Agent": "py-algorand-sdk"}
 
         if self.headers:
@@ -90,33 +136,9 @@ class AlgodClient:
         if requrl not in constants.unversioned_paths:
             requrl = api_version_path_prefix + requrl
         if params:
-            requrl = requrl + "?" + parse.urlencode(params)
+            requrl = requrl + "?" + parse.urlencode(_wire_params(params))
 
-        req = Request(
-            self.algod_address + requrl,
-            headers=header,
-            method=method,
-            data=data,
-        )
-
-        try:
-            resp = urlopen(req)
-        except urllib.error.HTTPError as e:
-            code = e.code
-            es = e.read().decode("utf-8")
-            try:
-                e = json.loads(es)["message"]
-            finally:
-                raise error.AlgodHTTPError(e, code)
-        if response_format == "json":
-            try:
-                return json.load(resp)
-            except Exception as e:
-                raise error.AlgodResponseError(
-                    "Failed to parse JSON response from algod"
-                ) from e
-        else:
-            return resp.read()
+        return self.algod_address + requrl, header
 
     @classmethod
     def _assert_json_response(
@@ -128,19 +150,30 @@ class AlgodClient:
             )
 
     def account_info(
-        self, address: str, exclude: Optional[str] = None, **kwargs: Any
+        self,
+        address: str,
+        exclude: Optional[str] = None,
+        response_format: str = "json",
+        **kwargs: Any,
     ) -> AlgodResponseType:
         """
         Return account information.
 
         Args:
             address (str): account public key
+            response_format (str): the format in which the response is
+                returned: either "json", "msgpack" for the msgpack body as
+                bytes, or "decoded" for it unpacked into a dict
         """
         query = {}
+        if response_format != "json":
+            query["format"] = response_format
         if exclude:
             query["exclude"] = exclude
         req = "/accounts/" + address
-        return self.algod_request("GET", req, query, **kwargs)
+        return self.algod_request(
+            "GET", req, query, response_format=response_format, **kwargs
+        )
 
     def asset_info(self, asset_id: int, **kwargs: Any) -> AlgodResponseType:
         """
@@ -200,7 +233,11 @@ class AlgodClient:
         return self.algod_request("GET", req, params=params, **kwargs)
 
     def account_asset_info(
-        self, address: str, asset_id: int, **kwargs: Any
+        self,
+        address: str,
+        asset_id: int,
+        response_format: str = "json",
+        **kwargs: Any,
     ) -> AlgodResponseType:
         """
         Return asset information for a specific account.
@@ -208,13 +245,24 @@ class AlgodClient:
         Args:
             address (str): account public key
             asset_id (int): The ID of the asset to look up.
+            response_format (str): the format in which the response is
+                returned: either "json", "msgpack" for the msgpack body as
+                bytes, or "decoded" for it unpacked into a dict
         """
-        query: Mapping = {}
+        query: Dict[str, str] = {}
+        if response_format != "json":
+            query["format"] = response_format
         req = "/accounts/" + address + "/assets/" + str(asset_id)
-        return self.algod_request("GET", req, query, **kwargs)
+        return self.algod_request(
+            "GET", req, query, response_format=response_format, **kwargs
+        )
 
     def account_application_info(
-        self, address: str, application_id: int, **kwargs: Any
+        self,
+        address: str,
+        application_id: int,
+        response_format: str = "json",
+        **kwargs: Any,
     ) -> AlgodResponseType:
         """
         Return application information for a specific account.
@@ -222,10 +270,17 @@ class AlgodClient:
         Args:
             address (str): account public key
             application_id (int): The ID of the application to look up.
+            response_format (str): the format in which the response is
+                returned: either "json", "msgpack" for the msgpack body as
+                bytes, or "decoded" for it unpacked into a dict
         """
-        query: Mapping = {}
+        query: Dict[str, str] = {}
+        if response_format != "json":
+            query["format"] = response_format
         req = "/accounts/" + address + "/applications/" + str(application_id)
-        return self.algod_request("GET", req, query, **kwargs)
+        return self.algod_request(
+            "GET", req, query, response_format=response_format, **kwargs
+        )
 
     def pending_transactions_by_address(
         self,
@@ -243,7 +298,8 @@ class AlgodClient:
             address (str): account public key
             limit (int, optional): maximum number of transactions to return
             response_format (str): the format in which the response is returned: either
-                "json" or "msgpack"
+                "json", "msgpack" for the msgpack body as bytes, or "decoded" for
+                it decoded into SDK objects
         """
         query: Dict[str, Union[str, int]] = {"format": response_format}
         if limit:
@@ -267,7 +323,8 @@ class AlgodClient:
         Args:
             block (int): block number
             response_format (str): the format in which the response is
-                returned: either "json" or "msgpack"
+                returned: either "json", "msgpack" for the msgpack body as
+                bytes, or "decoded" for a responses.Block
             round_num (int, optional): alias for block; specify one of these
         """
         query = {"format": response_format}
@@ -322,9 +379,7 @@ class AlgodClient:
         assert not isinstance(
             txn, transaction.Transaction
         ), "Attempt to send UNSUPPORTED type of transaction {}".format(txn)
-        return self.send_raw_transaction(
-            encoding.msgpack_encode(txn), **kwargs
-        )
+        return self._send_encoded(encoding.msgpack_encode_bytes(txn), kwargs)
 
     def send_raw_transaction(
         self, txn: Union[bytes, str], **kwargs: Any
@@ -333,24 +388,63 @@ class AlgodClient:
         Broadcast a signed transaction to the network.
 
         Args:
-            txn (str): transaction to send, encoded in base64
+            txn (str): transaction to send, encoded in base64; see
+                send_encoded_transactions to send msgpack bytes as they are
             request_header (dict, optional): additional header for request
 
         Returns:
             str: transaction ID
         """
+        return self._send_encoded(base64.b64decode(txn), kwargs)
+
+    def send_encoded_transactions(
+        self,
+        txns: Union[
+            bytes,
+            "Iterable[Union[bytes, transaction.GenericSignedTransaction]]",
+        ],
+        **kwargs: Any,
+    ) -> str:
+        """
+        Broadcast signed transactions to the network, encoded as msgpack
+        bytes. The body of the request is built with a single
+        concatenation, without base64.
+
+        Args:
+            txns (bytes or list[bytes, SignedTransaction,
+                MultisigTransaction, or LogicSigTransaction]): msgpack
+                encoded signed transactions, one after the other, or a
+                list of msgpack encoded signed transactions and of signed
+                transaction objects to encode
+            request_header (dict, optional): additional header for request
+
+        Returns:
+            str: first transaction ID
+        """
+        if isinstance(txns, (bytes, bytearray, memoryview)):
+            return self._send_encoded(bytes(txns), kwargs)
+        return self._send_encoded(_encode_transactions(txns), kwargs)
+
+    def _send_encoded(self, data: bytes, kwargs: Dict[str, Any]) -> str:
+        """
+        Send msgpack encoded signed transactions, with the keyword
+        arguments of send_raw_transaction.
+        """
+        self._prepare_send(kwargs)
+        resp = self.algod_request("POST", "/transactions", data=data, **kwargs)
+        return cast(str, cast(dict, resp)["txId"])
+
+    def _prepare_send(self, kwargs: Dict[str, Any]) -> None:
+        """
+        Check the keyword arguments of a submission, and add its headers to
+        them.
+        """
         self._assert_json_response(kwargs, "send_raw_transaction")
 
-        txn_bytes = base64.b64decode(txn)
-        req = "/transactions"
-        headers = util.build_headers_from(
+        kwargs["headers"] = util.build_headers_from(
             kwargs.get("headers", False),
             {"Content-Type": "application/x-binary"},
         )
-        kwargs["headers"] = headers
-
-        resp = self.algod_request("POST", req, data=txn_bytes, **kwargs)
-        return cast(str, cast(dict, resp)["txId"])
 
     def pending_transactions(
         self, max_txns: int = 0, response_format: str = "json", **kwargs: Any
@@ -362,7 +456,8 @@ class AlgodClient:
             max_txns (int): maximum number of transactions to return;
                 if max_txns is 0, return all pending transactions
             response_format (str): the format in which the response is returned: either
-                "json" or "msgpack"
+                "json", "msgpack" for the msgpack body as bytes, or "decoded" for
+                it decoded into SDK objects
         """
         query: Dict[str, Union[int, str]] = {"format": response_format}
         if max_txns:
@@ -381,7 +476,8 @@ class AlgodClient:
         Args:
             transaction_id (str): transaction ID
             response_format (str): the format in which the response is returned: either
-                "json" or "msgpack"
+                "json", "msgpack" for the msgpack body as bytes, or "decoded" for
+                it decoded into SDK objects
         """
         req = "/transactions/pending/" + transaction_id
         query = {"format": response_format}
@@ -415,15 +511,7 @@ class AlgodClient:
         Returns:
             str: first transaction ID
         """
-        serialized: List[bytes] = []
-        for txn in txns:
-            assert not isinstance(
-                txn, transaction.Transaction
-            ), "Attempt to send UNSIGNED transaction {}".format(txn)
-            serialized.append(base64.b64decode(encoding.msgpack_encode(txn)))
-        return self.send_raw_transaction(
-            base64.b64encode(b"".join(serialized)), **kwargs
-        )
+        return self._send_encoded(_encode_transactions(txns), kwargs)
 
     def suggested_params(self, **kwargs: Any) -> "transaction.SuggestedParams":
         """Return suggested transaction parameters."""
@@ -431,7 +519,12 @@ class AlgodClient:
 
         req = "/transactions/params"
         res = cast(dict, self.algod_request("GET", req, **kwargs))
+        return self._suggested_params_from(res)
 
+    @staticmethod
+    def _suggested_params_from(
+        res: Dict[str, Any]
+    ) -> "transaction.SuggestedParams":
         return transaction.SuggestedParams(
             res["fee"],
             res["last-round"],
@@ -524,8 +617,7 @@ class AlgodClient:
             {"Content-Type": "application/msgpack"},
         )
         kwargs["headers"] = headers
-        data = encoding.msgpack_encode(drr)
-        data = base64.b64decode(data)
+        data = encoding.msgpack_encode_bytes(drr)
 
         return cast(dict, self.algod_request("POST", req, data=data, **kwargs))
 
@@ -612,13 +704,8 @@ class AlgodClient:
         Returns:
             Dict[str, Any]: results from simulation of transaction group
         """
-        serialized = []
-        for txn in txns:
-            serialized.append(base64.b64decode(encoding.msgpack_encode(txn)))
-
-        return self.simulate_raw_transaction(
-            base64.b64encode(b"".join(serialized)), **kwargs
-        )
+        data = b"".join(encoding.msgpack_encode_bytes(txn) for txn in txns)
+        return self._simulate_encoded(data, kwargs)
 
     def simulate_raw_transaction(self, txn, **kwargs):
         """
@@ -631,7 +718,15 @@ class AlgodClient:
         Returns:
             Dict[str, Any]: results from simulation of transaction group
         """
-        txn = base64.b64decode(txn)
+        return self._simulate_encoded(base64.b64decode(txn), kwargs)
+
+    def _simulate_encoded(
+        self, data: bytes, kwargs: Dict[str, Any]
+    ) -> AlgodResponseType:
+        """
+        Simulate msgpack encoded signed transactions, with the keyword
+        arguments of simulate_raw_transaction.
+        """
         req = "/transactions/simulate"
         headers = util.build_headers_from(
             kwargs.get("headers", False),
@@ -639,7 +734,7 @@ class AlgodClient:
         )
         kwargs["headers"] = headers
 
-        return self.algod_request("POST", req, data=txn, **kwargs)
+        return self.algod_request("POST", req, data=data, **kwargs)
 
 
 def _specify_round_string(
@@ -662,3 +757,887 @@ def _specify_round_string(
         return str(round_num)
 
     return str(block)
+
+
+def _encode_transactions(
+    txns: "Iterable[Union[bytes, transaction.GenericSignedTransaction]]",
+) -> bytes:
+    """
+    Get the body of a submission of signed transactions, given as objects
+    or already encoded.
+    """
+    serialized: List[Union[bytes, bytearray, memoryview]] = []
+    for txn in txns:
+        if isinstance(txn, (bytes, bytearray, memoryview)):
+            serialized.append(txn)
+            continue
+        assert not isinstance(
+            txn, transaction.Transaction
+        ), "Attempt to send UNSIGNED transaction {}".format(txn)
+        serialized.append(encoding.msgpack_encode_bytes(txn))
+    return b"".join(serialized)
+
+
+def _parse_response(
+    status: int,
+    body: bytes,
+    response_format: Optional[str],
+    requrl: str = "",
+) -> AlgodResponseType:
+    """
+    Get the result of an algod request from the status and body of its
+    response, requrl being the path of the request for msgpack responses to
+    decode.
+
+    Raises:
+        AlgodHTTPError: if the status is not a success
+        AlgodResponseError: if a json body cannot be parsed
+    """
+    if not 200 <= status < 300:
+        es = body.decode("utf-8")
+        try:
+            message = json.loads(es)["message"]
+        except Exception:
+            message = es
+        raise error.AlgodHTTPError(message, status)
+    if response_format == "json":
+        try:
+            return json.loads(body)
+        except Exception as e:
+            raise error.AlgodResponseError(
+                "Failed to parse JSON response from algod"
+            ) from e
+    if response_format == "decoded":
+        try:
+            return responses.decode_response(requrl, body)
+        except Exception as e:
+            raise error.AlgodResponseError(
+                "Failed to decode msgpack response from algod"
+            ) from e
+    return body
+
+
+def _add_coroutine_methods(cls: type, base: type) -> None:
+    """
+    Give cls a coroutine for each public method of base it does not define,
+    awaiting what the method returns. Used for the asyncio clients, whose
+    request method returns an awaitable, so that methods of the sync
+    client returning the result of a request work unchanged.
+    """
+
+    def coroutine_method(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            return await method(self, *args, **kwargs)
+
+        return wrapper
+
+    for name, method in vars(base).items():
+        if (
+            not name.startswith("_")
+            and inspect.isfunction(method)
+            and name not in vars(cls)
+        ):
+            setattr(cls, name, coroutine_method(method))
+
+
+class AsyncAlgodClient(AlgodClient):
+    """
+    asyncio client for algod. It has the same methods as AlgodClient, taking
+    the same arguments, as coroutines:
+
+        async with AsyncAlgodClient(algod_token, algod_address) as client:
+            status = await client.status()
+
+    Args:
+        algod_token (str): algod API token
+        algod_address (str): algod address
+        headers (dict, optional): extra header name/value for all requests
+        transport (AsyncTransport, optional): sends the requests; defaults
+            to a new AsyncPooledTransport
+
+    Attributes:
+        algod_token (str)
+        algod_address (str)
+        headers (dict)
+        transport (AsyncTransport)
+    """
+
+    transport: transport_.AsyncTransport  # type: ignore[assignment]
+
+    def __init__(
+        self,
+        algod_token: str,
+        algod_address: str,
+        headers: Optional[Dict[str, str]] = None,
+        transport: Optional[transport_.AsyncTransport] = None,
+    ):
+        super().__init__(algod_token, algod_address, headers)
+        self.transport = transport or transport_.AsyncPooledTransport()
+
+    if TYPE_CHECKING:
+        # the coroutines added by _add_coroutine_methods, for type checkers
+        async def account_info(  # type: ignore[override]
+            self,
+            address: str,
+            exclude: Optional[str] = None,
+            response_format: str = "json",
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def asset_info(  # type: ignore[override]
+            self,
+            asset_id: int,
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def application_info(  # type: ignore[override]
+            self,
+            application_id: int,
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def application_box_by_name(  # type: ignore[override]
+            self,
+            application_id: int,
+            box_name: bytes,
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def application_boxes(  # type: ignore[override]
+            self,
+            application_id: int,
+            limit: int = 0,
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def account_asset_info(  # type: ignore[override]
+            self,
+            address: str,
+            asset_id: int,
+            response_format: str = "json",
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def account_application_info(  # type: ignore[override]
+            self,
+            address: str,
+            application_id: int,
+            response_format: str = "json",
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def pending_transactions_by_address(  # type: ignore[override]
+            self,
+            address: str,
+            limit: int = 0,
+            response_format: str = "json",
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def block_info(  # type: ignore[override]
+            self,
+            block: Optional[int] = None,
+            response_format: str = "json",
+            round_num: Optional[int] = None,
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def ledger_supply(  # type: ignore[override]
+            self,
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def status(  # type: ignore[override]
+            self,
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def status_after_block(  # type: ignore[override]
+            self,
+            block_num: Optional[int] = None,
+            round_num: Optional[int] = None,
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def send_transaction(  # type: ignore[override]
+            self,
+            txn: "transaction.GenericSignedTransaction",
+            **kwargs: Any,
+        ) -> str:
+            ...
+
+        async def send_raw_transaction(  # type: ignore[override]
+            self,
+            txn: Union[bytes, str],
+            **kwargs: Any,
+        ) -> str:
+            ...
+
+        async def send_encoded_transactions(  # type: ignore[override]
+            self,
+            txns: Union[
+                bytes,
+                "Iterable[Union[bytes, transaction.GenericSignedTransaction]]",
+            ],
+            **kwargs: Any,
+        ) -> str:
+            ...
+
+        async def pending_transactions(  # type: ignore[override]
+            self,
+            max_txns: int = 0,
+            response_format: str = "json",
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def pending_transaction_info(  # type: ignore[override]
+            self,
+            transaction_id: str,
+            response_format: str = "json",
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def health(  # type: ignore[override]
+            self,
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def versions(  # type: ignore[override]
+            self,
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def send_transactions(  # type: ignore[override]
+            self,
+            txns: "Iterable[transaction.GenericSignedTransaction]",
+            **kwargs: Any,
+        ) -> str:
+            ...
+
+        async def compile(  # type: ignore[override]
+            self,
+            source: str,
+            source_map: bool = False,
+            **kwargs: Any,
+        ) -> Dict[str, Any]:
+            ...
+
+        async def disassemble(  # type: ignore[override]
+            self,
+            program_bytes: bytes,
+            **kwargs: Any,
+        ) -> Dict[str, str]:
+            ...
+
+        async def dryrun(  # type: ignore[override]
+            self,
+            drr: Dict[str, Any],
+            **kwargs: Any,
+        ) -> Dict[str, Any]:
+            ...
+
+        async def genesis(  # type: ignore[override]
+            self,
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def transaction_proof(  # type: ignore[override]
+            self,
+            round_num: int,
+            txid: str,
+            hashtype: str = "",
+            response_format: str = "json",
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def lightblockheader_proof(  # type: ignore[override]
+            self,
+            round_num: int,
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def stateproofs(  # type: ignore[override]
+            self,
+            round_num: int,
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def get_block_hash(  # type: ignore[override]
+            self,
+            round_num: int,
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def simulate_transactions(  # type: ignore[override]
+            self,
+            txns: "Iterable[transaction.GenericSignedTransaction]",
+            **kwargs: Any,
+        ) -> AlgodResponseType:
+            ...
+
+        async def simulate_raw_transaction(  # type: ignore[override]
+            self,
+            txn,
+            **kwargs,
+        ) -> Any:
+            ...
+
+    async def algod_request(  # type: ignore[override]
+        self,
+        method: str,
+        requrl: str,
+        params: Optional[ParamsType] = None,
+        data: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        response_format: Optional[str] = "json",
+    ) -> AlgodResponseType:
+        """
+        Execute a given request.
+
+        Args:
+            method (str): request method
+            requrl (str): url for the request
+            params (ParamsType, optional): parameters for the request
+            data (bytes, optional): data in the body of the request
+            headers (dict, optional): additional header for request
+            response_format (str, optional): format of the response
+
+        Returns:
+            dict loaded from json response body when response_format == "json",
+            the response decoded by responses.decode_response when
+            response_format == "decoded", otherwise the response body as bytes
+        """
+        url, header = self._build_request(requrl, params, headers)
+        async with await self.transport.request(
+            method, url, headers=header, data=data
+        ) as resp:
+            body = await resp.read()
+        return _parse_response(resp.status, body, response_format, requrl)
+
+    async def _send_encoded(  # type: ignore[override]
+        self, data: bytes, kwargs: Dict[str, Any]
+    ) -> str:
+        self._prepare_send(kwargs)
+        resp = await self.algod_request(
+            "POST", "/transactions", data=data, **kwargs
+        )
+        return cast(str, cast(dict, resp)["txId"])
+
+    async def suggested_params(  # type: ignore[override]
+        self, **kwargs: Any
+    ) -> "transaction.SuggestedParams":
+        """Return suggested transaction parameters."""
+        self._assert_json_response(kwargs, "suggested_params")
+
+        req = "/transactions/params"
+        res = cast(dict, await self.algod_request("GET", req, **kwargs))
+        return self._suggested_params_from(res)
+
+    async def close(self) -> None:
+        """Close the transport of the client."""
+        await self.transport.close()
+
+    async def __aenter__(self) -> "AsyncAlgodClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+
+_add_coroutine_methods(AsyncAlgodClient, AlgodClient)
+
+
+# statuses of failed requests worth retrying on another node
+_RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+# number of transactions pinned to nodes by a MultiAlgodClient
+_MAX_PINS = 10000
+
+# long polls, whose latency says nothing about the node
+_LONG_POLL_PREFIXES = ("/status/wait-for-block-after/",)
+
+
+class _Endpoint:
+    """An algod node of a MultiAlgodClient, with its statistics."""
+
+    def __init__(self, client: AlgodClient) -> None:
+        self.client = client
+        self.latency: Optional[float] = None
+        self.latencies: Deque[float] = collections.deque(maxlen=100)
+        self.error_rate = 0.0
+        self.failures = 0
+        self.down_until = 0.0
+        self.requests = 0
+        self.errors = 0
+
+    def p95(self) -> Optional[float]:
+        if len(self.latencies) < 20:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+
+class MultiAlgodClient(AlgodClient):
+    """
+    Client spreading requests over several algod nodes, with the same
+    methods as AlgodClient.
+
+    The latency and error rate of each node are tracked. Requests go to
+    the healthy node with the lowest latency, nodes not used yet being
+    tried first. A node is unhealthy for cooldown seconds after
+    failure_threshold consecutive failures, failures being connection
+    errors and 429 or 5xx responses.
+
+    A failed GET request is retried up to retries times, on the next best
+    node, after an exponential backoff with full jitter: a random delay of
+    up to backoff * 2 ** (attempt - 1) seconds, capped at max_backoff.
+    Other requests are not retried.
+
+    With hedge set, a GET request taking longer than the 95th percentile of
+    the latencies of its node is sent to a second node too, and the first
+    response is used.
+
+    Transactions sent with send_transaction(s), send_raw_transaction or
+    send_encoded_transactions are pinned to the node that accepted them:
+    pending_transaction_info for them is asked to that node, while it is
+    healthy.
+
+    Args:
+        endpoints (list[tuple[str, str]]): algod API token and address of
+            each node
+        headers (dict, optional): extra header name/value for all requests
+        transport (Transport, optional): sends the requests; defaults to
+            transport.default_transport()
+        retries (int, optional): number of retries of a failed GET request
+        backoff (float, optional): base of the delay between retries
+        max_backoff (float, optional): maximum delay between retries
+        hedge (bool, optional): whether to hedge slow GET requests
+        failure_threshold (int, optional): number of consecutive failures
+            making a node unhealthy
+        cooldown (float, optional): seconds a node stays unhealthy
+
+    Attributes:
+        endpoints (list[AlgodClient]): a client for each node
+        retries (int)
+        backoff (float)
+        max_backoff (float)
+        hedge (bool)
+        failure_threshold (int)
+        cooldown (float)
+    """
+
+    def __init__(
+        self,
+        endpoints: Sequence[Tuple[str, str]],
+        headers: Optional[Dict[str, str]] = None,
+        transport: Optional[transport_.Transport] = None,
+        retries: int = 2,
+        backoff: float = 0.05,
+        max_backoff: float = 1.0,
+        hedge: bool = False,
+        failure_threshold: int = 3,
+        cooldown: float = 5.0,
+    ):
+        if not endpoints:
+            raise ValueError("at least one endpoint is needed")
+        token, address = endpoints[0]
+        super().__init__(token, address, headers, transport)
+        self.endpoints = [
+            AlgodClient(token, address, headers, self.transport)
+            for token, address in endpoints
+        ]
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge = hedge
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._endpoints = [_Endpoint(client) for client in self.endpoints]
+        self._pins: "collections.OrderedDict[str, _Endpoint]" = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def algod_request(
+        self,
+        method: str,
+        requrl: str,
+        params: Optional[ParamsType] = None,
+        data: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+        response_format: Optional[str] = "json",
+    ) -> AlgodResponseType:
+        """
+        Execute a given request on the best node for it.
+
+        Args:
+            method (str): request method
+            requrl (str): url for the request
+            params (ParamsType, optional): parameters for the request
+            data (bytes, optional): data in the body of the request
+            headers (dict, optional): additional header for request
+            response_format (str, optional): format of the response
+
+        Returns:
+            dict loaded from json response body when response_format == "json",
+            the response decoded by responses.decode_response when
+            response_format == "decoded", otherwise the response body as bytes
+        """
+        request = (method, requrl, params, data, headers, response_format)
+        pinned = None
+        if requrl.startswith("/transactions/pending/"):
+            with self._lock:
+                pinned = self._pins.get(requrl.rsplit("/", 1)[-1])
+
+        if method != "GET":
+            endpoint = self._choose()
+            response = self._call(endpoint, request)
+            if method == "POST" and requrl == "/transactions":
+                self._pin(endpoint, data)
+            return response
+
+        tried: List[_Endpoint] = []
+        attempt = 0
+        while True:
+            if pinned is not None and not tried and self._healthy(pinned):
+                endpoint = pinned
+            else:
+                endpoint = self._choose(tried)
+            tried.append(endpoint)
+            try:
+                return self._get(endpoint, request, tried)
+            except Exception as e:
+                if attempt >= self.retries or not _is_retryable(e):
+                    raise
+            attempt += 1
+            delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+            time.sleep(random.uniform(0, delay))
+
+    def endpoint_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get the statistics of each node.
+
+        Returns:
+            list[dict]: for each node, its "address", its "latency" (an
+            exponential moving average, in seconds) and "p95" latency, its
+            "error_rate" (an exponential moving average), whether it is
+            "healthy", and its numbers of "requests" and "errors"
+        """
+        with self._lock:
+            return [
+                {
+                    "address": e.client.algod_address,
+                    "latency": e.latency,
+                    "p95": e.p95(),
+                    "error_rate": e.error_rate,
+                    "healthy": self._healthy(e),
+                    "requests": e.requests,
+                    "errors": e.errors,
+                }
+                for e in self._endpoints
+            ]
+
+    def close(self) -> None:
+        """Stop the threads used to hedge requests."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _healthy(self, endpoint: _Endpoint) -> bool:
+        return endpoint.down_until <= time.monotonic()
+
+    def _choose(self, tried: Sequence[_Endpoint] = ()) -> _Endpoint:
+        """
+        Get the healthy node with the lowest latency, preferring nodes not
+        tried yet, or else the node to become healthy first.
+        """
+        with self._lock:
+            now = time.monotonic()
+            candidates = [e for e in self._endpoints if e not in tried]
+            if not candidates:
+                candidates = self._endpoints
+            healthy = [e for e in candidates if e.down_until <= now]
+            if not healthy:
+                return min(candidates, key=lambda e: e.down_until)
+            return min(
+                healthy,
+                key=lambda e: (e.latency is not None, e.latency or 0.0),
+            )
+
+    def _get(
+        self,
+        endpoint: _Endpoint,
+        request: Tuple[Any, ...],
+        tried: List[_Endpoint],
+    ) -> AlgodResponseType:
+        delay = endpoint.p95() if self.hedge else None
+        if delay is None or request[1].startswith(_LONG_POLL_PREFIXES):
+            return self._call(endpoint, request)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    2 * len(self._endpoints), thread_name_prefix="algod-hedge"
+                )
+            executor = self._executor
+        futures = [executor.submit(self._call, endpoint, request)]
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            second = self._choose(tried)
+            if second is not endpoint:
+                tried.append(second)
+                futures.append(executor.submit(self._call, second, request))
+        failure: Optional[BaseException] = None
+        for future in as_completed(futures):
+            failure = future.exception()
+            if failure is None:
+                return future.result()
+        assert failure is not None
+        raise failure
+
+    def _call(
+        self, endpoint: _Endpoint, request: Tuple[Any, ...]
+    ) -> AlgodResponseType:
+        start = time.monotonic()
+        try:
+            response = endpoint.client.algod_request(*request)
+        except Exception as e:
+            self._record(endpoint, request, None, _is_retryable(e))
+            raise
+        self._record(endpoint, request, time.monotonic() - start, False)
+        return response
+
+    def _record(
+        self,
+        endpoint: _Endpoint,
+        request: Tuple[Any, ...],
+        latency: Optional[float],
+        failed: bool,
+    ) -> None:
+        with self._lock:
+            endpoint.requests += 1
+            endpoint.error_rate = 0.9 * endpoint.error_rate + 0.1 * failed
+            if failed:
+                endpoint.errors += 1
+                endpoint.failures += 1
+                if endpoint.failures >= self.failure_threshold:
+                    endpoint.down_until = time.monotonic() + self.cooldown
+                return
+            endpoint.failures = 0
+            if latency is not None and not request[1].startswith(
+                _LONG_POLL_PREFIXES
+            ):
+                endpoint.latencies.append(latency)
+                endpoint.latency = (
+                    latency
+                    if endpoint.latency is None
+                    else 0.8 * endpoint.latency + 0.2 * latency
+                )
+
+    def _pin(self, endpoint: _Endpoint, data: Optional[bytes]) -> None:
+        """Pin the transactions sent in data to the node."""
+        try:
+            txids = [
+                transaction.TransactionView(stxn["txn"]).get_txid()
+                for stxn in msgpack.Unpacker(
+                    io.BytesIO(data or b""), raw=False, strict_map_key=False
+                )
+            ]
+        except Exception:
+            return
+        with self._lock:
+            for txid in txids:
+                self._pins[txid] = endpoint
+                self._pins.move_to_end(txid)
+            while len(self._pins) > _MAX_PINS:
+                self._pins.popitem(last=False)
+
+
+def _is_retryable(e: BaseException) -> bool:
+    if isinstance(e, error.AlgodHTTPError):
+        return e.code in _RETRY_STATUSES
+    return isinstance(e, OSError)
+
+
+class SuggestedParamsProvider:
+    """
+    Thread safe cache of the suggested parameters of a client, to be shared
+    by the code building transactions.
+
+    suggested_params returns a copy of the cached parameters, with first
+    set to the last round known and last validity_window rounds later. The
+    parameters are fetched again when older than max_age seconds.
+
+    Once started, a daemon thread follows the chain with
+    status_after_block and fetches the parameters again after each new
+    round, so that callers do not wait for them; max_age then only matters
+    if the node cannot be reached, the error being kept as error.
+
+    Args:
+        client (AlgodClient): client the parameters are fetched with
+        max_age (float, optional): seconds after which cached parameters
+            are fetched again
+        validity_window (int, optional): number of rounds between first and
+            last
+        retry_delay (float, optional): seconds the thread waits after a
+            failed request
+
+    Attributes:
+        client (AlgodClient)
+        max_age (float)
+        validity_window (int)
+        retry_delay (float)
+        error (Exception): last error of the thread, None once it succeeds
+        stats (dict): number of calls answered from the cache ("hits") and
+            of times the parameters were fetched ("fetches")
+    """
+
+    def __init__(
+        self,
+        client: AlgodClient,
+        max_age: float = 60.0,
+        validity_window: int = 1000,
+        retry_delay: float = 1.0,
+    ) -> None:
+        self.client = client
+        self.max_age = max_age
+        self.validity_window = validity_window
+        self.retry_delay = retry_delay
+        self.error: Optional[Exception] = None
+        self.stats = {"hits": 0, "fetches": 0}
+        self._params: Optional[transaction.SuggestedParams] = None
+        self._fetched_at = 0.0
+        self._round = 0
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def round(self) -> int:
+        """Last round known, 0 before the parameters are first fetched"""
+        return self._round
+
+    def suggested_params(self) -> "transaction.SuggestedParams":
+        """
+        Get suggested transaction parameters, fetching them if there are
+        none cached or they are too old.
+
+        Returns:
+            SuggestedParams: a copy of the parameters, which can be modified
+        """
+        with self._lock:
+            if self._fresh():
+                self.stats["hits"] += 1
+                return self._copy()
+        # one caller fetches while the others wait for its result
+        with self._fetch_lock:
+            with self._lock:
+                if self._fresh():
+                    self.stats["hits"] += 1
+                    return self._copy()
+            self._fetch()
+        with self._lock:
+            return self._copy()
+
+    def refresh(self) -> None:
+        """Fetch the parameters now."""
+        with self._fetch_lock:
+            self._fetch()
+
+    def start(self) -> None:
+        """Start following the chain in a daemon thread."""
+        if self._thread is not None:
+            return
+        # each thread has its own event, for a thread still waiting for a
+        # response after close not to run on once started again
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._follow, args=(self._stop,), daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """
+        Stop following the chain. The thread exits once its pending
+        request returns.
+        """
+        self._stop.set()
+        self._thread = None
+
+    def __enter__(self) -> "SuggestedParamsProvider":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _fresh(self) -> bool:
+        return (
+            self._params is not None
+            and time.monotonic() - self._fetched_at < self.max_age
+        )
+
+    def _copy(self) -> "transaction.SuggestedParams":
+        params = cast(transaction.SuggestedParams, self._params)
+        return transaction.SuggestedParams(
+            params.fee,
+            self._round,
+            self._round + self.validity_window,
+            params.gh,
+            params.gen,
+            params.flat_fee,
+            params.consensus_version,
+            params.min_fee,
+        )
+
+    def _fetch(self) -> None:
+        params = self.client.suggested_params()
+        with self._lock:
+            self._params = params
+            self._fetched_at = time.monotonic()
+            self._round = max(self._round, params.first)
+            self.stats["fetches"] += 1
+
+    def _follow(self, stop: threading.Event) -> None:
+        last_round = 0
+        while not stop.is_set():
+            try:
+                if last_round:
+                    status = self.client.status_after_block(last_round)
+                else:
+                    status = self.client.status()
+                last_round = cast(dict, status)["last-round"]
+                with self._lock:
+                    self._round = max(self._round, last_round)
+                if stop.is_set():
+                    break
+                self.refresh()
+                self.error = None
+            except Exception as e:
+                self.error = e
+                last_round = 0
+                stop.wait(self.retry_delay)
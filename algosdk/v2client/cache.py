@@ -0,0 +1,391 @@
+"""
+Caching of responses to requests for immutable or slowly changing data.
+
+A ResponseCache keeps successful responses to GET requests whose path
+matches one of its policies, for the time the policy allows, and is used by
+wrapping the transport of a client in a CachingTransport:
+
+    cache = ResponseCache(directory="~/.cache/algosdk")
+    transport = CachingTransport(PooledTransport(), cache)
+    algod_client = algod.AlgodClient(token, address, transport=transport)
+
+Rounds are final as soon as a block is agreed on, so blocks, their hashes
+and proofs are kept for good once a node returns them, as are the genesis
+and indexed transactions; asset parameters and versions, which can change,
+are kept for a minute. Responses are kept in memory, the least recently
+used being evicted once there are more than max_entries of them or they add
+up to more than max_bytes, and those kept for good are also written to the
+directory if one is given, to be found again after a restart.
+
+Responses are cached by method and url: clients sharing a cache should
+talk to nodes of the same network. The asyncio clients use an
+AsyncCachingTransport, which can share its cache with sync clients.
+"""
+import asyncio
+import collections
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    Pattern,
+    Tuple,
+    TypeVar,
+)
+from urllib import parse
+
+from algosdk.v2client import transport as transport_
+
+# (pattern of the url path, seconds responses are kept for or None to keep
+# them for good); the first pattern found in the path applies
+DEFAULT_POLICIES: Tuple[Tuple[str, Optional[float]], ...] = (
+    (r"/genesis$", None),
+    (r"/versions$", 60.0),
+    (r"/v2/blocks/\d+$", None),
+    (r"/v2/blocks/\d+/hash$", None),
+    (r"/v2/blocks/\d+/txids$", None),
+    (r"/v2/blocks/\d+/transactions/[^/]+/proof$", None),
+    (r"/v2/blocks/\d+/lightheader/proof$", None),
+    (r"/v2/transactions/[A-Z2-7]{52}$", None),
+    (r"/v2/assets/\d+$", 60.0),
+)
+
+T = TypeVar("T")
+
+# response headers kept with cached bodies
+_KEPT_HEADERS = ("Content-Type",)
+
+
+class _Entry:
+    __slots__ = ("headers", "body", "expires")
+
+    def __init__(
+        self, headers: Dict[str, str], body: bytes, expires: Optional[float]
+    ):
+        self.headers = headers
+        self.body = body
+        self.expires = expires
+
+
+class ResponseCache:
+    """
+    Thread safe cache of response bodies, keyed by request method and url.
+
+    Args:
+        policies (Iterable[tuple[str, float]], optional): pairs of a regular
+            expression searched in the url path and of the number of seconds
+            a matching response is kept for, or None to keep it for good;
+            the first matching pattern applies and responses to urls
+            matching none are not cached. Defaults to DEFAULT_POLICIES.
+        max_entries (int, optional): maximum number of responses kept in
+            memory
+        max_bytes (int, optional): maximum total size of the bodies kept in
+            memory
+        directory (str, optional): directory in which responses kept for
+            good are also stored; created if missing
+
+    Attributes:
+        max_entries (int)
+        max_bytes (int)
+        directory (str)
+        stats (dict): number of "hits" in memory, "disk_hits", "misses" of
+            cacheable requests, responses "stored" and "evicted" from
+            memory, and current number of "entries" and "bytes" in memory
+    """
+
+    def __init__(
+        self,
+        policies: Optional[Iterable[Tuple[str, Optional[float]]]] = None,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        directory: Optional[str] = None,
+    ) -> None:
+        self._policies: Tuple[Tuple[Pattern, Optional[float]], ...] = tuple(
+            (re.compile(pattern), ttl)
+            for pattern, ttl in (
+                DEFAULT_POLICIES if policies is None else policies
+            )
+        )
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory is not None:
+            self.directory = os.path.expanduser(directory)
+            os.makedirs(self.directory, exist_ok=True)
+        self.stats = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stored": 0,
+            "evicted": 0,
+            "entries": 0,
+            "bytes": 0,
+        }
+        self._entries: "collections.OrderedDict[str, _Entry]" = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def policy(self, method: str, url: str) -> Tuple[bool, Optional[float]]:
+        """
+        Get whether a request is cacheable, and for how long.
+
+        Args:
+            method (str): request method
+            url (str): absolute url of the request
+
+        Returns:
+            (bool, float): whether the response is cacheable and the number
+            of seconds it is kept for, None meaning for good
+        """
+        if method != "GET":
+            return False, None
+        path = parse.urlsplit(url).path
+        for pattern, ttl in self._policies:
+            if pattern.search(path):
+                return True, ttl
+        return False, None
+
+    def get(
+        self, method: str, url: str
+    ) -> Optional[Tuple[Dict[str, str], bytes]]:
+        """
+        Get a cached response, counting a miss if there is none.
+
+        Args:
+            method (str): request method
+            url (str): absolute url of the request
+
+        Returns:
+            (dict, bytes): headers and body of the response, or None
+        """
+        key = method + " " + url
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires is None or entry.expires > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return entry.headers, entry.body
+                self._remove(key)
+        if self.directory is not None:
+            stored = self._load(key)
+            if stored is not None:
+                headers, body = stored
+                with self._lock:
+                    self.stats["disk_hits"] += 1
+                    self._insert(key, _Entry(headers, body, None))
+                return headers, body
+        with self._lock:
+            self.stats["misses"] += 1
+        return None
+
+    def put(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        body: bytes,
+        ttl: Optional[float],
+    ) -> None:
+        """
+        Cache a response.
+
+        Args:
+            method (str): request method
+            url (str): absolute url of the request
+            headers (dict): response headers to keep
+            body (bytes): response body
+            ttl (float): seconds the response is kept for, or None for good
+        """
+        key = method + " " + url
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self.stats["stored"] += 1
+            self._insert(key, _Entry(headers, body, expires))
+        if ttl is None and self.directory is not None:
+            self._store(key, headers, body)
+
+    def clear(self) -> None:
+        """
+        Remove all responses from memory and from the directory, along with
+        files left by interrupted writes.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.stats["entries"] = self.stats["bytes"] = 0
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith((".response", ".tmp")):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except FileNotFoundError:
+                        # e.g. a write finishing concurrently
+                        pass
+
+    def _insert(self, key: str, entry: _Entry) -> None:
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self.stats["entries"] += 1
+        self.stats["bytes"] += len(entry.body)
+        while self._entries and (
+            self.stats["entries"] > self.max_entries
+            or self.stats["bytes"] > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self.stats["evicted"] += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.stats["entries"] -= 1
+        self.stats["bytes"] -= len(entry.body)
+
+    def _path(self, key: str) -> str:
+        name = hashlib.sha256(key.encode()).hexdigest() + ".response"
+        return os.path.join(self.directory or "", name)
+
+    def _load(self, key: str) -> Optional[Tuple[Dict[str, str], bytes]]:
+        try:
+            with open(self._path(key), "rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("key") != key:
+            return None
+        return meta["headers"], body
+
+    def _store(self, key: str, headers: Dict[str, str], body: bytes) -> None:
+        # written to a temporary file first so that a concurrent _load never
+        # sees a partial response
+        meta = json.dumps({"key": key, "headers": headers}).encode()
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(meta + b"\n" + body)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+
+def _kept_headers(headers) -> Dict[str, str]:
+    kept = {}
+    for name in _KEPT_HEADERS:
+        value = headers.get(name)
+        if value is not None:
+            kept[name] = value
+    return kept
+
+
+class CachingTransport(transport_.Transport):
+    """
+    Transport answering cacheable requests from a ResponseCache, and
+    sending the others through another transport. Bodies of responses to
+    cacheable requests are read in full before being returned.
+
+    Args:
+        transport (Transport, optional): transport sending requests;
+            defaults to the default transport
+        cache (ResponseCache, optional): defaults to a new ResponseCache
+
+    Attributes:
+        transport (Transport)
+        cache (ResponseCache)
+    """
+
+    def __init__(
+        self,
+        transport: Optional[transport_.Transport] = None,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
+        self.transport = transport or transport_.default_transport()
+        self.cache = cache if cache is not None else ResponseCache()
+
+    def request(self, method, url, headers=None, data=None):
+        cacheable, ttl = self.cache.policy(method, url)
+        if not cacheable:
+            return self.transport.request(
+                method, url, headers=headers, data=data
+            )
+        cached = self.cache.get(method, url)
+        if cached is not None:
+            return transport_.Response(200, cached[0], io.BytesIO(cached[1]))
+        resp = self.transport.request(method, url, headers=headers, data=data)
+        if resp.status != 200:
+            return resp
+        with resp:
+            body = resp.read()
+        kept = _kept_headers(resp.headers)
+        self.cache.put(method, url, kept, body, ttl)
+        return transport_.Response(200, kept, io.BytesIO(body))
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncCachingTransport(transport_.AsyncTransport):
+    """
+    AsyncTransport answering cacheable requests from a ResponseCache, and
+    sending the others through another AsyncTransport. If the cache has a
+    directory, it is read and written in the default executor of the event
+    loop, so that file I/O does not block the loop.
+
+    Args:
+        transport (AsyncTransport, optional): defaults to a new
+            AsyncPooledTransport
+        cache (ResponseCache, optional): defaults to a new ResponseCache
+
+    Attributes:
+        transport (AsyncTransport)
+        cache (ResponseCache)
+    """
+
+    def __init__(
+        self,
+        transport: Optional[transport_.AsyncTransport] = None,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
+        self.transport = transport or transport_.AsyncPooledTransport()
+        self.cache = cache if cache is not None else ResponseCache()
+
+    async def request(self, method, url, headers=None, data=None):
+        cacheable, ttl = self.cache.policy(method, url)
+        if not cacheable:
+            return await self.transport.request(
+                method, url, headers=headers, data=data
+            )
+        cached = await self._in_executor(self.cache.get, method, url)
+        if cached is not None:
+            return transport_._buffered_async_response(200, *cached)
+        resp = await self.transport.request(
+            method, url, headers=headers, data=data
+        )
+        if resp.status != 200:
+            return resp
+        async with resp:
+            body = await resp.read()
+        kept = _kept_headers(resp.headers)
+        await self._in_executor(self.cache.put, method, url, kept, body, ttl)
+        return transport_._buffered_async_response(200, kept, body)
+
+    async def _in_executor(self, func: Callable[..., T], *args: Any) -> T:
+        if self.cache.directory is None:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+
+    async def close(self) -> None:
+        await self.transport.close()
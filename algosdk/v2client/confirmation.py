@@ -0,0 +1,280 @@
+"""
+Tracking of the confirmation of many transactions at once.
+
+transaction.wait_for_confirmation asks a node about one transaction every
+round, blocking a thread. A ConfirmationTracker instead follows the chain in
+a single thread, reads each new block once, and resolves a future for every
+transaction tracked that it contains:
+
+    with ConfirmationTracker(algod_client) as tracker:
+        futures = [tracker.track_transaction(stxn) for stxn in stxns]
+        for future in futures:
+            confirmed = future.result()
+            print(confirmed.txid, confirmed.confirmed_round)
+"""
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, cast
+
+from algosdk import error, transaction
+from algosdk.v2client import algod, responses
+
+
+class _Tracked:
+    __slots__ = ("future", "last_valid_round", "checked_round")
+
+    def __init__(
+        self, future: Future, last_valid_round: int, checked_round: int
+    ) -> None:
+        self.future = future
+        self.last_valid_round = last_valid_round
+        self.checked_round = checked_round
+
+
+class ConfirmationTracker:
+    """
+    Thread safe tracker of the confirmation of transactions.
+
+    Once started, a daemon thread waits for each new round with
+    status_after_block and reads its block with block_info, in the "decoded"
+    format. The future of each tracked transaction in the block is resolved
+    with its responses.BlockTransaction, whose confirmed_round is set.
+    Rounds are not read while no transaction is tracked.
+
+    A transaction still not confirmed once the block of its last valid
+    round is read never will be: its future fails with
+    ConfirmationTimeoutError. Every check_rounds rounds without
+    confirmation, pending_transaction_info is asked about it, for its
+    future to fail with TransactionRejectedError if the node dropped it
+    from its pool, or to read the block it was confirmed in if that was
+    before the tracker started.
+
+    Args:
+        client (AlgodClient): client the chain is followed with
+        check_rounds (int, optional): number of rounds after which a
+            transaction not confirmed is asked about
+        retry_delay (float, optional): seconds the thread waits after a
+            failed request
+
+    Attributes:
+        client (AlgodClient)
+        check_rounds (int)
+        retry_delay (float)
+        error (Exception): last error of the thread, None once it succeeds
+        stats (dict): numbers of "blocks" read, of transactions
+            "confirmed", "rejected" and "expired", and of "checks" with
+            pending_transaction_info
+    """
+
+    def __init__(
+        self,
+        client: algod.AlgodClient,
+        check_rounds: int = 5,
+        retry_delay: float = 1.0,
+    ) -> None:
+        self.client = client
+        self.check_rounds = check_rounds
+        self.retry_delay = retry_delay
+        self.error: Optional[Exception] = None
+        self.stats = {
+            "blocks": 0,
+            "confirmed": 0,
+            "rejected": 0,
+            "expired": 0,
+            "checks": 0,
+        }
+        self._tracked: Dict[str, _Tracked] = {}
+        # last round read, or known to have no tracked transaction
+        self._round = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of transactions tracked and not resolved yet"""
+        return len(self._tracked)
+
+    def track(
+        self,
+        txid: str,
+        last_valid_round: int,
+        callback: Optional[Callable[[Future], None]] = None,
+    ) -> Future:
+        """
+        Track the confirmation of a transaction.
+
+        Args:
+            txid (str): transaction ID
+            last_valid_round (int): last round the transaction is valid for
+            callback (Callable[[Future], None], optional): called with the
+                future once it is resolved, in the thread of the tracker
+
+        Returns:
+            Future: resolved with the responses.BlockTransaction of the
+            transaction once confirmed. Tracking the same transaction twice
+            returns the same future.
+        """
+        with self._lock:
+            tracked = self._tracked.get(txid)
+            if tracked is None:
+                tracked = _Tracked(Future(), last_valid_round, self._round)
+                self._tracked[txid] = tracked
+        if callback is not None:
+            tracked.future.add_done_callback(callback)
+        return tracked.future
+
+    def track_transaction(
+        self,
+        txn: "transaction.GenericSignedTransaction",
+        callback: Optional[Callable[[Future], None]] = None,
+    ) -> Future:
+        """
+        Track the confirmation of a signed transaction, see track.
+
+        Args:
+            txn (SignedTransaction, MultisigTransaction, or
+                LogicSigTransaction): signed transaction
+            callback (Callable[[Future], None], optional): called with the
+                future once it is resolved
+
+        Returns:
+            Future: resolved with the responses.BlockTransaction of the
+            transaction once confirmed
+        """
+        return self.track(
+            txn.get_txid(), txn.transaction.last_valid_round, callback
+        )
+
+    def start(self) -> None:
+        """Start following the chain in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stop,), daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """
+        Stop following the chain. Futures not resolved yet stay so; the
+        thread exits once its pending request returns.
+        """
+        self._stop.set()
+        self._thread = None
+
+    def __enter__(self) -> "ConfirmationTracker":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _run(self, stop: threading.Event) -> None:
+        last_round = 0
+        while not stop.is_set():
+            try:
+                if last_round:
+                    status = self.client.status_after_block(last_round)
+                else:
+                    status = self.client.status()
+                last_round = cast(dict, status)["last-round"]
+                if not self._round:
+                    self._start_round(last_round)
+                while self._round < last_round and not stop.is_set():
+                    self._advance(self._round + 1)
+                if not stop.is_set():
+                    self._check()
+                self.error = None
+            except Exception as e:
+                self.error = e
+                last_round = 0
+                stop.wait(self.retry_delay)
+
+    def _start_round(self, last_round: int) -> None:
+        """
+        Set the first round to read, now that it is known. Transactions
+        tracked before count as checked then, not at round 0, so that they
+        are not all asked about at once.
+        """
+        with self._lock:
+            # transactions sent before the tracker started may be in the
+            # last block already
+            self._round = last_round - 1
+            for tracked in self._tracked.values():
+                if not tracked.checked_round:
+                    tracked.checked_round = self._round
+
+    def _advance(self, rnd: int) -> None:
+        """Read the block of a round if transactions are tracked."""
+        if self._tracked:
+            self._read_block(rnd)
+        expired: List[_Tracked] = []
+        with self._lock:
+            self._round = rnd
+            for txid, tracked in list(self._tracked.items()):
+                if tracked.last_valid_round <= rnd or tracked.future.done():
+                    del self._tracked[txid]
+                    expired.append(tracked)
+        for tracked in expired:
+            if tracked.future.set_running_or_notify_cancel():
+                self.stats["expired"] += 1
+                tracked.future.set_exception(
+                    error.ConfirmationTimeoutError(
+                        "Transaction not confirmed by round {}".format(
+                            tracked.last_valid_round
+                        )
+                    )
+                )
+
+    def _read_block(self, rnd: int) -> None:
+        block = cast(
+            responses.Block,
+            self.client.block_info(rnd, response_format="decoded"),
+        )
+        self.stats["blocks"] += 1
+        for btxn in block:
+            if not self._tracked:
+                break
+            with self._lock:
+                tracked = self._tracked.pop(btxn.txid, None)
+            if tracked is not None and (
+                tracked.future.set_running_or_notify_cancel()
+            ):
+                self.stats["confirmed"] += 1
+                tracked.future.set_result(btxn)
+
+    def _check(self) -> None:
+        """
+        Ask about the transactions not confirmed for check_rounds rounds.
+        """
+        with self._lock:
+            due = [
+                (txid, tracked)
+                for txid, tracked in self._tracked.items()
+                if self._round - tracked.checked_round >= self.check_rounds
+            ]
+        for txid, tracked in due:
+            tracked.checked_round = self._round
+            self.stats["checks"] += 1
+            try:
+                info = cast(dict, self.client.pending_transaction_info(txid))
+            except error.AlgodHTTPError:
+                # unknown to the node, e.g. sent to another node
+                continue
+            if info.get("pool-error"):
+                with self._lock:
+                    if self._tracked.get(txid) is not tracked:
+                        continue
+                    del self._tracked[txid]
+                if tracked.future.set_running_or_notify_cancel():
+                    self.stats["rejected"] += 1
+                    tracked.future.set_exception(
+                        error.TransactionRejectedError(
+                            "Transaction rejected: " + info["pool-error"]
+                        )
+                    )
+            elif 0 < info.get("confirmed-round", 0) <= self._round:
+                # confirmed in a block not read
+                self._read_block(info["confirmed-round"])
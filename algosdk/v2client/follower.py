@@ -0,0 +1,302 @@
+"""
+Iteration over the blocks of the chain, from a round onward.
+
+A BlockFollower yields each block in turn, decoded as a responses.Block.
+While behind the chain it fetches the next blocks in parallel; once caught
+up it waits for each new block with status_after_block. With a checkpoint,
+the round to continue from is saved as blocks are processed, so that a
+consumer started again continues where it stopped:
+
+    follower = BlockFollower(algod_client, checkpoint="blocks.checkpoint")
+    for block in follower:
+        process(block)
+
+A block counts as processed once the next one is asked for: after a
+restart, the block being processed when the consumer stopped is yielded
+again.
+"""
+import asyncio
+import collections
+import json
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Iterator,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
+
+from algosdk.v2client import algod, responses
+from algosdk.v2client.algod import _is_retryable
+
+T = TypeVar("T")
+
+
+class FileCheckpoint:
+    """
+    Checkpoint kept in a file, as json. It is replaced atomically, so that
+    it is never left partly written.
+
+    Args:
+        path (str): path of the file
+
+    Attributes:
+        path (str)
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def load(self) -> Optional[int]:
+        """
+        Get the round saved.
+
+        Returns:
+            int: the next round to process, or None if none was saved
+        """
+        try:
+            with open(self.path) as f:
+                return json.load(f)["next-round"]
+        except FileNotFoundError:
+            return None
+
+    def save(self, next_round: int) -> None:
+        """
+        Save the next round to process.
+
+        Args:
+            next_round (int): round
+        """
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"next-round": next_round}, f)
+        os.replace(tmp, self.path)
+
+
+CheckpointType = Union[str, FileCheckpoint]
+
+
+def _checkpoint(checkpoint: Optional[CheckpointType]):
+    if isinstance(checkpoint, str):
+        return FileCheckpoint(checkpoint)
+    return checkpoint
+
+
+class _BaseFollower:
+    def __init__(
+        self,
+        client,
+        start_round: Optional[int],
+        prefetch: int,
+        checkpoint: Optional[CheckpointType],
+        retries: int,
+        retry_delay: float,
+    ) -> None:
+        if prefetch < 1:
+            raise ValueError("prefetch must be at least 1")
+        self.client = client
+        self.prefetch = prefetch
+        self.checkpoint = _checkpoint(checkpoint)
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.next_round: Optional[int] = start_round
+        if self.checkpoint is not None:
+            saved = self.checkpoint.load()
+            if saved is not None:
+                self.next_round = saved
+
+    def _processed(self, rnd: int) -> None:
+        self.next_round = rnd + 1
+        if self.checkpoint is not None:
+            self.checkpoint.save(rnd + 1)
+
+
+class BlockFollower(_BaseFollower):
+    """
+    Iterable over the blocks of the chain, from a round onward, without
+    end. See the module documentation.
+
+    Args:
+        client (AlgodClient): client the blocks are fetched with
+        start_round (int, optional): first round; defaults to the round of
+            the last block when iteration starts. Ignored if the checkpoint
+            has a round saved.
+        prefetch (int, optional): maximum number of blocks fetched in
+            parallel, ahead of the consumer, while behind the chain
+        checkpoint (str or FileCheckpoint, optional): path of a file, or
+            any object with the load and save methods of FileCheckpoint,
+            in which the next round to process is saved
+        retries (int, optional): number of retries of a request failing
+            with a connection error, a 429 or 5xx status
+        retry_delay (float, optional): seconds to wait before a retry
+
+    Attributes:
+        client (AlgodClient)
+        prefetch (int)
+        checkpoint (FileCheckpoint)
+        retries (int)
+        retry_delay (float)
+        next_round (int): next round to yield, None before it is known
+    """
+
+    def __init__(
+        self,
+        client: algod.AlgodClient,
+        start_round: Optional[int] = None,
+        prefetch: int = 8,
+        checkpoint: Optional[CheckpointType] = None,
+        retries: int = 3,
+        retry_delay: float = 1.0,
+    ) -> None:
+        super().__init__(
+            client, start_round, prefetch, checkpoint, retries, retry_delay
+        )
+
+    def __iter__(self) -> Iterator[responses.Block]:
+        last_round = cast(dict, self._retry(self.client.status))["last-round"]
+        if self.next_round is None:
+            self.next_round = last_round
+        to_fetch = self.next_round
+        executor = ThreadPoolExecutor(self.prefetch)
+        fetching: Deque[
+            Tuple[int, "Future[responses.Block]"]
+        ] = collections.deque()
+        try:
+            while True:
+                while len(fetching) < self.prefetch and to_fetch <= last_round:
+                    fetching.append(
+                        (to_fetch, executor.submit(self._block, to_fetch))
+                    )
+                    to_fetch += 1
+                if not fetching:
+                    # caught up: wait for the next block
+                    status = self._retry(
+                        lambda: self.client.status_after_block(last_round)
+                    )
+                    last_round = max(
+                        last_round, cast(dict, status)["last-round"]
+                    )
+                    continue
+                rnd, future = fetching.popleft()
+                yield future.result()
+                self._processed(rnd)
+        finally:
+            for _, future in fetching:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _block(self, rnd: int) -> responses.Block:
+        return cast(
+            responses.Block,
+            self._retry(
+                lambda: self.client.block_info(rnd, response_format="decoded")
+            ),
+        )
+
+    def _retry(self, request: Callable[[], T]) -> T:
+        for attempt in range(self.retries + 1):
+            try:
+                return request()
+            except Exception as e:
+                if attempt == self.retries or not _is_retryable(e):
+                    raise
+            time.sleep(self.retry_delay)
+        raise AssertionError("unreachable")
+
+
+class AsyncBlockFollower(_BaseFollower):
+    """
+    Asynchronous iterable over the blocks of the chain, from a round
+    onward, without end, fetched with an AsyncAlgodClient. See
+    BlockFollower.
+
+    Args:
+        client (AsyncAlgodClient): client the blocks are fetched with
+        start_round (int, optional): first round; defaults to the round of
+            the last block when iteration starts. Ignored if the checkpoint
+            has a round saved.
+        prefetch (int, optional): maximum number of blocks fetched
+            concurrently, ahead of the consumer, while behind the chain
+        checkpoint (str or FileCheckpoint, optional): path of a file, or
+            any object with the load and save methods of FileCheckpoint,
+            in which the next round to process is saved
+        retries (int, optional): number of retries of a request failing
+            with a connection error, a 429 or 5xx status
+        retry_delay (float, optional): seconds to wait before a retry
+
+    Attributes:
+        client (AsyncAlgodClient)
+        prefetch (int)
+        checkpoint (FileCheckpoint)
+        retries (int)
+        retry_delay (float)
+        next_round (int): next round to yield, None before it is known
+    """
+
+    def __init__(
+        self,
+        client: algod.AsyncAlgodClient,
+        start_round: Optional[int] = None,
+        prefetch: int = 8,
+        checkpoint: Optional[CheckpointType] = None,
+        retries: int = 3,
+        retry_delay: float = 1.0,
+    ) -> None:
+        super().__init__(
+            client, start_round, prefetch, checkpoint, retries, retry_delay
+        )
+
+    async def __aiter__(self) -> AsyncIterator[responses.Block]:
+        status = await self._retry(lambda: self.client.status())
+        last_round = status["last-round"]
+        if self.next_round is None:
+            self.next_round = last_round
+        to_fetch = self.next_round
+        fetching: Deque[
+            Tuple[int, "asyncio.Future[responses.Block]"]
+        ] = collections.deque()
+        try:
+            while True:
+                while len(fetching) < self.prefetch and to_fetch <= last_round:
+                    fetching.append(
+                        (
+                            to_fetch,
+                            asyncio.ensure_future(self._block(to_fetch)),
+                        )
+                    )
+                    to_fetch += 1
+                if not fetching:
+                    status = await self._retry(
+                        lambda: self.client.status_after_block(last_round)
+                    )
+                    last_round = max(last_round, status["last-round"])
+                    continue
+                rnd, future = fetching.popleft()
+                yield await future
+                self._processed(rnd)
+        finally:
+            for _, future in fetching:
+                future.cancel()
+
+    async def _block(self, rnd: int) -> responses.Block:
+        return await self._retry(
+            lambda: self.client.block_info(rnd, response_format="decoded")
+        )
+
+    async def _retry(self, request: Callable[[], Awaitable]):
+        for attempt in range(self.retries + 1):
+            try:
+                return await request()
+            except Exception as e:
+                if attempt == self.retries or not _is_retryable(e):
+                    raise
+            await asyncio.sleep(self.retry_delay)
+        raise AssertionError("unreachable")
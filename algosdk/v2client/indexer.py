@@ -1,11 +1,18 @@
-from urllib.request import Request, urlopen
+from concurrent.futures import ThreadPoolExecutor
 from urllib import parse
-import urllib.error
+import asyncio
+import collections
 import json
 import base64
+import codecs
+import inspect
+import queue
+import re
+import threading
 from .. import error
 from .. import constants
-from .algod import _specify_round_string
+from . import transport as transport_
+from .algod import _add_coroutine_methods, _specify_round_string
 
 api_version_path_prefix = "/v2"
 
@@ -14,24 +21,65 @@ class IndexerClient:
     """
     Client class for indexer. Handles all indexer requests.
 
+    For each paginated method, such as search_transactions, an iter_ method
+    such as iter_search_transactions takes the same arguments and returns a
+    ResultIterator over the results of all the pages:
+
+        for txn in indexer_client.iter_search_transactions(min_round=1000):
+            ...
+
+    Every method also takes a response_format argument, passed on to
+    indexer_request: "json" (the default) for the response as a dict, "raw"
+    for the bytes of its body, or "stream" for a ResponseStream parsing the
+    items of the array in the response, such as its transactions or
+    accounts, as they are read:
+
+        with indexer_client.search_transactions(
+            limit=10000, response_format="stream"
+        ) as txns:
+            for txn in txns:
+                ...
+            next_page = txns.fields.get("next-token")
+
     Args:
         indexer_token (str): indexer API token
         indexer_address (str): indexer address
         headers (dict, optional): extra header name/value for all requests
+        transport (Transport, optional): sends the requests; defaults to
+            transport.default_transport()
+        sort_responses (bool, optional): whether to sort the keys of the
+            dicts in json responses
 
     Attributes:
         indexer_token (str)
         indexer_address (str)
         headers (dict)
+        transport (Transport)
+        sort_responses (bool)
     """
 
-    def __init__(self, indexer_token, indexer_address, headers=None):
+    def __init__(
+        self,
+        indexer_token,
+        indexer_address,
+        headers=None,
+        transport=None,
+        sort_responses=False,
+    ):
         self.indexer_token = indexer_token
         self.indexer_address = indexer_address
         self.headers = headers
+        self.transport = transport or transport_.default_transport()
+        self.sort_responses = sort_responses
 
     def indexer_request(
-        self, method, requrl, params=None, data=None, headers=None
+        self,
+        method,
+        requrl,
+        params=None,
+        data=None,
+        headers=None,
+        response_format="json",
     ):
         """
         Execute a given request.
@@ -42,10 +90,26 @@ class IndexerClient:
             params (dict, optional): parameters for the request
             data (dict, optional): data in the body of the request
             headers (dict, optional): additional header for request
+            response_format (str, optional): "json", "raw" or "stream"
 
         Returns:
-            dict: loaded from json response body
+            dict: loaded from json response body if response_format is
+            "json"; bytes of the body if it is "raw"; a ResponseStream
+            over the items of the array in the body if it is "stream"
         """
+        _check_response_format(response_format)
+        url, header = self._build_request(requrl, params, headers)
+        resp = self.transport.request(method, url, headers=header, data=data)
+        if response_format == "stream" and 200 <= resp.status < 300:
+            return ResponseStream(resp, self.sort_responses)
+        with resp:
+            body = resp.read()
+        return _parse_response(
+            resp.status, body, response_format, self.sort_responses
+        )
+
+    def _build_request(self, requrl, params=None, headers=None):
+        """Get the full url and headers of a request."""
         header = {"User-Agent": "py-algorand-sdk"}
 
         if self.headers:
@@ -62,30 +126,7 @@ class IndexerClient:
         if params:
             requrl = requrl + "?" + parse.urlencode(params)
 
-        req = Request(
-            self.indexer_address + requrl,
-            headers=header,
-            method=method,
-            data=data,
-        )
-
-        try:
-            resp = urlopen(req)
-        except urllib.error.HTTPError as e:
-            e = e.read().decode("utf-8")
-            try:
-                e = json.loads(e)["message"]
-            finally:
-                raise error.IndexerHTTPError(e)
-        response_dict = json.loads(resp.read().decode("utf-8"))
-
-        def recursively_sort_dict(dictionary):
-            return {
-                k: recursively_sort_dict(v) if isinstance(v, dict) else v
-                for k, v in sorted(dictionary.items())
-            }
-
-        return recursively_sort_dict(response_dict)
+        return self.indexer_address + requrl, header
 
     def health(self, **kwargs):
         """Return 200 and a simple status message if the node is running."""
@@ -971,6 +1012,897 @@ class IndexerClient:
 
         return self.indexer_request("GET", req, params, **kwargs)
 
+    def scan_transactions(
+        self,
+        min_round,
+        max_round,
+        workers=4,
+        shard_rounds=1000,
+        shard_results=5000,
+        **kwargs
+    ):
+        """
+        Iterate over the transactions of search_transactions between two
+        rounds, in round and intra-round order, searching several ranges of
+        rounds in parallel.
+
+        The rounds are split into shards, each searched on a worker thread
+        with its own pagination. The first shards span shard_rounds rounds;
+        the following ones are sized from the number of transactions per
+        round in the last shard searched, to hold about shard_results
+        transactions. Up to
+        workers shards are searched ahead of the one being iterated over,
+        and only the transactions of these shards are kept in memory.
+
+        Args:
+            min_round (int): first round of the scan
+            max_round (int): last round of the scan
+            workers (int, optional): number of shards searched in parallel
+            shard_rounds (int, optional): number of rounds of the first
+                shards
+            shard_results (int, optional): number of transactions aimed at
+                per shard
+            **kwargs: other arguments of search_transactions, such as
+                address, asset_id or limit
+
+        Returns:
+            Iterator[dict]: the transactions
+        """
+        planner = _ShardPlanner(
+            min_round, max_round, shard_rounds, shard_results
+        )
+
+        def search(shard):
+            lo, hi = shard
+            return _sorted_transactions(
+                self.iter_search_transactions(
+                    min_round=lo, max_round=hi, prefetch=0, **kwargs
+                )
+            )
+
+        with ThreadPoolExecutor(workers) as executor:
+            shards = collections.deque()
+            try:
+                while True:
+                    while len(shards) < workers and not planner.done:
+                        shard = planner.next_shard()
+                        shards.append((shard, executor.submit(search, shard)))
+                    if not shards:
+                        return
+                    shard, future = shards.popleft()
+                    txns = future.result()
+                    planner.record(shard, len(txns))
+                    yield from txns
+            finally:
+                for _, future in shards:
+                    future.cancel()
+
+
+class AsyncIndexerClient(IndexerClient):
+    """
+    asyncio client for indexer. It has the same methods as IndexerClient,
+    taking the same arguments, as coroutines.
+
+    As with IndexerClient, each paginated method has an iter_ method,
+    which here returns an AsyncResultIterator over the results of all the
+    pages:
+
+        async with AsyncIndexerClient(indexer_token, indexer_address) as c:
+            async for txn in c.iter_search_transactions(min_round=1000):
+                ...
+
+    Pages are requested on a task ahead of the caller, keeping up to
+    prefetch pages (an argument of the iter_ methods, 1 by default) ready.
+    With prefetch=0, a page is only requested once the results of the
+    previous one have all been iterated over. As with ResultIterator, the
+    cursor of the iterator resumes it when passed to the iter_ method called
+    again with the same arguments.
+
+    Args:
+        indexer_token (str): indexer API token
+        indexer_address (str): indexer address
+        headers (dict, optional): extra header name/value for all requests
+        transport (AsyncTransport, optional): sends the requests; defaults
+            to a new AsyncPooledTransport
+        sort_responses (bool, optional): whether to sort the keys of the
+            dicts in json responses
+
+    Attributes:
+        indexer_token (str)
+        indexer_address (str)
+        headers (dict)
+        transport (AsyncTransport)
+        sort_responses (bool)
+    """
+
+    def __init__(
+        self,
+        indexer_token,
+        indexer_address,
+        headers=None,
+        transport=None,
+        sort_responses=False,
+    ):
+        super().__init__(
+            indexer_token,
+            indexer_address,
+            headers,
+            transport or transport_.AsyncPooledTransport(),
+            sort_responses,
+        )
+
+    async def indexer_request(
+        self,
+        method,
+        requrl,
+        params=None,
+        data=None,
+        headers=None,
+        response_format="json",
+    ):
+        """
+        Execute a given request.
+
+        Args:
+            method (str): request method
+            requrl (str): url for the request
+            params (dict, optional): parameters for the request
+            data (dict, optional): data in the body of the request
+            headers (dict, optional): additional header for request
+            response_format (str, optional): "json", "raw" or "stream"
+
+        Returns:
+            dict: loaded from json response body if response_format is
+            "json"; bytes of the body if it is "raw"; an
+            AsyncResponseStream over the items of the array in the body if
+            it is "stream"
+        """
+        _check_response_format(response_format)
+        url, header = self._build_request(requrl, params, headers)
+        resp = await self.transport.request(
+            method, url, headers=header, data=data
+        )
+        if response_format == "stream" and 200 <= resp.status < 300:
+            return AsyncResponseStream(resp, self.sort_responses)
+        async with resp:
+            body = await resp.read()
+        return _parse_response(
+            resp.status, body, response_format, self.sort_responses
+        )
+
+    async def scan_transactions(
+        self,
+        min_round,
+        max_round,
+        workers=4,
+        shard_rounds=1000,
+        shard_results=5000,
+        **kwargs
+    ):
+        """
+        Iterate over the transactions of search_transactions between two
+        rounds, in round and intra-round order, searching several ranges of
+        rounds concurrently; see IndexerClient.scan_transactions.
+
+        Args:
+            min_round (int): first round of the scan
+            max_round (int): last round of the scan
+            workers (int, optional): number of shards searched concurrently
+            shard_rounds (int, optional): number of rounds of the first
+                shards
+            shard_results (int, optional): number of transactions aimed at
+                per shard
+            **kwargs: other arguments of search_transactions, such as
+                address, asset_id or limit
+
+        Returns:
+            AsyncIterator[dict]: the transactions
+        """
+        planner = _ShardPlanner(
+            min_round, max_round, shard_rounds, shard_results
+        )
+
+        async def search(shard):
+            lo, hi = shard
+            results = self.iter_search_transactions(
+                min_round=lo, max_round=hi, prefetch=0, **kwargs
+            )
+            return _sorted_transactions([txn async for txn in results])
+
+        shards = collections.deque()
+        try:
+            while True:
+                while len(shards) < workers and not planner.done:
+                    shard = planner.next_shard()
+                    task = asyncio.ensure_future(search(shard))
+                    shards.append((shard, task))
+                if not shards:
+                    return
+                shard, task = shards.popleft()
+                txns = await task
+                planner.record(shard, len(txns))
+                for txn in txns:
+                    yield txn
+        finally:
+            for _, task in shards:
+                task.cancel()
+
+    async def close(self):
+        """Close the transport of the client."""
+        await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+class _ShardPlanner:
+    """
+    Splits a range of rounds into consecutive shards, sizing each from the
+    density of results in the last shard recorded.
+    """
+
+    def __init__(self, min_round, max_round, shard_rounds, shard_results):
+        self.next_round = min_round
+        self.max_round = max_round
+        self.size = max(1, shard_rounds)
+        self.shard_results = shard_results
+
+    @property
+    def done(self):
+        return self.next_round > self.max_round
+
+    def next_shard(self):
+        lo = self.next_round
+        hi = min(lo + self.size - 1, self.max_round)
+        self.next_round = hi + 1
+        return lo, hi
+
+    def record(self, shard, results):
+        lo, hi = shard
+        if results:
+            self.size = max(
+                1, round(self.shard_results * (hi - lo + 1) / results)
+            )
+        else:
+            # grow shards over stretches without results
+            self.size = max(self.size, hi - lo + 1) * 2
+
+
+def _sorted_transactions(txns):
+    return sorted(
+        txns,
+        key=lambda txn: (
+            txn.get("confirmed-round", 0),
+            txn.get("intra-round-offset", 0),
+        ),
+    )
+
+
+# Methods returning a page of results, with the key of the results in their
+# responses.
+_paginated_methods = {
+    "accounts": "accounts",
+    "asset_balances": "balances",
+    "lookup_account_assets": "assets",
+    "lookup_account_asset_by_creator": "assets",
+    "lookup_account_application_local_state": "apps-local-states",
+    "lookup_account_application_by_creator": "applications",
+    "search_transactions": "transactions",
+    "search_transactions_by_address": "transactions",
+    "search_asset_transactions": "transactions",
+    "search_assets": "assets",
+    "search_applications": "applications",
+    "application_logs": "log-data",
+    "application_boxes": "boxes",
+}
+
+
+def _next_token(page, key):
+    """Get the next-token of a page, or None if it is the last one."""
+    if not page.get(key):
+        return None
+    return page.get("next-token") or None
+
+
+class ResultIterator:
+    """
+    Iterator over the results of all the pages of a paginated IndexerClient
+    method, returned by the corresponding iter_ method. Each page is
+    requested with the next-token of the previous one.
+
+    With prefetch above 0, pages are requested on a background thread
+    while the caller goes through the results of the current page, keeping
+    up to prefetch pages ready. With prefetch=0, a page is only requested
+    once the results of the previous one have all been iterated over.
+
+    The iterator can be resumed later, or in another process, by passing
+    its cursor to the iter_ method called again with the same arguments.
+    Close it, or use it as a context manager, to stop prefetching when
+    leaving it before the end.
+
+    Args:
+        fetch (Callable[[str], dict]): gets the page with the given
+            next-token, or the first page if given None
+        key (str): key of the results in a page
+        prefetch (int, optional): number of pages to keep ready
+        cursor (tuple, optional): cursor of an iterator to resume from
+
+    Attributes:
+        cursor (tuple): the next-token of the page of the next result, or
+            None for the first page, and the number of results of that page
+            already iterated over
+    """
+
+    def __init__(self, fetch, key, prefetch=1, cursor=None):
+        self._fetch = fetch
+        self._key = key
+        self._prefetch = prefetch
+        self._prefetcher = None
+        token, offset = cursor or (None, 0)
+        self.cursor = (token, offset)
+        self._results = None
+        self._next_page = token
+        self._skip = offset
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        token, offset = self.cursor
+        while self._results is None or offset >= len(self._results):
+            if self._results is not None and self._next_page is None:
+                raise StopIteration
+            token, page = self._get_page()
+            self._results = page.get(self._key, [])
+            self._next_page = _next_token(page, self._key)
+            offset, self._skip = self._skip, 0
+        self.cursor = (token, offset + 1)
+        return self._results[offset]
+
+    def _get_page(self):
+        token = self._next_page
+        if self._prefetch < 1:
+            return token, self._fetch(token)
+        if self._prefetcher is None:
+            self._prefetcher = _Prefetcher(
+                self._fetch, self._key, self._prefetch, token
+            )
+        try:
+            return self._prefetcher.get()
+        except Exception:
+            # the thread stopped at the failed page: prefetching starts
+            # again from it on the next call
+            self._prefetcher = None
+            raise
+
+    def close(self):
+        """Stop prefetching pages."""
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+
+class _Prefetcher:
+    """
+    Requests pages on a daemon thread, up to prefetch ahead of those taken
+    with get. Kept apart from ResultIterator so that the thread does not
+    keep the iterator alive.
+    """
+
+    def __init__(self, fetch, key, prefetch, token):
+        self._room = threading.Semaphore(prefetch)
+        self._pages = queue.Queue()
+        self._closed = False
+        thread = threading.Thread(
+            target=self._run, args=(fetch, key, token), daemon=True
+        )
+        thread.start()
+
+    def _run(self, fetch, key, token):
+        try:
+            while True:
+                self._room.acquire()
+                if self._closed:
+                    return
+                page = fetch(token)
+                self._pages.put((token, page, None))
+                token = _next_token(page, key)
+                if token is None:
+                    return
+        except Exception as e:
+            self._pages.put((token, None, e))
+
+    def get(self):
+        token, page, exc = self._pages.get()
+        self._room.release()
+        if exc is not None:
+            raise exc
+        return token, page
+
+    def close(self):
+        self._closed = True
+        self._room.release()
+
+
+def _page_request(method, args, kwargs):
+    """
+    Bind the arguments of a paginated method.
+
+    Returns:
+        (str, Callable[[str], Any]): the next_page given, positionally or
+        not, and a function calling the method with the arguments for the
+        page with another next-token
+    """
+    bound = inspect.signature(method).bind(*args, **kwargs)
+    next_page = bound.arguments.pop("next_page", None)
+
+    def request(token):
+        bound.arguments["next_page"] = token
+        return method(*bound.args, **bound.kwargs)
+
+    return next_page, request
+
+
+def _iter_method(name, key):
+    def iter_results(self, *args, prefetch=1, cursor=None, **kwargs):
+        next_page, fetch = _page_request(getattr(self, name), args, kwargs)
+        return ResultIterator(fetch, key, prefetch, cursor or (next_page, 0))
+
+    iter_results.__name__ = iter_results.__qualname__ = "iter_" + name
+    iter_results.__doc__ = (
+        "Get a ResultIterator over the {!r} of all the pages of {}, which "
+        "takes the same arguments, keeping up to prefetch pages ready "
+        "ahead. Pass the cursor of a previous iterator to resume "
+        "it.".format(key, name)
+    )
+    return iter_results
+
+
+async def _async_pages(fetch, key, prefetch, token):
+    """
+    Iterate over pages, following next-tokens.
+
+    Args:
+        fetch (Callable[[str], Awaitable[dict]]): gets the page with the
+            given next-token, or the first page if given None
+        key (str): key of the results in a page
+        prefetch (int): number of pages to keep ready ahead of the caller
+        token (str): next-token of the first page
+
+    Yields:
+        (str, dict): the next-token of each page, and the page
+    """
+    # a page is only requested when there is room for it, so that at most
+    # prefetch pages are ready ahead of the caller
+    room = asyncio.Semaphore(prefetch)
+    pages = asyncio.Queue()
+
+    async def produce(token):
+        try:
+            while True:
+                await room.acquire()
+                page = await fetch(token)
+                pages.put_nowait((token, page, None))
+                token = _next_token(page, key)
+                if token is None:
+                    return
+        except Exception as e:
+            pages.put_nowait((token, None, e))
+
+    task = asyncio.ensure_future(produce(token))
+    try:
+        while True:
+            token, page, exc = await pages.get()
+            room.release()
+            if exc is not None:
+                raise exc
+            yield token, page
+    finally:
+        task.cancel()
+
+
+class AsyncResultIterator:
+    """
+    Asynchronous iterator over the results of all the pages of a paginated
+    AsyncIndexerClient method, returned by the corresponding iter_ method.
+    See ResultIterator; pages are prefetched on a task rather than a
+    thread.
+
+    Close it with aclose, or use it as an asynchronous context manager, to
+    stop prefetching when leaving it before the end.
+
+    Args:
+        fetch (Callable[[str], Awaitable[dict]]): gets the page with the
+            given next-token, or the first page if given None
+        key (str): key of the results in a page
+        prefetch (int, optional): number of pages to keep ready
+        cursor (tuple, optional): cursor of an iterator to resume from
+
+    Attributes:
+        cursor (tuple): the next-token of the page of the next result, or
+            None for the first page, and the number of results of that page
+            already iterated over
+    """
+
+    def __init__(self, fetch, key, prefetch=1, cursor=None):
+        self._fetch = fetch
+        self._key = key
+        self._prefetch = prefetch
+        self._pages = None
+        token, offset = cursor or (None, 0)
+        self.cursor = (token, offset)
+        self._results = None
+        self._next_page = token
+        self._skip = offset
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        token, offset = self.cursor
+        while self._results is None or offset >= len(self._results):
+            if self._results is not None and self._next_page is None:
+                raise StopAsyncIteration
+            token, page = await self._get_page()
+            self._results = page.get(self._key, [])
+            self._next_page = _next_token(page, self._key)
+            offset, self._skip = self._skip, 0
+        self.cursor = (token, offset + 1)
+        return self._results[offset]
+
+    async def _get_page(self):
+        token = self._next_page
+        if self._prefetch < 1:
+            return token, await self._fetch(token)
+        if self._pages is None:
+            self._pages = _async_pages(
+                self._fetch, self._key, self._prefetch, token
+            )
+        try:
+            return await self._pages.__anext__()
+        except Exception:
+            # the pages stopped at the failed one: prefetching starts again
+            # from it on the next call
+            self._pages = None
+            raise
+
+    async def aclose(self):
+        """Stop prefetching pages."""
+        if self._pages is not None:
+            pages, self._pages = self._pages, None
+            await pages.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+def _async_iter_method(name, key):
+    def iter_results(self, *args, prefetch=1, cursor=None, **kwargs):
+        next_page, fetch = _page_request(getattr(self, name), args, kwargs)
+        return AsyncResultIterator(
+            fetch, key, prefetch, cursor or (next_page, 0)
+        )
+
+    iter_results.__name__ = iter_results.__qualname__ = "iter_" + name
+    iter_results.__doc__ = (
+        "Get an AsyncResultIterator over the {!r} of all the pages of {}, "
+        "which takes the same arguments, keeping up to prefetch pages "
+        "ready ahead. Pass the cursor of a previous iterator to resume "
+        "it.".format(key, name)
+    )
+    return iter_results
+
+
+for _name, _key in _paginated_methods.items():
+    setattr(IndexerClient, "iter_" + _name, _iter_method(_name, _key))
+    setattr(
+        AsyncIndexerClient, "iter_" + _name, _async_iter_method(_name, _key)
+    )
+_add_coroutine_methods(AsyncIndexerClient, IndexerClient)
+
+
+_response_formats = ("json", "raw", "stream")
+
+
+def _check_response_format(response_format):
+    if response_format not in _response_formats:
+        raise ValueError(
+            "response_format must be one of {}, not {!r}".format(
+                ", ".join(_response_formats), response_format
+            )
+        )
+
+
+def _parse_response(status, body, response_format="json", sort=False):
+    """
+    Get the result of an indexer request from the status and body of its
+    response.
+
+    Raises:
+        IndexerHTTPError: if the status is not a success
+    """
+    if not 200 <= status < 300:
+        e = body.decode("utf-8")
+        try:
+            e = json.loads(e)["message"]
+        finally:
+            raise error.IndexerHTTPError(e)
+    if response_format == "raw":
+        return body
+    response = json.loads(body.decode("utf-8"))
+    return _recursively_sort_dict(response) if sort else response
+
+
+# size of the chunks of the body read by response streams
+_STREAM_CHUNK_SIZE = 65536
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class _ArrayItemParser:
+    """
+    Incremental parser for a json object, producing the items of its first
+    array member as they are complete; its other members are kept in
+    fields, sorted like json responses if sort is set.
+    """
+
+    def __init__(self, sort=False):
+        self.fields = {}
+        self.array_key = None
+        self._sort = sort
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"
+        self._key = None
+
+    @property
+    def done(self):
+        return self._state == "end"
+
+    def feed(self, data, final=False):
+        """
+        Parse more of the body.
+
+        Args:
+            data (bytes): the next part of the body
+            final (bool): whether it is the end of the body
+
+        Returns:
+            list: items of the array completed by data
+        """
+        self._buf = self._buf[self._pos :] + self._text.decode(data, final)
+        self._pos = 0
+        items = []
+        while self._step(items, final):
+            pass
+        if final and not self.done:
+            raise error.IndexerHTTPError("Incomplete json response")
+        return items
+
+    def _skip(self):
+        self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+        return self._buf[self._pos : self._pos + 1]
+
+    def _value(self, final):
+        """Decode the value at the current position, or None if partial."""
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError as e:
+            if final:
+                raise error.IndexerHTTPError(
+                    "Invalid json response: {}".format(e)
+                )
+            return None
+        # a number running to the end of the buffer may be longer
+        if end == len(self._buf) and not final:
+            if self._buf[self._pos] in "-0123456789":
+                return None
+        self._pos = end
+        return (value,)
+
+    def _step(self, items, final):
+        c = self._skip()
+        if not c:
+            return False
+        state = self._state
+        if state == "start":
+            if c != "{":
+                raise error.IndexerHTTPError("Expected a json object")
+            self._pos += 1
+            self._state = "key"
+        elif state == "key":
+            if c == "}":
+                self._pos += 1
+                self._state = "end"
+                return True
+            key = self._value(final)
+            if key is None:
+                return False
+            self._key = key[0]
+            self._state = "colon"
+        elif state == "colon":
+            if c != ":":
+                raise error.IndexerHTTPError("Expected ':' in json object")
+            self._pos += 1
+            self._state = "value"
+        elif state == "value":
+            if c == "[" and self.array_key is None:
+                self.array_key = self._key
+                self._pos += 1
+                self._state = "first item"
+                return True
+            value = self._value(final)
+            if value is None:
+                return False
+            self.fields[self._key] = self._sorted(value[0])
+            self._state = "after value"
+        elif state == "after value":
+            if c not in ",}":
+                raise error.IndexerHTTPError("Expected ',' in json object")
+            self._pos += 1
+            self._state = "key" if c == "," else "end"
+        elif state in ("first item", "item"):
+            if c == "]" and state == "first item":
+                self._pos += 1
+                self._state = "after value"
+                return True
+            item = self._value(final)
+            if item is None:
+                return False
+            items.append(item[0])
+            self._state = "after item"
+        elif state == "after item":
+            if c not in ",]":
+                raise error.IndexerHTTPError("Expected ',' in json array")
+            self._pos += 1
+            self._state = "item" if c == "," else "after value"
+        else:
+            raise error.IndexerHTTPError("Unexpected data after json object")
+        return True
+
+    def _sorted(self, value):
+        # as with _recursively_sort_dict, dicts in arrays are left as is
+        if self._sort and isinstance(value, dict):
+            return _recursively_sort_dict(value)
+        return value
+
+
+class ResponseStream:
+    """
+    Iterator over the items of the array in a json response, such as the
+    transactions of search_transactions, parsed as the body is read.
+    Returned by IndexerClient methods called with response_format="stream".
+    Close it, or use it as a context manager, if not iterating to the end.
+
+    Args:
+        response (Response): the response
+        sort (bool, optional): whether to sort the keys of the dicts in
+            fields
+
+    Attributes:
+        key (str): key of the array in the response, once known
+        fields (dict): the other members of the response, complete once
+            the iteration is over
+    """
+
+    def __init__(self, response, sort=False):
+        self._response = response
+        self._parser = _ArrayItemParser(sort)
+        self._items = collections.deque()
+
+    @property
+    def key(self):
+        return self._parser.array_key
+
+    @property
+    def fields(self):
+        return self._parser.fields
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while not self._items:
+            if self._parser.done:
+                self.close()
+                raise StopIteration
+            try:
+                data = self._response.read(_STREAM_CHUNK_SIZE)
+                self._items.extend(self._parser.feed(data, not data))
+            except BaseException:
+                self.close()
+                raise
+        return self._items.popleft()
+
+    def close(self):
+        """Close the response."""
+        if self._parser.done:
+            # read to the end so that the connection can be reused
+            self._response.read()
+        self._response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncResponseStream(ResponseStream):
+    """
+    Async iterator over the items of the array in a json response, parsed
+    as the body is read. Returned by AsyncIndexerClient methods called with
+    response_format="stream".
+
+    Args:
+        response (AsyncResponse): the response
+        sort (bool, optional): whether to sort the keys of the dicts in
+            fields
+
+    Attributes:
+        key (str): key of the array in the response, once known
+        fields (dict): the other members of the response, complete once
+            the iteration is over
+    """
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._items:
+            if self._parser.done:
+                await self.aclose()
+                raise StopAsyncIteration
+            try:
+                data = await self._response.read(_STREAM_CHUNK_SIZE)
+                self._items.extend(self._parser.feed(data, not data))
+            except BaseException:
+                self._response.close()
+                raise
+        return self._items.popleft()
+
+    def __iter__(self):
+        raise TypeError("use async for with an AsyncResponseStream")
+
+    def close(self):
+        """Close the response."""
+        self._response.close()
+
+    async def aclose(self):
+        """Close the response, reading it to the end if it was parsed."""
+        if self._parser.done:
+            await self._response.read()
+        self._response.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+def _recursively_sort_dict(dictionary):
+    return {
+        k: _recursively_sort_dict(v) if isinstance(v, dict) else v
+        for k, v in sorted(dictionary.items())
+    }
+
 
 def _specify_round(query, block, round_num):
     """
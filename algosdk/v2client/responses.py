@@ -0,0 +1,250 @@
+"""
+Decoding of msgpack responses from algod into SDK objects.
+
+AlgodClient read endpoints called with response_format="decoded" request
+msgpack and decode it with decode_response: blocks become Block objects and
+pending transactions SignedTransaction, MultisigTransaction or
+LogicSigTransaction objects, without going through json nor base64. Byte
+fields of other responses, such as account_info, are returned as bytes.
+"""
+import re
+from typing import Any, Dict, List, Optional, Union
+
+import msgpack
+
+from algosdk import encoding, transaction
+
+GenericSignedTransaction = Union[
+    "transaction.SignedTransaction",
+    "transaction.MultisigTransaction",
+    "transaction.LogicSigTransaction",
+]
+
+# keys of a signed transaction, other keys of transactions in blocks being
+# their apply data and flags
+_SIGNED_TXN_KEYS = frozenset(("sig", "msig", "lsig", "txn", "sgnr"))
+_BLOCK_FLAGS = frozenset(("hgi", "hgh"))
+
+
+def unpack(data: bytes) -> Any:
+    """
+    Unpack a msgpack response.
+
+    Args:
+        data (bytes): msgpack encoded response
+
+    Returns:
+        the unpacked response, with bytes for binary fields
+    """
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def decode_signed_transaction(
+    stxn: Dict[str, Any]
+) -> GenericSignedTransaction:
+    """
+    Decode an unpacked signed transaction.
+
+    Args:
+        stxn (dict): unpacked signed transaction; keys other than those of
+            a signed transaction are ignored
+
+    Returns:
+        SignedTransaction, MultisigTransaction, or LogicSigTransaction
+    """
+    if not stxn.keys() <= _SIGNED_TXN_KEYS:
+        stxn = {k: v for k, v in stxn.items() if k in _SIGNED_TXN_KEYS}
+    return encoding.msgpack_decode(stxn)
+
+
+class BlockTransaction:
+    """
+    Transaction of a block, with the genesis fields removed when it was
+    stored in the block put back. It is decoded on first use.
+
+    Args:
+        stxn (dict): unpacked signed transaction, with genesis fields
+        apply_data (dict): unpacked apply data of the transaction
+        confirmed_round (int, optional): round of the block
+
+    Attributes:
+        stxn (dict)
+        apply_data (dict): effects of the transaction, as encoded in the
+            block, e.g. "ca" for its closing amount or "dt" for the state
+            changes and inner transactions of an application call
+        confirmed_round (int)
+    """
+
+    def __init__(
+        self,
+        stxn: Dict[str, Any],
+        apply_data: Dict[str, Any],
+        confirmed_round: int = 0,
+    ):
+        self.stxn = stxn
+        self.apply_data = apply_data
+        self.confirmed_round = confirmed_round
+        self._signed_transaction: Optional[GenericSignedTransaction] = None
+        self._txid: Optional[str] = None
+
+    @property
+    def signed_transaction(self) -> GenericSignedTransaction:
+        """SignedTransaction, MultisigTransaction, or LogicSigTransaction"""
+        if self._signed_transaction is None:
+            self._signed_transaction = decode_signed_transaction(self.stxn)
+        return self._signed_transaction
+
+    @property
+    def txid(self) -> str:
+        """Transaction ID"""
+        if self._txid is None:
+            self._txid = transaction.TransactionView(
+                self.stxn["txn"]
+            ).get_txid()
+        return self._txid
+
+
+class Block:
+    """
+    Block decoded from msgpack.
+
+    Args:
+        block (dict): unpacked block
+        certificate (dict, optional): unpacked certificate of the block
+
+    Attributes:
+        header (dict): fields of the block other than its transactions, as
+            encoded, e.g. "rnd", "ts", "gen", "gh", "prev" or "proto"
+        transactions (list[BlockTransaction]): transactions of the block
+        certificate (dict): certificate of the block, if requested
+    """
+
+    def __init__(
+        self,
+        block: Dict[str, Any],
+        certificate: Optional[Dict[str, Any]] = None,
+    ):
+        self.header = {k: v for k, v in block.items() if k != "txns"}
+        self.certificate = certificate
+        genesis_id = block.get("gen")
+        genesis_hash = block.get("gh")
+        confirmed_round = block.get("rnd", 0)
+        self.transactions: List[BlockTransaction] = []
+        for stib in block.get("txns") or ():
+            stxn = {k: v for k, v in stib.items() if k in _SIGNED_TXN_KEYS}
+            apply_data = {
+                k: v
+                for k, v in stib.items()
+                if k not in _SIGNED_TXN_KEYS and k not in _BLOCK_FLAGS
+            }
+            txn = dict(stxn["txn"])
+            if stib.get("hgi") and genesis_id:
+                txn["gen"] = genesis_id
+            if genesis_hash and "gh" not in txn:
+                txn["gh"] = genesis_hash
+            stxn["txn"] = txn
+            self.transactions.append(
+                BlockTransaction(stxn, apply_data, confirmed_round)
+            )
+
+    @property
+    def round(self) -> int:
+        """Round of the block"""
+        return self.header.get("rnd", 0)
+
+    @property
+    def timestamp(self) -> int:
+        """Time of the block, in seconds since the epoch"""
+        return self.header.get("ts", 0)
+
+    @property
+    def genesis_id(self) -> str:
+        return self.header.get("gen", "")
+
+    @property
+    def genesis_hash(self) -> bytes:
+        return self.header.get("gh", b"")
+
+    def __len__(self) -> int:
+        return len(self.transactions)
+
+    def __iter__(self):
+        return iter(self.transactions)
+
+
+def decode_block(data: bytes) -> Block:
+    """
+    Decode the response of block_info.
+
+    Args:
+        data (bytes): msgpack encoded response
+
+    Returns:
+        Block: the block
+    """
+    response = unpack(data)
+    return Block(response["block"], response.get("cert"))
+
+
+def decode_pending_transaction(data: bytes) -> Dict[str, Any]:
+    """
+    Decode the response of pending_transaction_info.
+
+    Args:
+        data (bytes): msgpack encoded response
+
+    Returns:
+        dict: the response, with the signed transaction decoded as "txn"
+    """
+    response = unpack(data)
+    response["txn"] = decode_signed_transaction(response["txn"])
+    return response
+
+
+def decode_pending_transactions(data: bytes) -> Dict[str, Any]:
+    """
+    Decode the response of pending_transactions or
+    pending_transactions_by_address.
+
+    Args:
+        data (bytes): msgpack encoded response
+
+    Returns:
+        dict: the response, with the signed transactions decoded as
+        "top-transactions"
+    """
+    response = unpack(data)
+    response["top-transactions"] = [
+        decode_signed_transaction(stxn)
+        for stxn in response.get("top-transactions") or ()
+    ]
+    return response
+
+
+_decoders = (
+    (re.compile(r"/blocks/\d+$"), decode_block),
+    (re.compile(r"/transactions/pending/[^/]+$"), decode_pending_transaction),
+    (
+        re.compile(r"(/accounts/[^/]+)?/transactions/pending$"),
+        decode_pending_transactions,
+    ),
+)
+
+
+def decode_response(path: str, data: bytes) -> Any:
+    """
+    Decode a msgpack response from algod.
+
+    Args:
+        path (str): path of the request, without its version prefix, e.g.
+            "/blocks/1000"
+        data (bytes): msgpack encoded response
+
+    Returns:
+        Block for blocks, a dict with SignedTransaction objects for pending
+        transactions, or else the unpacked response
+    """
+    for pattern, decode in _decoders:
+        if pattern.match(path):
+            return decode(data)
+    return unpack(data)
@@ -0,0 +1,340 @@
+"""
+Submission of many transaction groups to algod at once.
+
+A SubmissionPipeline sends groups of signed transactions from an iterable,
+with up to window of them in flight at a time, and yields the outcome of
+each as it is known:
+
+    pipeline = SubmissionPipeline(algod_client, window=32)
+    for result in pipeline.submit(groups):
+        if result.status != "accepted":
+            print(result.index, result.status, result.error)
+    print(pipeline.stats())
+
+Groups are taken from the iterable only as there is room for them, so that
+a generator producing them is held back while the node keeps up slowly.
+Clients using a transport.PooledTransport send them over kept-alive
+connections.
+
+Each failed submission is classified with classify_error, to be retried,
+retried after the whole pipeline backs off, or given up.
+"""
+import random
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Set
+
+from algosdk import encoding, error, transaction
+from algosdk.v2client import algod
+
+# upper bounds, in seconds, of the buckets of latency histograms
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    float("inf"),
+)
+
+_TXN_DEAD = re.compile(r"txn dead: round (\d+) outside of (\d+)--(\d+)")
+
+# (pattern of the error message of a rejected submission, classification);
+# the first pattern found applies
+_REJECTIONS = (
+    (re.compile(r"already in ledger"), "committed"),
+    (re.compile(r"transaction pool have reached capacity"), "backoff"),
+    (re.compile(r"pool is full"), "backoff"),
+    (re.compile(r"below threshold"), "backoff"),
+)
+
+_OUTCOMES = ("accepted", "committed", "rejected", "expired", "failed")
+
+
+def classify_error(e: BaseException) -> str:
+    """
+    Classify the error raised by a submission.
+
+    Args:
+        e (Exception): error raised by send_encoded_transactions
+
+    Returns:
+        str: "retry" for a transient error, a connection error or a 429 or
+        5xx status; "backoff" if the node is congested, its transaction
+        pool being full or its fee threshold above the fee paid, or if the
+        transactions are not valid yet; "committed" if the transactions
+        are already in the ledger; "expired" if they are no longer valid;
+        "rejected" if they are invalid
+    """
+    if not isinstance(e, error.AlgodHTTPError):
+        return "retry" if isinstance(e, OSError) else "rejected"
+    message = str(e)
+    dead = _TXN_DEAD.search(message)
+    if dead is not None:
+        current, first = int(dead.group(1)), int(dead.group(2))
+        return "backoff" if current < first else "expired"
+    for pattern, classification in _REJECTIONS:
+        if pattern.search(message):
+            return classification
+    if e.code in algod._RETRY_STATUSES:
+        return "retry"
+    return "rejected"
+
+
+class SubmissionResult:
+    """
+    Outcome of the submission of a group.
+
+    Attributes:
+        index (int): position of the group in the submitted iterable
+        txid (str): ID of the first transaction of the group
+        status (str): "accepted" by the node, already "committed",
+            "rejected" as invalid, "expired" before it could be accepted,
+            or "failed" as retries ran out
+        attempts (int): number of requests sent
+        latency (float): seconds from the first request to the outcome
+        error (Exception): last error, None if accepted
+    """
+
+    def __init__(
+        self,
+        index: int,
+        txid: str,
+        status: str,
+        attempts: int,
+        latency: float,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        self.index = index
+        self.txid = txid
+        self.status = status
+        self.attempts = attempts
+        self.latency = latency
+        self.error = error
+
+    def __repr__(self) -> str:
+        return "SubmissionResult(index={}, txid={}, status={})".format(
+            self.index, self.txid, self.status
+        )
+
+
+class _Histogram:
+    def __init__(self) -> None:
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "buckets": list(zip(LATENCY_BUCKETS, self.counts)),
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+        }
+
+
+class SubmissionPipeline:
+    """
+    Sender of transaction groups with a window of concurrent submissions.
+    See the module documentation.
+
+    A group whose submission is classified "retry" is sent again after an
+    exponential backoff with full jitter: a random delay of up to
+    backoff * 2 ** (attempt - 1) seconds, capped at max_backoff. A group
+    classified "backoff" is too, and the pipeline also holds back all its
+    submissions for pressure_backoff * 2 ** (attempt - 1) seconds, capped
+    at max_backoff. A group is retried at most retries times.
+
+    Args:
+        client (AlgodClient): client the groups are sent with
+        window (int, optional): maximum number of groups in flight
+        retries (int, optional): maximum number of retries of a group
+        backoff (float, optional): base delay before a retry
+        pressure_backoff (float, optional): base delay of all submissions
+            when the node is congested
+        max_backoff (float, optional): maximum delay before a retry
+
+    Attributes:
+        client (AlgodClient)
+        window (int)
+        retries (int)
+        backoff (float)
+        pressure_backoff (float)
+        max_backoff (float)
+    """
+
+    def __init__(
+        self,
+        client: algod.AlgodClient,
+        window: int = 16,
+        retries: int = 5,
+        backoff: float = 0.05,
+        pressure_backoff: float = 0.5,
+        max_backoff: float = 5.0,
+    ) -> None:
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.client = client
+        self.window = window
+        self.retries = retries
+        self.backoff = backoff
+        self.pressure_backoff = pressure_backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self._outcomes = dict.fromkeys(_OUTCOMES, 0)
+        self._retried = 0
+        self._latency = _Histogram()
+        self._request_latency = _Histogram()
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    def submit(
+        self,
+        groups: Iterable[Sequence["transaction.GenericSignedTransaction"]],
+    ) -> Iterator[SubmissionResult]:
+        """
+        Send groups of signed transactions.
+
+        Args:
+            groups (Iterable[list[SignedTransaction, MultisigTransaction,
+                or LogicSigTransaction]]): groups to send, each in a single
+                request; groups are taken from the iterable as there is
+                room for them in the window
+
+        Returns:
+            Iterator[SubmissionResult]: outcome of each group, as they are
+            known
+        """
+        executor = ThreadPoolExecutor(self.window)
+        in_flight: Set = set()
+        groups_iter = enumerate(groups)
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(in_flight) < self.window:
+                    try:
+                        index, group = next(groups_iter)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    in_flight.add(executor.submit(self._send, index, group))
+                if not in_flight:
+                    return
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get statistics of the submissions so far.
+
+        Returns:
+            dict: number of groups of each status ("accepted", "committed",
+            "rejected", "expired" and "failed"), number of "retries",
+            "groups_per_second" from the first submission to the last
+            outcome, and histograms of the "latency" of groups and of the
+            "request_latency" of each request; a histogram has its
+            "buckets", as pairs of an upper bound in seconds and of a
+            count, and the "count", "mean" and "max" of the latencies
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._outcomes)
+            stats["retries"] = self._retried
+            groups = sum(self._outcomes.values())
+            elapsed = (
+                (self._finished or 0.0) - self._started
+                if self._started is not None
+                else 0.0
+            )
+            stats["groups_per_second"] = (
+                groups / elapsed if elapsed > 0 else 0.0
+            )
+            stats["latency"] = self._latency.snapshot()
+            stats["request_latency"] = self._request_latency.snapshot()
+        return stats
+
+    def _send(
+        self,
+        index: int,
+        group: Sequence["transaction.GenericSignedTransaction"],
+    ) -> SubmissionResult:
+        txid = group[0].get_txid()
+        data = b"".join(encoding.msgpack_encode_bytes(txn) for txn in group)
+        start = time.monotonic()
+        with self._lock:
+            if self._started is None:
+                self._started = start
+        attempts = 0
+        while True:
+            self._wait_pause()
+            attempts += 1
+            sent = time.monotonic()
+            try:
+                self.client.send_encoded_transactions(data)
+                status, e = "accepted", None
+            except Exception as exc:
+                status, e = classify_error(exc), exc
+            with self._lock:
+                self._request_latency.add(time.monotonic() - sent)
+            if status in ("retry", "backoff"):
+                if attempts <= self.retries:
+                    self._retry(status, attempts)
+                    continue
+                status = "failed"
+            end = time.monotonic()
+            with self._lock:
+                self._outcomes[status] += 1
+                self._latency.add(end - start)
+                self._finished = end
+            return SubmissionResult(
+                index, txid, status, attempts, end - start, e
+            )
+
+    def _retry(self, status: str, attempts: int) -> None:
+        """Wait before the next attempt of a group."""
+        if status == "backoff":
+            pause = min(
+                self.max_backoff,
+                self.pressure_backoff * 2 ** (attempts - 1),
+            )
+            with self._lock:
+                self._paused_until = max(
+                    self._paused_until, time.monotonic() + pause
+                )
+        with self._lock:
+            self._retried += 1
+        time.sleep(
+            random.uniform(
+                0, min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+            )
+        )
+
+    def _wait_pause(self) -> None:
+        while True:
+            delay = self._paused_until - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
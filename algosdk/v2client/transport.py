@@ -0,0 +1,826 @@
+"""
+HTTP transports used by the algod, indexer and kmd clients.
+
+A transport sends one request and returns a Response. By default clients use
+UrllibTransport, which opens a new connection per request through urllib.
+PooledTransport instead keeps connections to each host alive between
+requests; one instance can be shared by several clients:
+
+    transport = PooledTransport(pool_size=4)
+    algod_client = algod.AlgodClient(token, address, transport=transport)
+    indexer_client = indexer.IndexerClient(token, address, transport=transport)
+
+The asyncio clients use an AsyncTransport, by default an
+AsyncPooledTransport.
+
+CoalescingTransport and AsyncCoalescingTransport wrap another transport to
+send concurrent identical GET requests only once, which helps when many
+threads or tasks ask for the same status or account at the same time.
+"""
+import asyncio
+import collections
+import http.client
+import io
+import socket
+import ssl
+import threading
+import time
+import urllib.error
+from abc import ABC, abstractmethod
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Mapping,
+    Optional,
+    Tuple,
+    cast,
+)
+from urllib import parse
+from urllib.request import Request, urlopen
+
+
+class Response:
+    """
+    Response to a request sent through a transport. Read the body with read,
+    or use it as a context manager to make sure it is closed.
+
+    Args:
+        status (int): HTTP status code
+        headers (Mapping[str, str]): response headers
+        fp (file): body of the response
+        release (Callable[[bool], None], optional): called once when the
+            response is closed, with True if the body was read to the end
+
+    Attributes:
+        status (int)
+        headers (Mapping[str, str])
+    """
+
+    def __init__(
+        self,
+        status: int,
+        headers: Mapping[str, str],
+        fp,
+        release: Optional[Callable[[bool], None]] = None,
+    ) -> None:
+        self.status = status
+        self.headers = headers
+        self._fp = fp
+        self._release = release
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        """
+        Read the body, or up to amt bytes of it.
+
+        Returns:
+            bytes: what was read, empty at the end of the body
+        """
+        if self._fp is None:
+            return b""
+        data = self._fp.read() if amt is None else self._fp.read(amt)
+        if amt is None or (amt and not data):
+            self._finish(True)
+        return data
+
+    def close(self) -> None:
+        """Close the response, discarding what is left of the body."""
+        if self._fp is not None:
+            self._finish(False)
+
+    def _finish(self, complete: bool) -> None:
+        fp, self._fp = self._fp, None
+        if self._release is not None:
+            self._release(complete)
+        else:
+            fp.close()
+
+    def __enter__(self) -> "Response":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Transport(ABC):
+    """Sends HTTP requests for the clients."""
+
+    @abstractmethod
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[bytes] = None,
+    ) -> Response:
+        """
+        Send a request and wait for the response headers.
+
+        Error statuses are returned as responses rather than raised.
+
+        Args:
+            method (str): request method
+            url (str): absolute url of the request
+            headers (dict, optional): request headers
+            data (bytes, optional): body of the request
+
+        Returns:
+            Response: the response, whose body is yet to be read
+
+        Raises:
+            urllib.error.URLError: if the request could not be sent or no
+                response was received
+        """
+
+    def close(self) -> None:
+        """Release the resources held by the transport."""
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class UrllibTransport(Transport):
+    """
+    Transport sending each request with urllib.request.urlopen, on a new
+    connection. Proxy settings from the environment and redirects are
+    handled by urllib.
+
+    Args:
+        timeout (float, optional): socket timeout in seconds
+    """
+
+    def __init__(self, timeout: Optional[float] = None) -> None:
+        self.timeout = timeout
+
+    def request(self, method, url, headers=None, data=None):
+        req = Request(url, headers=headers or {}, method=method, data=data)
+        try:
+            if self.timeout is None:
+                resp = urlopen(req)
+            else:
+                resp = urlopen(req, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            return Response(e.code, e.headers, e)
+        return Response(resp.status, resp.headers, resp)
+
+
+_default_transport = UrllibTransport()
+
+
+def default_transport() -> Transport:
+    """Get the transport used by clients created without one."""
+    return _default_transport
+
+
+# Errors of a kept-alive connection closed by the server while idle, which
+# are worth one retry on a new connection.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+# Methods of requests that can be sent again safely if the server may have
+# received them already, e.g. unlike a POST sending a transaction.
+_IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "DELETE"))
+
+
+class PooledTransport(Transport):
+    """
+    Transport keeping connections to each host alive between requests.
+
+    Idle connections are pooled per scheme, host and port. A request reuses
+    the most recently used idle connection, or opens a new one if there is
+    none, so the number of concurrent requests is not limited; at most
+    pool_size connections per host are kept once they are done with.
+    Connections left idle for longer than idle_timeout are closed rather
+    than reused. If a reused connection turns out to have been closed by
+    the server, a GET, HEAD or DELETE request is sent again once on a new
+    connection; other requests, which the server may have received before
+    closing the connection, fail with URLError.
+
+    The transport is thread safe. Unlike UrllibTransport it does not follow
+    redirects nor use proxies.
+
+    Args:
+        pool_size (int, optional): maximum number of idle connections kept
+            per host
+        idle_timeout (float, optional): seconds after which an idle
+            connection is no longer reused
+        timeout (float, optional): socket timeout in seconds
+        ssl_context (ssl.SSLContext, optional): context for https
+            connections; defaults to ssl.create_default_context()
+
+    Attributes:
+        pool_size (int)
+        idle_timeout (float)
+        timeout (float)
+        stats (dict): number of connections "opened" and of requests sent
+            on a "reused" connection
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        idle_timeout: float = 30.0,
+        timeout: Optional[float] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ) -> None:
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.stats = {"opened": 0, "reused": 0}
+        self._ssl_context = ssl_context
+        self._pools: Dict[
+            Tuple[str, str, Optional[int]], collections.deque
+        ] = collections.defaultdict(collections.deque)
+        self._lock = threading.Lock()
+
+    def request(self, method, url, headers=None, data=None):
+        parts = parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname or "", parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        while True:
+            conn, reused = self._get(key)
+            try:
+                conn.request(method, path, body=data, headers=headers or {})
+                resp = conn.getresponse()
+            except _STALE_CONNECTION_ERRORS as e:
+                conn.close()
+                if reused and method in _IDEMPOTENT_METHODS:
+                    continue
+                raise urllib.error.URLError(e)
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise urllib.error.URLError(e)
+            break
+
+        def release(complete: bool) -> None:
+            if complete and not resp.will_close:
+                self._put(key, conn)
+            else:
+                resp.close()
+                conn.close()
+
+        return Response(resp.status, resp.headers, resp, release)
+
+    def _get(self, key) -> Tuple[http.client.HTTPConnection, bool]:
+        now = time.monotonic()
+        stale = []
+        conn = None
+        with self._lock:
+            pool = self._pools[key]
+            while pool:
+                candidate, last_used = pool.pop()
+                if now - last_used < self.idle_timeout:
+                    conn = candidate
+                    break
+                stale.append(candidate)
+            if conn is None:
+                self.stats["opened"] += 1
+            else:
+                self.stats["reused"] += 1
+        for candidate in stale:
+            candidate.close()
+        if conn is not None:
+            return conn, True
+        return self._connect(key), False
+
+    def _put(self, key, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            pool = self._pools[key]
+            if len(pool) < self.pool_size:
+                pool.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def _connect(self, key) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        timeout = self.timeout
+        if timeout is None:
+            timeout = socket.getdefaulttimeout()
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            return http.client.HTTPSConnection(
+                host, port, timeout=timeout, context=self._ssl_context
+            )
+        if scheme != "http":
+            raise urllib.error.URLError("unknown url type: " + scheme)
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            for conn, _ in pool:
+                conn.close()
+
+
+class AsyncResponse:
+    """
+    Response to a request sent through an AsyncTransport. Read the body with
+    read, and close the response if the body is not read to the end.
+
+    Args:
+        status (int): HTTP status code
+        headers (Mapping[str, str]): response headers
+        read (Callable[[int], Awaitable[bytes]]): reads up to the given
+            number of bytes of the body, or all of it if given -1; returns
+            an empty string at the end of the body
+        release (Callable[[bool], None], optional): called once when the
+            response is closed, with True if the body was read to the end
+
+    Attributes:
+        status (int)
+        headers (Mapping[str, str])
+    """
+
+    def __init__(
+        self,
+        status: int,
+        headers: Mapping[str, str],
+        read: Callable[[int], Awaitable[bytes]],
+        release: Optional[Callable[[bool], None]] = None,
+    ) -> None:
+        self.status = status
+        self.headers = headers
+        self._read = read
+        self._release = release
+        self._done = False
+
+    async def read(self, amt: Optional[int] = None) -> bytes:
+        """
+        Read the body, or up to amt bytes of it.
+
+        Returns:
+            bytes: what was read, empty at the end of the body
+        """
+        if self._done:
+            return b""
+        try:
+            if amt is None:
+                chunks = []
+                while True:
+                    chunk = await self._read(-1)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                data = b"".join(chunks)
+            else:
+                data = await self._read(amt)
+        except BaseException:
+            self.close()
+            raise
+        if amt is None or (amt and not data):
+            self._finish(True)
+        return data
+
+    def close(self) -> None:
+        """Close the response, discarding what is left of the body."""
+        if not self._done:
+            self._finish(False)
+
+    def _finish(self, complete: bool) -> None:
+        self._done = True
+        if self._release is not None:
+            self._release(complete)
+
+    async def __aenter__(self) -> "AsyncResponse":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+
+class AsyncTransport(ABC):
+    """Sends HTTP requests for the asyncio clients."""
+
+    @abstractmethod
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[bytes] = None,
+    ) -> AsyncResponse:
+        """
+        Send a request and wait for the response headers.
+
+        Error statuses are returned as responses rather than raised.
+
+        Args:
+            method (str): request method
+            url (str): absolute url of the request
+            headers (dict, optional): request headers
+            data (bytes, optional): body of the request
+
+        Returns:
+            AsyncResponse: the response, whose body is yet to be read
+
+        Raises:
+            urllib.error.URLError: if the request could not be sent or no
+                response was received
+        """
+
+    async def close(self) -> None:
+        """Release the resources held by the transport."""
+
+    async def __aenter__(self) -> "AsyncTransport":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+
+_Stream = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class AsyncPooledTransport(AsyncTransport):
+    """
+    Transport keeping connections to each host alive between requests, using
+    asyncio streams so that requests never block the event loop.
+
+    Connections are pooled as with PooledTransport: per scheme, host and
+    port, at most pool_size idle connections per host, idle connections are
+    dropped after idle_timeout, and a GET, HEAD or DELETE request failing on
+    a reused connection closed by the server is sent again once on a new
+    connection. A transport must only be used from the event loop it was
+    first used in.
+
+    Args:
+        pool_size (int, optional): maximum number of idle connections kept
+            per host
+        idle_timeout (float, optional): seconds after which an idle
+            connection is no longer reused
+        timeout (float, optional): seconds to wait for a connection and for
+            the response headers
+        ssl_context (ssl.SSLContext, optional): context for https
+            connections; defaults to ssl.create_default_context()
+
+    Attributes:
+        pool_size (int)
+        idle_timeout (float)
+        timeout (float)
+        stats (dict): number of connections "opened" and of requests sent
+            on a "reused" connection
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        idle_timeout: float = 30.0,
+        timeout: Optional[float] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ) -> None:
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.stats = {"opened": 0, "reused": 0}
+        self._ssl_context = ssl_context
+        self._pools: Dict[
+            Tuple[str, str, Optional[int]], collections.deque
+        ] = collections.defaultdict(collections.deque)
+
+    async def request(self, method, url, headers=None, data=None):
+        parts = parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname or "", parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        head = {"Host": parts.netloc, "Accept-Encoding": "identity"}
+        head.update(headers or {})
+        if data is not None or method in ("POST", "PUT", "PATCH"):
+            head["Content-Length"] = str(len(data or b""))
+        message = "{} {} HTTP/1.1\r\n".format(method, path)
+        message += "".join("{}: {}\r\n".format(k, v) for k, v in head.items())
+        message = message.encode("latin-1") + b"\r\n" + bytes(data or b"")
+        while True:
+            stream, reused = await self._get(key)
+            try:
+                status, resp_headers = await asyncio.wait_for(
+                    self._exchange(stream, message), self.timeout
+                )
+            except _STALE_CONNECTION_ERRORS as e:
+                stream[1].close()
+                if reused and method in _IDEMPOTENT_METHODS:
+                    continue
+                raise urllib.error.URLError(e)
+            except (
+                OSError,
+                asyncio.TimeoutError,
+                http.client.HTTPException,
+                ValueError,
+            ) as e:
+                stream[1].close()
+                raise urllib.error.URLError(e)
+            except BaseException:
+                stream[1].close()
+                raise
+            break
+
+        read, will_close = _body_reader(
+            stream[0], method, status, resp_headers
+        )
+
+        def release(complete: bool) -> None:
+            if complete and not will_close:
+                self._put(key, stream)
+            else:
+                stream[1].close()
+
+        return AsyncResponse(status, resp_headers, read, release)
+
+    @staticmethod
+    async def _exchange(stream: _Stream, message: bytes):
+        reader, writer = stream
+        writer.write(message)
+        await writer.drain()
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise http.client.RemoteDisconnected(
+                    "Remote end closed connection without response"
+                )
+            status_line = line.decode("latin-1")
+            version, code, _ = (status_line + "  ").split(" ", 2)
+            if not version.startswith("HTTP/"):
+                raise http.client.BadStatusLine(status_line)
+            lines = []
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                lines.append(line)
+            status = int(code)
+            if status != 100:
+                break
+        headers = http.client.parse_headers(io.BytesIO(b"".join(lines)))
+        if version == "HTTP/1.0" and "keep-alive" not in (
+            headers.get("Connection", "").lower()
+        ):
+            del headers["Connection"]
+            headers["Connection"] = "close"
+        return status, headers
+
+    async def _get(self, key) -> Tuple[_Stream, bool]:
+        now = time.monotonic()
+        pool = self._pools[key]
+        while pool:
+            stream, last_used = pool.pop()
+            if now - last_used < self.idle_timeout and not (
+                stream[0].at_eof() or stream[1].is_closing()
+            ):
+                self.stats["reused"] += 1
+                return stream, True
+            stream[1].close()
+        self.stats["opened"] += 1
+        scheme, host, port = key
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            ssl_context = self._ssl_context
+        elif scheme == "http":
+            ssl_context = None
+        else:
+            raise urllib.error.URLError("unknown url type: " + scheme)
+        if port is None:
+            port = 443 if ssl_context else 80
+        try:
+            stream = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=ssl_context),
+                self.timeout,
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            raise urllib.error.URLError(e)
+        return stream, False
+
+    def _put(self, key, stream: _Stream) -> None:
+        pool = self._pools[key]
+        if len(pool) < self.pool_size:
+            pool.append((stream, time.monotonic()))
+        else:
+            stream[1].close()
+
+    async def close(self) -> None:
+        """Close all idle connections."""
+        pools = list(self._pools.values())
+        self._pools.clear()
+        for pool in pools:
+            for (_, writer), _ in pool:
+                writer.close()
+
+
+class _Call:
+    """Request in flight, whose result is shared by identical requests."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[Tuple[int, Mapping[str, str], bytes]] = None
+        self.error: Optional[BaseException] = None
+
+
+def _coalescing_key(
+    url: str, headers: Optional[Dict[str, str]]
+) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    return url, tuple(sorted((headers or {}).items()))
+
+
+class CoalescingTransport(Transport):
+    """
+    Transport sending concurrent identical GET requests, with the same url
+    and headers, only once through another transport: requests made while
+    an identical one is in flight wait for its response, and each gets a
+    copy of it. A connection error is raised by all of them.
+
+    Bodies of responses to GET requests are read in full before being
+    returned. Other requests are sent as they are.
+
+    Args:
+        transport (Transport, optional): transport sending requests;
+            defaults to the default transport
+
+    Attributes:
+        transport (Transport)
+        stats (dict): number of GET "requests" sent, and of requests
+            "coalesced" with one in flight rather than sent
+    """
+
+    def __init__(self, transport: Optional[Transport] = None) -> None:
+        self.transport = transport or default_transport()
+        self.stats = {"requests": 0, "coalesced": 0}
+        self._calls: Dict[Tuple, _Call] = {}
+        self._lock = threading.Lock()
+
+    def request(self, method, url, headers=None, data=None):
+        if method != "GET":
+            return self.transport.request(
+                method, url, headers=headers, data=data
+            )
+        key = _coalescing_key(url, headers)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.stats["requests"] += 1
+            else:
+                self.stats["coalesced"] += 1
+        if leader:
+            try:
+                with self.transport.request(
+                    method, url, headers=headers, data=data
+                ) as resp:
+                    call.result = (resp.status, resp.headers, resp.read())
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+        status, resp_headers, body = cast(tuple, call.result)
+        return Response(status, resp_headers, io.BytesIO(body))
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncCoalescingTransport(AsyncTransport):
+    """
+    AsyncTransport sending concurrent identical GET requests only once
+    through another AsyncTransport, as CoalescingTransport does. The
+    request is sent in a task of its own, so that cancelling the request it
+    was started for does not cancel the others.
+
+    Args:
+        transport (AsyncTransport, optional): defaults to a new
+            AsyncPooledTransport
+
+    Attributes:
+        transport (AsyncTransport)
+        stats (dict): number of GET "requests" sent, and of requests
+            "coalesced" with one in flight rather than sent
+    """
+
+    def __init__(self, transport: Optional[AsyncTransport] = None) -> None:
+        self.transport = transport or AsyncPooledTransport()
+        self.stats = {"requests": 0, "coalesced": 0}
+        self._calls: Dict[Tuple, asyncio.Future] = {}
+
+    async def request(self, method, url, headers=None, data=None):
+        if method != "GET":
+            return await self.transport.request(
+                method, url, headers=headers, data=data
+            )
+        key = _coalescing_key(url, headers)
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = asyncio.ensure_future(
+                self._send(key, method, url, headers)
+            )
+            self.stats["requests"] += 1
+        else:
+            self.stats["coalesced"] += 1
+        status, resp_headers, body = await asyncio.shield(call)
+        return _buffered_async_response(status, resp_headers, body)
+
+    async def _send(
+        self, key: Tuple, method: str, url: str, headers
+    ) -> Tuple[int, Mapping[str, str], bytes]:
+        try:
+            async with await self.transport.request(
+                method, url, headers=headers
+            ) as resp:
+                return resp.status, resp.headers, await resp.read()
+        finally:
+            del self._calls[key]
+
+    async def close(self) -> None:
+        await self.transport.close()
+
+
+def _buffered_async_response(
+    status: int, headers: Mapping[str, str], body: bytes
+) -> AsyncResponse:
+    """Get an AsyncResponse whose body is already read."""
+    fp = io.BytesIO(body)
+
+    async def read(amt: int) -> bytes:
+        return fp.read(amt)
+
+    return AsyncResponse(status, headers, read)
+
+
+def _body_reader(
+    reader: asyncio.StreamReader,
+    method: str,
+    status: int,
+    headers: Mapping[str, str],
+) -> Tuple[Callable[[int], Awaitable[bytes]], bool]:
+    """
+    Get a function reading the body of a response from the stream, framed as
+    described by its headers, and whether the connection is closed after it.
+    """
+    will_close = "close" in headers.get("Connection", "").lower()
+
+    if method == "HEAD" or status in (204, 304):
+        remaining = 0
+    elif "chunked" in headers.get("Transfer-Encoding", "").lower():
+        chunk_left = 0
+        finished = False
+
+        async def read_chunked(amt: int) -> bytes:
+            nonlocal chunk_left, finished
+            if finished:
+                return b""
+            if not chunk_left:
+                line = await reader.readline()
+                chunk_left = int(line.split(b";", 1)[0], 16)
+                if not chunk_left:
+                    while (await reader.readline()) not in (b"\r\n", b""):
+                        pass
+                    finished = True
+                    return b""
+            n = chunk_left if amt < 0 else min(amt, chunk_left)
+            data = await reader.readexactly(n)
+            chunk_left -= n
+            if not chunk_left:
+                await reader.readexactly(2)
+            return data
+
+        return read_chunked, will_close
+    elif "Content-Length" in headers:
+        remaining = int(headers["Content-Length"])
+    else:
+
+        async def read_to_eof(amt: int) -> bytes:
+            return await reader.read(amt)
+
+        return read_to_eof, True
+
+    async def read_length(amt: int) -> bytes:
+        nonlocal remaining
+        if not remaining:
+            return b""
+        n = remaining if amt < 0 else min(amt, remaining)
+        data = await reader.read(n)
+        if not data:
+            raise asyncio.IncompleteReadError(b"", remaining)
+        remaining -= len(data)
+        return data
+
+    return read_length, will_close
@@ -0,0 +1,623 @@
+"""
+Micro-benchmarks for SDK hot paths.
+
+Run from the repository root, e.g.:
+
+    python -m scripts.benchmark fee-estimation --count 50000
+"""
+import argparse
+import base64
+import time
+
+from nacl.signing import VerifyKey
+
+from algosdk import account, constants, encoding, transaction
+
+GENESIS_HASH = "JgsgCaCTqIaLeVhyL6XlRu3n7Rfk2FxMeK+wRSaQ7dI="
+
+
+def report(name: str, count: int, elapsed: float) -> None:
+    print(
+        "{:<40} {:>10} ops {:>9.3f}s {:>12.0f} ops/s".format(
+            name, count, elapsed, count / elapsed
+        )
+    )
+
+
+def timed(name: str, count: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    report(name, count, elapsed)
+    return elapsed
+
+
+def legacy_estimate_size(txn: transaction.Transaction) -> int:
+    # Size estimation as it was done before it became analytic: sign with a
+    # freshly generated key and measure the encoded signed transaction.
+    sk, _ = account.generate_account()
+    stx = transaction.SignedTransaction(txn, txn.sign(sk).signature)
+    return len(encoding.msgpack_encode_bytes(stx))
+
+
+def bench_fee_estimation(args: argparse.Namespace) -> None:
+    _, sender = account.generate_account()
+    _, receiver = account.generate_account()
+    sp = transaction.SuggestedParams(1, 1, 1000, GENESIS_HASH)
+    flat = transaction.SuggestedParams(1, 1, 1000, GENESIS_HASH, flat_fee=True)
+
+    def build_legacy():
+        for _ in range(args.count):
+            txn = transaction.PaymentTxn(sender, flat, receiver, 1000)
+            txn.fee = max(legacy_estimate_size(txn), 1000)
+
+    def build():
+        for _ in range(args.count):
+            transaction.PaymentTxn(sender, sp, receiver, 1000)
+
+    before = timed(
+        "PaymentTxn, keypair size estimate", args.count, build_legacy
+    )
+    after = timed("PaymentTxn, analytic size estimate", args.count, build)
+    print("speedup: {:.1f}x".format(before / after))
+
+
+def bench_encoding(args: argparse.Namespace) -> None:
+    import msgpack
+
+    sk, sender = account.generate_account()
+    sp = transaction.SuggestedParams(1000, 1, 1000, GENESIS_HASH)
+    txns = [
+        transaction.PaymentTxn(sender, sp, sender, 1000, note=b"benchmark"),
+        transaction.ApplicationNoOpTxn(
+            sender, sp, 1, app_args=[b"a", b"b"], foreign_assets=[1, 2]
+        ),
+    ]
+    txns.append(txns[0].sign(sk))
+
+    for txn in txns:
+        name = type(txn).__name__
+        unsigned = getattr(txn, "transaction", txn)
+
+        def legacy():
+            for _ in range(args.count):
+                msgpack.packb(
+                    encoding._sort_dict(txn.dictify()), use_bin_type=True
+                )
+
+        def compiled():
+            for _ in range(args.count):
+                unsigned._clear_cache()
+                encoding.msgpack_encode_bytes(txn)
+
+        def memoized():
+            for _ in range(args.count):
+                encoding.msgpack_encode_bytes(txn)
+
+        before = timed(name + ", dictify + sort", args.count, legacy)
+        after = timed(name + ", compiled plan", args.count, compiled)
+        print("speedup: {:.1f}x".format(before / after))
+        after = timed(name + ", memoized txn", args.count, memoized)
+        print("speedup: {:.1f}x".format(before / after))
+
+
+def bench_signing(args: argparse.Namespace) -> None:
+    sk, sender = account.generate_account()
+    sp = transaction.SuggestedParams(1000, 1, 1000, GENESIS_HASH)
+    txns = [
+        transaction.PaymentTxn(sender, sp, sender, i)
+        for i in range(args.count)
+    ]
+
+    def clear():
+        for txn in txns:
+            txn._clear_cache()
+
+    clear()
+    before = timed(
+        "Transaction.sign",
+        args.count,
+        lambda: [txn.sign(sk) for txn in txns],
+    )
+    for workers in (None, 2, 4, 8):
+        clear()
+        after = timed(
+            "sign_many, workers={}".format(workers),
+            args.count,
+            lambda: transaction.sign_many(txns, sk, workers=workers),
+        )
+        print("speedup: {:.1f}x".format(before / after))
+    clear()
+    after = timed(
+        "sign_many, 4 processes",
+        args.count,
+        lambda: transaction.sign_many(txns, sk, workers=4, use_processes=True),
+    )
+    print("speedup: {:.1f}x".format(before / after))
+
+
+def bench_verification(args: argparse.Namespace) -> None:
+    keys = [account.generate_account() for _ in range(10)]
+    sp = transaction.SuggestedParams(1000, 1, 1000, GENESIS_HASH)
+    stxns = [
+        transaction.PaymentTxn(keys[i % 10][1], sp, keys[0][1], i).sign(
+            keys[i % 10][0]
+        )
+        for i in range(args.count)
+    ]
+
+    def legacy():
+        # one check at a time, as with Multisig.verify or LogicSig.verify
+        for stxn in stxns:
+            txn = encoding.msgpack_encode_bytes(stxn.transaction)
+            VerifyKey(encoding.decode_address(stxn.transaction.sender)).verify(
+                constants.txid_prefix + txn, base64.b64decode(stxn.signature)
+            )
+
+    def clear():
+        for stxn in stxns:
+            stxn.transaction._clear_cache()
+
+    clear()
+    before = timed("verify one at a time", args.count, legacy)
+    for workers in (None, 4):
+        clear()
+        after = timed(
+            "verify_many, workers={}".format(workers),
+            args.count,
+            lambda: transaction.verify_many(stxns, workers=workers),
+        )
+        print("speedup: {:.1f}x".format(before / after))
+
+
+def bench_addresses(args: argparse.Namespace) -> None:
+    addrs = [account.generate_account()[1] for _ in range(1000)]
+    addrs = (addrs * (args.count // len(addrs) + 1))[: args.count]
+
+    def uncached():
+        for addr in addrs:
+            encoding._encode_address(encoding._decode_address(addr))
+
+    def cached():
+        encoding.encode_addresses(encoding.decode_addresses(addrs))
+
+    encoding.clear_address_cache()
+    before = timed("address round trip, uncached", args.count, uncached)
+    after = timed("address round trip, cached", args.count, cached)
+    print("speedup: {:.1f}x".format(before / after))
+    print(
+        "decode hit rate: {:.1%}".format(
+            encoding.address_cache_info()["decode"]["hit_rate"]
+        )
+    )
+
+
+def bench_decoding(args: argparse.Namespace) -> None:
+    import msgpack
+
+    sk, sender = account.generate_account()
+    sp = transaction.SuggestedParams(1000, 1, 1000, GENESIS_HASH, "bench")
+    stxns = [
+        transaction.PaymentTxn(sender, sp, sender, 1000, note=b"bench"),
+        transaction.ApplicationNoOpTxn(
+            sender, sp, 1, app_args=[b"a", b"b"], foreign_assets=[1, 2]
+        ),
+        transaction.AssetTransferTxn(sender, sp, sender, 10, 5),
+    ]
+    stxns = [txn.sign(sk) for txn in stxns]
+    maps = [
+        msgpack.unpackb(encoding.msgpack_encode_bytes(stx), raw=False)
+        for stx in stxns
+    ] * (args.count // len(stxns))
+
+    def decode():
+        for d in maps:
+            encoding.msgpack_decode(d)
+
+    def decode_as():
+        for d in maps:
+            encoding.decode_as(transaction.SignedTransaction, d)
+
+    def read_fields():
+        for d in maps:
+            txn = encoding.msgpack_decode(d).transaction
+            txn.sender, txn.type, txn.fee
+
+    def read_fields_lazily():
+        for d in maps:
+            view = transaction.TransactionView(d["txn"])
+            view.sender, view.type, view.fee
+
+    timed("msgpack_decode, signed txns", len(maps), decode)
+    timed("decode_as, signed txns", len(maps), decode_as)
+    before = timed("3 fields, full decode", len(maps), read_fields)
+    after = timed("3 fields, TransactionView", len(maps), read_fields_lazily)
+    print("speedup: {:.1f}x".format(before / after))
+
+
+def bench_files(args: argparse.Namespace) -> None:
+    import os
+    import tempfile
+
+    sk, sender = account.generate_account()
+    sp = transaction.SuggestedParams(1000, 1, 1000, GENESIS_HASH)
+    stxns = transaction.sign_many(
+        [
+            transaction.PaymentTxn(sender, sp, sender, i)
+            for i in range(args.count)
+        ],
+        sk,
+    )
+    path = os.path.join(tempfile.mkdtemp(), "txns")
+
+    def write():
+        with transaction.TransactionFileWriter(path, index=True) as writer:
+            writer.write_all(stxns)
+
+    def read_all():
+        transaction.retrieve_from_file(path)
+
+    def stream():
+        for _ in transaction.iter_from_file(path):
+            pass
+
+    def seek():
+        for n in range(0, args.count, max(args.count // 100, 1)):
+            next(transaction.iter_from_file(path, start=n))
+
+    timed("write signed txns with index", args.count, write)
+    timed("retrieve_from_file", args.count, read_all)
+    timed("iter_from_file", args.count, stream)
+    timed("seek to txn n, 100 times", 100, seek)
+    os.remove(path)
+    os.remove(transaction.index_path(path))
+
+
+def stub_server(respond, delay: float = 0.0):
+    """
+    Start a local HTTP/1.1 server answering GET and POST requests with the
+    json returned by respond(path), after sleeping for delay seconds.
+    """
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if delay:
+                time.sleep(delay)
+            body = json.dumps(respond(self.path)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_POST = do_GET
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, "http://127.0.0.1:{}".format(server.server_port)
+
+
+def bench_submission(args: argparse.Namespace) -> None:
+    import base64
+
+    from algosdk import account, transaction
+    from algosdk.v2client import algod, submission
+    from algosdk.v2client import transport as transport_
+
+    # a node taking 2ms per submission
+    server, address = stub_server(lambda path: {"txId": "TXID"}, delay=0.002)
+    sk, addr = account.generate_account()
+    sp = transaction.SuggestedParams(
+        1000, 1, 1001, base64.b64encode(bytes(32)).decode(), "testnet-v1"
+    )
+    count = args.count // 10
+    groups = [
+        [transaction.PaymentTxn(addr, sp, addr, i).sign(sk)]
+        for i in range(count)
+    ]
+
+    with transport_.PooledTransport() as pooled:
+        client = algod.AlgodClient("", address, transport=pooled)
+        before = timed(
+            "send_transactions, one at a time",
+            count,
+            lambda: [client.send_transactions(group) for group in groups],
+        )
+        pipeline = submission.SubmissionPipeline(client, window=16)
+        after = timed(
+            "SubmissionPipeline, window of 16",
+            count,
+            lambda: list(pipeline.submit(groups)),
+        )
+        print("speedup: {:.1f}x".format(before / after))
+        print(
+            "mean request latency: {:.1f} ms".format(
+                pipeline.stats()["request_latency"]["mean"] * 1000
+            )
+        )
+    server.shutdown()
+    server.server_close()
+
+
+def bench_transport(args: argparse.Namespace) -> None:
+    import asyncio
+
+    from algosdk.v2client import algod
+    from algosdk.v2client import transport as transport_
+
+    server, address = stub_server(
+        lambda path: {"last-round": 1000, "catchup-time": 0}
+    )
+
+    def run(client):
+        return lambda: [client.status() for _ in range(args.count)]
+
+    before = timed(
+        "AlgodClient.status, urllib",
+        args.count,
+        run(algod.AlgodClient("", address)),
+    )
+    with transport_.PooledTransport() as pooled:
+        after = timed(
+            "AlgodClient.status, pooled",
+            args.count,
+            run(algod.AlgodClient("", address, transport=pooled)),
+        )
+        print("speedup: {:.1f}x".format(before / after))
+        print("connections opened: {opened}".format(**pooled.stats))
+
+    async def run_async():
+        async with algod.AsyncAlgodClient("", address) as client:
+            for _ in range(args.count):
+                await client.status()
+
+    after = timed(
+        "AsyncAlgodClient.status",
+        args.count,
+        lambda: asyncio.run(run_async()),
+    )
+    print("speedup: {:.1f}x".format(before / after))
+    server.shutdown()
+    server.server_close()
+
+
+def bench_indexer_pages(args: argparse.Namespace) -> None:
+    from urllib import parse
+
+    from algosdk.v2client import indexer
+
+    page_size = 100
+
+    def respond(path):
+        query = parse.parse_qs(parse.urlsplit(path).query)
+        start = int(query.get("next", ["0"])[0])
+        end = min(start + page_size, args.count)
+        page = {"transactions": [{"id": i} for i in range(start, end)]}
+        if start < args.count:
+            page["next-token"] = str(end)
+        return page
+
+    # 10ms per page on the server and 10us per result for the caller
+    server, address = stub_server(respond, delay=0.01)
+    client = indexer.IndexerClient("", address)
+
+    def scan(prefetch):
+        def run():
+            for _ in client.iter_search_transactions(prefetch=prefetch):
+                time.sleep(0.00001)
+
+        return run
+
+    before = timed("iter_search_transactions, prefetch=0", args.count, scan(0))
+    for prefetch in (1, 4):
+        after = timed(
+            "iter_search_transactions, prefetch={}".format(prefetch),
+            args.count,
+            scan(prefetch),
+        )
+        print("speedup: {:.1f}x".format(before / after))
+    server.shutdown()
+    server.server_close()
+
+
+def bench_indexer_scan(args: argparse.Namespace) -> None:
+    from urllib import parse
+
+    from algosdk.v2client import indexer
+    from algosdk.v2client import transport as transport_
+
+    per_round = 5
+    max_round = args.count // per_round
+
+    def respond(path):
+        query = parse.parse_qs(parse.urlsplit(path).query)
+        lo = int(query.get("min-round", ["1"])[0])
+        hi = min(int(query.get("max-round", [max_round])[0]), max_round)
+        limit = int(query.get("limit", ["1000"])[0])
+        start = int(query.get("next", ["0"])[0])
+        end = min(start + limit, (hi - lo + 1) * per_round)
+        page = {
+            "transactions": [
+                {
+                    "confirmed-round": lo + i // per_round,
+                    "intra-round-offset": i % per_round,
+                }
+                for i in range(start, end)
+            ]
+        }
+        if page["transactions"]:
+            page["next-token"] = str(end)
+        return page
+
+    # 10ms per page on the server
+    server, address = stub_server(respond, delay=0.01)
+    with transport_.PooledTransport() as pooled:
+        client = indexer.IndexerClient("", address, transport=pooled)
+        before = timed(
+            "iter_search_transactions",
+            args.count,
+            lambda: list(
+                client.iter_search_transactions(
+                    min_round=1, max_round=max_round, limit=100
+                )
+            ),
+        )
+        for workers in (2, 4, 8):
+            after = timed(
+                "scan_transactions, workers={}".format(workers),
+                args.count,
+                lambda: list(
+                    client.scan_transactions(
+                        1,
+                        max_round,
+                        workers=workers,
+                        shard_results=1000,
+                        limit=100,
+                    )
+                ),
+            )
+            print("speedup: {:.1f}x".format(before / after))
+    server.shutdown()
+    server.server_close()
+
+
+def bench_blocks(args: argparse.Namespace) -> None:
+    import base64
+    import json
+
+    import msgpack
+
+    from algosdk import account, transaction
+    from algosdk.v2client import algod
+
+    sk, addr = account.generate_account()
+    sp = transaction.SuggestedParams(
+        1000, 1, 1001, base64.b64encode(bytes(32)).decode(), "testnet-v1"
+    )
+    txns = []
+    for i in range(args.count):
+        stib = transaction.PaymentTxn(addr, sp, addr, i).sign(sk).dictify()
+        del stib["txn"]["gh"], stib["txn"]["gen"]
+        stib["hgi"] = True
+        txns.append(stib)
+    block = {"rnd": 1, "gen": "testnet-v1", "gh": bytes(32), "txns": txns}
+    packed = msgpack.packb({"block": block}, use_bin_type=True)
+
+    def encode_json(obj):
+        if isinstance(obj, bytes):
+            return base64.b64encode(obj).decode()
+        if isinstance(obj, dict):
+            return {k: encode_json(v) for k, v in obj.items()}
+        if isinstance(obj, list):
+            return [encode_json(v) for v in obj]
+        return obj
+
+    body = json.dumps({"block": encode_json(block)}).encode()
+    print(
+        "body: json {:.1f} MB, msgpack {:.1f} MB".format(
+            len(body) / 1e6, len(packed) / 1e6
+        )
+    )
+
+    timed(
+        "json block",
+        args.count,
+        lambda: algod._parse_response(200, body, "json", "/blocks/1"),
+    )
+
+    timed(
+        "decoded msgpack block",
+        args.count,
+        lambda: algod._parse_response(200, packed, "decoded", "/blocks/1"),
+    )
+
+    def signed_transactions():
+        block = algod._parse_response(200, packed, "decoded", "/blocks/1")
+        for btxn in block:
+            btxn.signed_transaction
+
+    timed(
+        "decoded block, signed transactions", args.count, signed_transactions
+    )
+
+
+def bench_indexer_responses(args: argparse.Namespace) -> None:
+    import io
+    import json
+    import tracemalloc
+
+    from algosdk.v2client import indexer
+    from algosdk.v2client import transport as transport_
+
+    txn = {
+        "id": "X" * 52,
+        "fee": 1000,
+        "confirmed-round": 1,
+        "payment-transaction": {"amount": 1, "receiver": "Y" * 58},
+        "signature": {"sig": "Z" * 88},
+    }
+    body = json.dumps(
+        {"current-round": 1, "transactions": [txn] * args.count}
+    ).encode()
+    print("body: {:.1f} MB".format(len(body) / 1e6))
+
+    def run(name, fn):
+        tracemalloc.start()
+        timed(name, args.count, fn)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("peak memory: {:.1f} MB".format(peak / 1e6))
+
+    run(
+        "json response, sorted",
+        lambda: indexer._parse_response(200, body, sort=True),
+    )
+    run("json response", lambda: indexer._parse_response(200, body))
+
+    def stream():
+        response = transport_.Response(200, {}, io.BytesIO(body))
+        for _ in indexer.ResponseStream(response):
+            pass
+
+    run("streamed response", stream)
+
+
+BENCHMARKS = {
+    "addresses": bench_addresses,
+    "blocks": bench_blocks,
+    "decoding": bench_decoding,
+    "encoding": bench_encoding,
+    "fee-estimation": bench_fee_estimation,
+    "files": bench_files,
+    "indexer-pages": bench_indexer_pages,
+    "indexer-responses": bench_indexer_responses,
+    "indexer-scan": bench_indexer_scan,
+    "signing": bench_signing,
+    "submission": bench_submission,
+    "transport": bench_transport,
+    "verification": bench_verification,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=10000,
+        help="Number of operations to time",
+    )
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
@@ -2,6 +2,7 @@ import base64
 import random
 import unittest
 
+import msgpack
 import pytest
 from algosdk import (
     account,
@@ -10,6 +11,7 @@ from algosdk import (
     error,
     logic,
     mnemonic,
+    transaction,
     util,
     wordlist,
 )
@@ -131,6 +133,75 @@ class TestAddress(unittest.TestCase):
         )
         self.assertEqual(pk, account.address_from_private_key(sk))
 
+    def test_encode_buffers(self):
+        _, pk = account.generate_account()
+        decoded = encoding.decode_address(pk)
+        for buffer in (
+            bytearray(decoded),
+            memoryview(bytearray(decoded)),
+            memoryview(decoded),
+        ):
+            with self.subTest(type(buffer).__name__):
+                self.assertEqual(pk, encoding.encode_address(buffer))
+        with self.assertRaises(error.WrongKeyBytesLengthError):
+            encoding.encode_address(memoryview(bytearray(decoded[1:])))
+
+    def test_encode_decode_many(self):
+        addrs = [account.generate_account()[1] for _ in range(3)]
+        addrs.append(constants.ZERO_ADDRESS)
+        decoded = encoding.decode_addresses(addrs + [None])
+        self.assertEqual(
+            [encoding.decode_address(a) for a in addrs] + [None], decoded
+        )
+        self.assertEqual(addrs, encoding.encode_addresses(decoded[:-1]))
+        self.assertEqual(
+            addrs[:1], encoding.encode_addresses([bytearray(decoded[0])])
+        )
+        # the last character also holds padding bits, so change another one
+        invalid = addrs[0][:9] + ("A" if addrs[0][9] != "A" else "B")
+        invalid += addrs[0][10:]
+        with self.assertRaises(error.WrongChecksumError):
+            encoding.decode_addresses([addrs[0], invalid])
+
+    def test_cache(self):
+        self.addCleanup(
+            encoding.set_address_cache_size, constants.ADDRESS_CACHE_SIZE
+        )
+        encoding.set_address_cache_size(2)
+        addrs = [account.generate_account()[1] for _ in range(3)]
+
+        encoding.decode_addresses(addrs[:2] * 3)
+        info = encoding.address_cache_info()["decode"]
+        self.assertEqual(4, info["hits"])
+        self.assertEqual(2, info["misses"])
+        self.assertEqual(2, info["size"])
+        self.assertEqual(2, info["maxsize"])
+        self.assertAlmostEqual(4 / 6, info["hit_rate"])
+
+        # least recently used is evicted
+        encoding.decode_address(addrs[2])
+        encoding.decode_address(addrs[1])
+        self.assertEqual(5, encoding.address_cache_info()["decode"]["hits"])
+        encoding.decode_address(addrs[0])
+        self.assertEqual(4, encoding.address_cache_info()["decode"]["misses"])
+
+        # failures are not cached
+        with self.assertRaises(error.WrongKeyLengthError):
+            encoding.decode_address(addrs[0][:-1])
+        self.assertEqual(2, encoding.address_cache_info()["decode"]["size"])
+
+        encoding.clear_address_cache()
+        info = encoding.address_cache_info()
+        self.assertEqual(0, info["encode"]["size"] + info["decode"]["size"])
+        self.assertEqual(0.0, info["decode"]["hit_rate"])
+
+        encoding.set_address_cache_size(0)
+        self.assertEqual(
+            addrs[0],
+            encoding.encode_address(encoding.decode_address(addrs[0])),
+        )
+        self.assertEqual(0, encoding.address_cache_info()["decode"]["size"])
+
 
 class TestMsgpack(unittest.TestCase):
     def test_bid(self):
@@ -519,6 +590,50 @@ class TestMsgpack(unittest.TestCase):
             encoding.msgpack_encode(encoding.msgpack_decode(assettxn)),
         )
 
+    def test_encode_bytes(self):
+        paytxn = (
+            "iaNhbXTOAAGGoKNmZWXNA+iiZnbNcq2jZ2Vuq25ldHdvcmstdjM4omdoxCBN/+nfi"
+            "NPXLbuigk8M/TXsMUfMK7dV//xB1wkoOhNu9qJsds1zEaNyY3bEIAZ2cvp4J0OiBy"
+            "5eAHIX/njaRko955rEdN4AUNEl4rxTo3NuZMQgGC5kQiOIPooA8mrvoHRyFtk27F/"
+            "PPN08bAufGhnp0BGkdHlwZaNwYXk="
+        )
+        txn = encoding.msgpack_decode(paytxn)
+        encoded = encoding.msgpack_encode_bytes(txn)
+        self.assertIsInstance(encoded, bytes)
+        self.assertEqual(base64.b64decode(paytxn), encoded)
+        self.assertEqual(
+            encoding.msgpack_encode(txn), base64.b64encode(encoded).decode()
+        )
+
+    def test_decode_as(self):
+        sk, pk = account.generate_account()
+        sp = transaction.SuggestedParams(
+            0, 1, 100, "JgsgCaCTqIaLeVhyL6XlRu3n7Rfk2FxMeK+wRSaQ7dI="
+        )
+        stx = transaction.PaymentTxn(pk, sp, pk, 5).sign(sk)
+        encoded = encoding.msgpack_encode_bytes(stx)
+        for data in (
+            encoded,
+            base64.b64encode(encoded).decode(),
+            msgpack.unpackb(encoded, raw=False),
+        ):
+            self.assertEqual(
+                stx, encoding.decode_as(transaction.SignedTransaction, data)
+            )
+        txn = encoding.msgpack_encode_bytes(stx.transaction)
+        self.assertEqual(
+            stx.transaction, encoding.decode_as(transaction.PaymentTxn, txn)
+        )
+        self.assertEqual(
+            stx.transaction, encoding.decode_as(transaction.Transaction, txn)
+        )
+        with self.assertRaises(TypeError):
+            encoding.decode_as(transaction.AssetTransferTxn, txn)
+
+    def test_decode_unknown(self):
+        self.assertIsNone(encoding.msgpack_decode({"zzz": 1}))
+        self.assertIsNone(encoding.msgpack_decode({"zzz": 2}))
+
 
 class TestSignBytes(unittest.TestCase):
     def test_sign(self):
@@ -4,6 +4,8 @@ import os
 import unittest
 import uuid
 
+import msgpack
+
 from algosdk import (
     account,
     constants,
@@ -37,6 +39,25 @@ class TestPaymentTransaction(unittest.TestCase):
         txn = transaction.PaymentTxn(address, sp, address, 1000, note=b"\x00")
         self.assertEqual(100, txn.fee)
 
+    def test_estimate_size(self):
+        sk, address = account.generate_account()
+        gh = "JgsgCaCTqIaLeVhyL6XlRu3n7Rfk2FxMeK+wRSaQ7dI="
+        sp = transaction.SuggestedParams(10, 1, 100, gh, "testnet-v1.0")
+        txns = [
+            transaction.PaymentTxn(address, sp, address, 1000, note=b"\x00"),
+            transaction.PaymentTxn(
+                address, sp, address, 0, lease=b"\x01" * 32
+            ),
+            transaction.AssetTransferTxn(address, sp, address, 10, 5),
+            transaction.ApplicationCallTxn(
+                address, sp, 10, 0, app_args=[b"a" * 300], accounts=[address]
+            ),
+        ]
+        for txn in txns:
+            self.assertGreater(txn.fee, constants.min_txn_fee)
+            signed = encoding.msgpack_encode_bytes(txn.sign(sk))
+            self.assertEqual(len(signed), txn.estimate_size())
+
     def test_note_wrong_type(self):
         address = "7ZUECA7HFLZTXENRV24SHLU4AVPUTMTTDUFUBNBD64C73F3UHRTHAIOF6Q"
         gh = "JgsgCaCTqIaLeVhyL6XlRu3n7Rfk2FxMeK+wRSaQ7dI="
@@ -197,6 +218,84 @@ class TestPaymentTransaction(unittest.TestCase):
         re_enc = encoding.msgpack_encode(encoding.msgpack_decode(enc))
         self.assertEqual(enc, re_enc)
 
+    def test_sign_many(self):
+        gh = "JgsgCaCTqIaLeVhyL6XlRu3n7Rfk2FxMeK+wRSaQ7dI="
+        sk, sender = account.generate_account()
+        _, other = account.generate_account()
+        sp = transaction.SuggestedParams(0, 1, 100, gh, flat_fee=True)
+        txns = [transaction.PaymentTxn(sender, sp, other, i) for i in range(5)]
+        txns.append(transaction.PaymentTxn(other, sp, sender, 1))
+        expected = [encoding.msgpack_encode(txn.sign(sk)) for txn in txns]
+        for kwargs in ({}, {"workers": 2}, {"workers": 8}):
+            with self.subTest(**kwargs):
+                stxns = transaction.sign_many(txns, sk, **kwargs)
+                self.assertEqual(
+                    expected, [encoding.msgpack_encode(s) for s in stxns]
+                )
+                self.assertIsNone(stxns[0].authorizing_address)
+                self.assertEqual(sender, stxns[-1].authorizing_address)
+        self.assertEqual([], transaction.sign_many([], sk, workers=4))
+
+    def test_verify_many(self):
+        gh = "JgsgCaCTqIaLeVhyL6XlRu3n7Rfk2FxMeK+wRSaQ7dI="
+        program = b"\x01\x20\x01\x01\x22"
+        sk, sender = account.generate_account()
+        sk2, other = account.generate_account()
+        sp = transaction.SuggestedParams(0, 1, 100, gh, flat_fee=True)
+        msig = transaction.Multisig(1, 2, [sender, other])
+
+        def pay(snd, amt=1):
+            return transaction.PaymentTxn(snd, sp, other, amt)
+
+        mtx = transaction.MultisigTransaction(
+            pay(msig.address()), msig.get_multisig_account()
+        )
+        mtx.sign(sk)
+        partial = copy.deepcopy(mtx)
+        mtx.sign(sk2)
+        wrong_msig = transaction.MultisigTransaction(
+            pay(sender), msig.get_multisig_account()
+        )
+        wrong_msig.sign(sk)
+        wrong_msig.sign(sk2)
+        wrong_msig.auth_addr = None
+        escrow = transaction.LogicSigAccount(program)
+        delegated = transaction.LogicSigAccount(program)
+        delegated.sign(sk)
+        msig_delegated = transaction.LogicSigAccount(program)
+        msig_delegated.sign_multisig(msig, sk)
+        msig_delegated.append_to_multisig(sk2)
+        tampered = pay(sender).sign(sk)
+        tampered.transaction = pay(sender, 2)
+
+        def lstx(snd, lsig_account, rekeyed=True):
+            stxn = transaction.LogicSigTransaction(pay(snd), lsig_account)
+            if not rekeyed:
+                stxn.auth_addr = None
+            return stxn
+
+        cases = [
+            (pay(sender).sign(sk), True),
+            (pay(sender).sign(sk2), True),  # rekeyed, sgnr is set
+            (transaction.SignedTransaction(pay(sender), None), False),
+            (tampered, False),
+            (mtx, True),
+            (partial, False),
+            (wrong_msig, False),
+            (lstx(escrow.address(), escrow), True),
+            (lstx(sender, escrow), True),
+            (lstx(sender, escrow, rekeyed=False), False),
+            (lstx(sender, delegated), True),
+            (lstx(other, delegated, rekeyed=False), False),
+            (lstx(msig.address(), msig_delegated), True),
+            (lstx(sender, msig_delegated, rekeyed=False), False),
+        ]
+        stxns = [stxn for stxn, _ in cases]
+        expected = [valid for _, valid in cases]
+        self.assertEqual(expected, transaction.verify_many(stxns))
+        self.assertEqual(expected, transaction.verify_many(stxns, workers=3))
+        self.assertRaises(TypeError, transaction.verify_many, [pay(sender)])
+
     def test_sign_logic_multisig(self):
         program = b"\x01\x20\x01\x01\x22"
         lsig_account = transaction.LogicSigAccount(program)
@@ -1469,3 +1568,540 @@ class TestBoxReference(unittest.TestCase):
                 transaction.BoxReference.translate_box_references(
                     test_case[0], test_case[1], 9999
                 )
+
+
+class TestCanonicalEncoding(unittest.TestCase):
+    """The compiled field plans must match dictify + _sort_dict exactly"""
+
+    gh = "JgsgCaCTqIaLeVhyL6XlRu3n7Rfk2FxMeK+wRSaQ7dI="
+    program = b"\x01\x20\x01\x01\x22"
+
+    def assert_canonical(self, obj):
+        expected = msgpack.packb(
+            encoding._sort_dict(obj.dictify()), use_bin_type=True
+        )
+        self.assertEqual(expected, encoding.msgpack_encode_bytes(obj))
+
+    def sample_transactions(self):
+        sk, sender = account.generate_account()
+        _, other = account.generate_account()
+        sp = transaction.SuggestedParams(1000, 1, 100, self.gh, "gen-v1")
+        votekey = "Kv7QI7chi1y6axoy+t7wzAVpePqRq/rkjzWh/RMYyLo="
+        selkey = "bPgrv4YogPcdaUAxrt1QysYZTVyRAuUMD4zQmCu9llc="
+        sprfkey = base64.b64encode(b"\x01" * 64).decode()
+        txns = [
+            transaction.PaymentTxn(
+                sender,
+                sp,
+                other,
+                10,
+                close_remainder_to=other,
+                note=b"note",
+                lease=b"\x02" * 32,
+                rekey_to=other,
+            ),
+            transaction.PaymentTxn(sender, sp, constants.ZERO_ADDRESS, 0),
+            transaction.KeyregOnlineTxn(
+                sender, sp, votekey, selkey, 1, 100, 10, sprfkey=sprfkey
+            ),
+            transaction.KeyregOfflineTxn(sender, sp),
+            transaction.KeyregNonparticipatingTxn(sender, sp),
+            transaction.AssetCreateTxn(
+                sender,
+                sp,
+                1000,
+                2,
+                True,
+                manager=sender,
+                reserve=other,
+                unit_name="U",
+                asset_name="Asset",
+                url="https://example.com",
+                metadata_hash=b"\x03" * 32,
+            ),
+            transaction.AssetConfigTxn(
+                sender,
+                sp,
+                index=7,
+                url="https://example.com",
+                strict_empty_address_check=False,
+            ),
+            transaction.AssetDestroyTxn(sender, sp, 7),
+            transaction.AssetFreezeTxn(sender, sp, 7, other, True),
+            transaction.AssetTransferTxn(
+                sender, sp, other, 5, 7, other, revocation_target=other
+            ),
+            transaction.AssetOptInTxn(sender, sp, 7),
+            transaction.ApplicationCreateTxn(
+                sender,
+                sp,
+                transaction.OnComplete.OptInOC,
+                self.program,
+                self.program,
+                transaction.StateSchema(1, 2),
+                transaction.StateSchema(0, 3),
+                app_args=[b"arg", 7],
+                accounts=[other],
+                foreign_apps=[3],
+                foreign_assets=[4],
+                extra_pages=1,
+                boxes=[(0, b"box"), (3, b"")],
+            ),
+            transaction.ApplicationNoOpTxn(sender, sp, 10),
+        ]
+        txns[1].group = b"\x04" * 32
+        stpf = encoding.msgpack_decode(
+            {
+                "type": "stpf",
+                "snd": encoding.decode_address(sender),
+                "lv": 100,
+                "gh": base64.b64decode(self.gh),
+                "sp": {"c": b"\x05" * 32, "pr": 0, "r": {1: {"s": b"x"}}},
+                "spmsg": {"b": b"", "l": 5},
+                "sptype": 1,
+            }
+        )
+        txns.append(stpf)
+        return sk, txns
+
+    def test_transactions(self):
+        sk, txns = self.sample_transactions()
+        for txn in txns:
+            with self.subTest(txn=type(txn).__name__):
+                self.assert_canonical(txn)
+                self.assert_canonical(txn.sign(sk))
+                self.assert_canonical(transaction.SignedTransaction(txn, ""))
+
+    def test_undictify(self):
+        # decoding sets exactly the attributes the constructors would
+        _, txns = self.sample_transactions()
+        # leave out the encodings that drop fields: zero values nested in the
+        # state proof, and asset params that only set a url
+        txns = [
+            txn
+            for txn in txns
+            if not isinstance(txn, transaction.StateProofTxn)
+            and not (
+                isinstance(txn, transaction.AssetConfigTxn)
+                and txn.url
+                and not txn.total
+            )
+        ]
+        for txn in txns:
+            with self.subTest(txn=type(txn).__name__):
+                decoded = encoding.msgpack_decode(
+                    msgpack.unpackb(
+                        encoding.msgpack_encode_bytes(txn),
+                        raw=False,
+                        strict_map_key=False,
+                    )
+                )
+                expected = {
+                    k: v for k, v in vars(txn).items() if not k.startswith("_")
+                }
+                self.assertEqual(
+                    list(expected.items()), list(vars(decoded).items())
+                )
+                self.assertEqual(txn, decoded)
+                self.assertEqual(txn.get_txid(), decoded.get_txid())
+
+    def test_signatures(self):
+        sk, sender = account.generate_account()
+        sk2, other = account.generate_account()
+        sp = transaction.SuggestedParams(0, 1, 100, self.gh, flat_fee=True)
+        msig = transaction.Multisig(1, 2, [sender, other])
+        txn = transaction.PaymentTxn(msig.address(), sp, sender, 1)
+
+        mtx = transaction.MultisigTransaction(txn, msig)
+        self.assert_canonical(mtx)
+        mtx.sign(sk)
+        self.assert_canonical(mtx)
+        self.assert_canonical(
+            transaction.MultisigTransaction(
+                transaction.PaymentTxn(sender, sp, sender, 1),
+                msig.get_multisig_account(),
+            )
+        )
+
+        escrow = transaction.LogicSigAccount(self.program, [b"a", b"b"])
+        delegated = transaction.LogicSigAccount(self.program)
+        delegated.sign(sk)
+        msig_delegated = transaction.LogicSigAccount(self.program)
+        msig_delegated.sign_multisig(msig.get_multisig_account(), sk)
+        msig_delegated.append_to_multisig(sk2)
+        for lsig_account in (escrow, delegated, msig_delegated):
+            self.assert_canonical(lsig_account)
+            self.assert_canonical(lsig_account.lsig)
+            lstx = transaction.LogicSigTransaction(txn, lsig_account)
+            self.assert_canonical(lstx)
+
+        self.assert_canonical(transaction.StateSchema())
+        self.assert_canonical(transaction.TxGroup([b"\x06" * 32] * 3))
+
+    def test_dictify_override(self):
+        class CustomPaymentTxn(transaction.PaymentTxn):
+            def dictify(self):
+                d = super().dictify()
+                d["note"] = b"custom"
+                return d
+
+        _, sender = account.generate_account()
+        sp = transaction.SuggestedParams(0, 1, 100, self.gh, flat_fee=True)
+        txn = CustomPaymentTxn(sender, sp, sender, 1)
+        self.assert_canonical(txn)
+        self.assertEqual(
+            b"custom",
+            encoding.msgpack_decode(encoding.msgpack_encode(txn)).note,
+        )
+
+
+class TestTransactionCache(unittest.TestCase):
+    gh = "JgsgCaCTqIaLeVhyL6XlRu3n7Rfk2FxMeK+wRSaQ7dI="
+
+    def setUp(self):
+        self.sk, self.sender = account.generate_account()
+        sp = transaction.SuggestedParams(0, 1, 100, self.gh, flat_fee=True)
+        self.txn = transaction.PaymentTxn(self.sender, sp, self.sender, 1)
+
+    def fresh_txid(self):
+        txn = encoding.msgpack_decode(
+            encoding.msgpack_encode(self.txn.dictify())
+        )
+        return txn.get_txid()
+
+    def test_memoized(self):
+        txid = self.txn.get_txid()
+        encoded = encoding.msgpack_encode_bytes(self.txn)
+        self.assertIs(txid, self.txn.get_txid())
+        self.assertIs(encoded, encoding.msgpack_encode_bytes(self.txn))
+        self.assertIs(
+            encoded,
+            encoding.msgpack_encode_bytes(self.txn.sign(self.sk).transaction),
+        )
+        self.assertEqual(txid, self.fresh_txid())
+        self.assertNotIn("_txid", str(self.txn))
+
+    def test_invalidated_on_assignment(self):
+        txid = self.txn.get_txid()
+        self.txn.amt = 2
+        self.assertNotEqual(txid, self.txn.get_txid())
+        self.assertEqual(self.fresh_txid(), self.txn.get_txid())
+
+        txid = self.txn.get_txid()
+        transaction.assign_group_id([self.txn])
+        self.assertNotEqual(txid, self.txn.get_txid())
+        self.assertEqual(self.fresh_txid(), self.txn.get_txid())
+
+        txid = self.txn.get_txid()
+        self.txn.group = None
+        self.assertNotEqual(txid, self.txn.get_txid())
+
+    def test_group_signing(self):
+        txns = [self.txn, copy.deepcopy(self.txn)]
+        txns[1].note = b"second"
+        transaction.assign_group_id(txns)
+        stxns = [txn.sign(self.sk) for txn in txns]
+        self.assertEqual(
+            [txn.get_txid() for txn in txns],
+            [stx.get_txid() for stx in stxns],
+        )
+        for stx in stxns:
+            decoded = encoding.msgpack_decode(encoding.msgpack_encode(stx))
+            self.assertEqual(stx.get_txid(), decoded.get_txid())
+
+
+class TestTransactionView(unittest.TestCase):
+    gh = "JgsgCaCTqIaLeVhyL6XlRu3n7Rfk2FxMeK+wRSaQ7dI="
+
+    def setUp(self):
+        self.sk, self.sender = account.generate_account()
+        _, self.other = account.generate_account()
+        self.sp = transaction.SuggestedParams(
+            1000, 1, 100, self.gh, "gen-v1", flat_fee=True
+        )
+
+    def view(self, txn):
+        encoded = encoding.msgpack_encode_bytes(txn.sign(self.sk))
+        d = msgpack.unpackb(encoded, raw=False)["txn"]
+        return transaction.TransactionView(d)
+
+    def test_fields(self):
+        txns = [
+            transaction.PaymentTxn(
+                self.sender,
+                self.sp,
+                self.other,
+                10,
+                close_remainder_to=self.other,
+                note=b"note",
+                lease=b"\x01" * 32,
+                rekey_to=self.other,
+            ),
+            transaction.PaymentTxn(self.sender, self.sp, self.other, 0),
+            transaction.AssetTransferTxn(
+                self.sender, self.sp, self.other, 5, 7, self.other
+            ),
+            transaction.AssetOptInTxn(self.sender, self.sp, 7),
+            transaction.ApplicationNoOpTxn(
+                self.sender, self.sp, 3, app_args=[b"a"], accounts=[self.other]
+            ),
+            transaction.KeyregOfflineTxn(self.sender, self.sp),
+        ]
+        transaction.assign_group_id(txns[:2])
+        for txn in txns:
+            with self.subTest(txn=type(txn).__name__):
+                view = self.view(txn)
+                for name, value in vars(txn).items():
+                    if not name.startswith("_"):
+                        self.assertEqual(value, getattr(view, name), name)
+                self.assertEqual(txn, view)
+                self.assertEqual(view, txn)
+                self.assertEqual(txn.get_txid(), view.get_txid())
+                self.assertEqual(
+                    encoding.msgpack_encode_bytes(txn),
+                    encoding.msgpack_encode_bytes(view),
+                )
+
+    def test_lazy(self):
+        view = self.view(
+            transaction.PaymentTxn(self.sender, self.sp, self.other, 10)
+        )
+        self.assertEqual(self.other, view.receiver)
+        self.assertEqual(10, view.amt)
+        self.assertIsNone(view._txn)
+        self.assertNotIn("sender", vars(view))
+        view.get_txid()
+        self.assertIsNone(view._txn)
+
+        with self.assertRaises(AttributeError):
+            view.amount
+        self.assertIsNotNone(view._txn)
+        with self.assertRaises(AttributeError):
+            view.amt = 5
+
+    def test_missing_required(self):
+        txn = transaction.AssetTransferTxn(
+            self.sender, self.sp, self.other, 5, 7
+        )
+        d = self.view(txn).dictify()
+        for key, name in (
+            ("xaid", "index"),
+            ("snd", "sender"),
+            ("lv", "last_valid_round"),
+        ):
+            with self.subTest(key):
+                incomplete = {k: v for k, v in d.items() if k != key}
+                with self.assertRaises(Exception) as full:
+                    transaction.Transaction.undictify(incomplete)
+                view = transaction.TransactionView(incomplete)
+                with self.assertRaises(type(full.exception)):
+                    getattr(view, name)
+
+    def test_invalid_amount(self):
+        for txn, key, name in (
+            (
+                transaction.PaymentTxn(self.sender, self.sp, self.other, 5),
+                "amt",
+                "amt",
+            ),
+            (
+                transaction.AssetTransferTxn(
+                    self.sender, self.sp, self.other, 5, 7
+                ),
+                "aamt",
+                "amount",
+            ),
+        ):
+            for amount in (-1, "5"):
+                with self.subTest(key=key, amount=amount):
+                    d = {**self.view(txn).dictify(), key: amount}
+                    with self.assertRaises(error.WrongAmountType):
+                        transaction.Transaction.undictify(d)
+                    with self.assertRaises(error.WrongAmountType):
+                        getattr(transaction.TransactionView(d), name)
+
+    def test_equality(self):
+        txn = transaction.PaymentTxn(self.sender, self.sp, self.other, 10)
+        view = self.view(txn)
+        self.assertEqual(view, self.view(txn))
+        txn.amt = 11
+        self.assertNotEqual(txn, view)
+        self.assertNotEqual(view, txn)
+        self.assertNotEqual(view, "txn")
+        self.assertNotEqual(
+            view,
+            self.view(transaction.KeyregOfflineTxn(self.sender, self.sp)),
+        )
+
+        raw = encoding.msgpack_encode_bytes(txn)
+        view = transaction.TransactionView(
+            msgpack.unpackb(raw, raw=False), raw
+        )
+        self.assertEqual(txn.get_txid(), view.get_txid())
+        stx = transaction.SignedTransaction(view, None)
+        self.assertEqual(
+            encoding.msgpack_encode_bytes(
+                transaction.SignedTransaction(txn, None)
+            ),
+            encoding.msgpack_encode_bytes(stx),
+        )
+
+
+class TestTransactionFiles(unittest.TestCase):
+    gh = "JgsgCaCTqIaLeVhyL6XlRu3n7Rfk2FxMeK+wRSaQ7dI="
+
+    def setUp(self):
+        self.path = "/tmp/%s" % uuid.uuid4()
+        self.addCleanup(self.remove, self.path)
+        self.addCleanup(self.remove, transaction.index_path(self.path))
+        sk, sender = account.generate_account()
+        sp = transaction.SuggestedParams(0, 1, 100, self.gh, flat_fee=True)
+        msig = transaction.Multisig(1, 1, [sender])
+        mtx = transaction.MultisigTransaction(
+            transaction.PaymentTxn(msig.address(), sp, sender, 1), msig
+        )
+        mtx.sign(sk)
+        lsig = transaction.LogicSigAccount(b"\x01\x20\x01\x01\x22")
+        self.txns = [
+            transaction.PaymentTxn(sender, sp, sender, i) for i in range(6)
+        ]
+        self.txns[1] = self.txns[1].sign(sk)
+        self.txns[2] = mtx
+        self.txns[3] = transaction.LogicSigTransaction(self.txns[3], lsig)
+
+    @staticmethod
+    def remove(path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    def test_write_canonical(self):
+        transaction.write_to_file(self.txns, self.path)
+        with open(self.path, "rb") as f:
+            written = f.read()
+        expected = b"".join(
+            encoding.msgpack_encode_bytes(
+                {"txn": txn.dictify()}
+                if isinstance(txn, transaction.Transaction)
+                else txn
+            )
+            for txn in self.txns
+        )
+        self.assertEqual(expected, written)
+        self.assertEqual(self.txns, transaction.retrieve_from_file(self.path))
+
+    def test_iter(self):
+        with transaction.TransactionFileWriter(self.path) as writer:
+            writer.write_all(self.txns[:3])
+            writer.write(encoding.msgpack_encode_bytes(self.txns[3]))
+        transaction.write_to_file(self.txns[4:], self.path, overwrite=False)
+        self.assertEqual(4, writer.count)
+        self.assertFalse(os.path.exists(transaction.index_path(self.path)))
+
+        for use_mmap in (False, True):
+            it = transaction.iter_from_file(self.path, use_mmap=use_mmap)
+            self.assertNotIsInstance(it, list)
+            self.assertEqual(self.txns, list(it))
+            self.assertEqual(
+                self.txns[4:],
+                list(transaction.iter_from_file(self.path, 4, use_mmap)),
+            )
+            self.assertEqual(
+                [], list(transaction.iter_from_file(self.path, 10, use_mmap))
+            )
+
+        open(self.path, "wb").close()
+        self.assertEqual(
+            [], list(transaction.iter_from_file(self.path, use_mmap=True))
+        )
+
+    def test_index(self):
+        with transaction.TransactionFileWriter(self.path, index=True) as w:
+            w.write_all(self.txns[:2])
+        # appending to a file with no index builds it first
+        self.remove(transaction.index_path(self.path))
+        with transaction.TransactionFileWriter(
+            self.path, overwrite=False, index=True
+        ) as w:
+            w.write_all(self.txns[2:])
+
+        built = transaction.index_path(self.path) + ".built"
+        os.rename(transaction.index_path(self.path), built)
+        self.addCleanup(self.remove, built)
+        self.assertEqual(6, transaction.build_file_index(self.path))
+        with open(built, "rb") as a, open(
+            transaction.index_path(self.path), "rb"
+        ) as b:
+            self.assertEqual(a.read(), b.read())
+
+        with open(self.path, "rb") as f:
+            data = f.read()
+        for n, txn in enumerate(self.txns):
+            offset = transaction.read_file_index(self.path, n)
+            unpacker = msgpack.Unpacker(raw=False)
+            unpacker.feed(data[offset:])
+            self.assertEqual(txn, encoding.msgpack_decode(next(unpacker)))
+            self.assertEqual(
+                self.txns[n:],
+                list(transaction.iter_from_file(self.path, start=n)),
+            )
+        self.assertIsNone(transaction.read_file_index(self.path, 6))
+
+    def test_index_overwrite(self):
+        idx = transaction.index_path(self.path)
+        with transaction.TransactionFileWriter(self.path, index=True) as w:
+            w.write_all(self.txns)
+        transaction.write_to_file(self.txns[5:], self.path)
+        self.assertFalse(os.path.exists(idx))
+        self.assertEqual(
+            [], list(transaction.iter_from_file(self.path, start=5))
+        )
+
+        # an index left from an earlier file is not trusted
+        with transaction.TransactionFileWriter(self.path, index=True) as w:
+            w.write_all(self.txns)
+        with open(idx, "rb") as f:
+            stale = f.read()
+        transaction.write_to_file(self.txns[:3], self.path)
+        with open(idx, "wb") as f:
+            f.write(stale)
+        self.assertIsNone(transaction.read_file_index(self.path, 1))
+        for use_mmap in (False, True):
+            self.assertEqual(
+                self.txns[1:3],
+                list(transaction.iter_from_file(self.path, 1, use_mmap)),
+            )
+
+    def test_index_append(self):
+        idx = transaction.index_path(self.path)
+        with transaction.TransactionFileWriter(self.path, index=True) as w:
+            w.write_all(self.txns[:2])
+        # appending without index=True keeps an existing index up to date
+        transaction.write_to_file(self.txns[2:4], self.path, overwrite=False)
+        self.assertIsNotNone(transaction.read_file_index(self.path, 3))
+
+        # an index missing entries is rebuilt when appending with index=True
+        with open(idx, "r+b") as f:
+            f.truncate(16)
+        self.assertIsNone(transaction.read_file_index(self.path, 1))
+        self.assertEqual(
+            self.txns[1:4], list(transaction.iter_from_file(self.path, 1))
+        )
+        with transaction.TransactionFileWriter(
+            self.path, overwrite=False, index=True
+        ) as w:
+            w.write_all(self.txns[4:])
+        self.assertEqual(48, os.path.getsize(idx))
+        for n in range(6):
+            self.assertEqual(
+                self.txns[n:], list(transaction.iter_from_file(self.path, n))
+            )
+
+        # and removed when appending without it
+        with open(idx, "r+b") as f:
+            f.truncate(16)
+        transaction.write_to_file(self.txns[:1], self.path, overwrite=False)
+        self.assertFalse(os.path.exists(idx))
+        self.assertEqual(
+            self.txns[4:] + self.txns[:1],
+            list(transaction.iter_from_file(self.path, 4)),
+        )
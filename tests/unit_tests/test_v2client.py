@@ -0,0 +1,2007 @@
+import asyncio
+import base64
+import inspect
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import parse
+
+import msgpack
+
+from algosdk import account, encoding, error, kmd, transaction
+from algosdk.v2client import (
+    algod,
+    cache,
+    confirmation,
+    follower,
+    indexer,
+    responses,
+    submission,
+    transport,
+)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.server.bodies.append(self.rfile.read(length))
+        self.server.requests.append((self.command, self.path, self.headers))
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        status, body = self.server.routes.get(
+            self.path.split("?")[0],
+            (200, {"path": self.path, "z": {"b": 1, "a": 2}}),
+        )
+        if callable(body):
+            body = body(parse.parse_qs(parse.urlsplit(self.path).query))
+        self.send_response(status)
+        if isinstance(body, list):
+            # chunked encoding, one chunk per item
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in body + [b""]:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        else:
+            if not isinstance(body, bytes):
+                body = json.dumps(body).encode()
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        # drop the connection without telling the client, as a server
+        # closing an idle keep-alive connection does
+        self.close_connection = self.server.drop_connections
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer:
+    """HTTP/1.1 server answering from a table of routes, on localhost."""
+
+    def __init__(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self.server.daemon_threads = True
+        # clients closing responses early make writes fail
+        self.server.handle_error = lambda request, address: None
+        self.server.routes = {}
+        self.server.requests = []
+        self.server.bodies = []
+        self.server.drop_connections = False
+        self.server.delay = 0
+        self.address = "http://127.0.0.1:{}".format(self.server.server_port)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.01,)
+        )
+        self.thread.daemon = True
+        self.thread.start()
+
+    @property
+    def routes(self):
+        return self.server.routes
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    @property
+    def bodies(self):
+        return self.server.bodies
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestTransport(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubServer()
+        self.addCleanup(self.stub.close)
+
+    def test_abstract(self):
+        for base in (transport.Transport, transport.AsyncTransport):
+            with self.assertRaises(TypeError):
+                base()
+
+    def test_urllib(self):
+        t = transport.UrllibTransport(timeout=5)
+        with t.request("GET", self.stub.address + "/a?b=c") as resp:
+            self.assertEqual(resp.status, 200)
+            self.assertEqual(json.loads(resp.read())["path"], "/a?b=c")
+        self.stub.routes["/missing"] = (404, {"message": "no"})
+        with t.request("GET", self.stub.address + "/missing") as resp:
+            self.assertEqual(resp.status, 404)
+            self.assertEqual(json.loads(resp.read()), {"message": "no"})
+
+    def test_pool_reuse(self):
+        with transport.PooledTransport() as t:
+            for _ in range(5):
+                with t.request("GET", self.stub.address + "/a") as resp:
+                    self.assertEqual(resp.status, 200)
+                    resp.read()
+            self.assertEqual(t.stats, {"opened": 1, "reused": 4})
+
+    def test_unread_body_not_reused(self):
+        with transport.PooledTransport() as t:
+            t.request("GET", self.stub.address + "/a").close()
+            with t.request("GET", self.stub.address + "/a") as resp:
+                self.assertEqual(resp.read(3), b'{"p')
+            t.request("GET", self.stub.address + "/a").close()
+            self.assertEqual(t.stats, {"opened": 3, "reused": 0})
+
+    def test_read_in_chunks(self):
+        with transport.PooledTransport() as t:
+            with t.request("GET", self.stub.address + "/a") as resp:
+                body = b""
+                while True:
+                    chunk = resp.read(4)
+                    if not chunk:
+                        break
+                    body += chunk
+            self.assertEqual(json.loads(body)["path"], "/a")
+            t.request("GET", self.stub.address + "/a").read()
+            self.assertEqual(t.stats, {"opened": 1, "reused": 1})
+
+    def test_idle_timeout(self):
+        with transport.PooledTransport(idle_timeout=0.05) as t:
+            t.request("GET", self.stub.address + "/a").read()
+            time.sleep(0.1)
+            t.request("GET", self.stub.address + "/a").read()
+            self.assertEqual(t.stats, {"opened": 2, "reused": 0})
+
+    def test_pool_size(self):
+        with transport.PooledTransport(pool_size=1) as t:
+            first = t.request("GET", self.stub.address + "/a")
+            second = t.request("GET", self.stub.address + "/a")
+            first.read()
+            second.read()
+            key = ("http", "127.0.0.1", self.stub.server.server_port)
+            self.assertEqual(len(t._pools[key]), 1)
+            self.assertEqual(t.stats, {"opened": 2, "reused": 0})
+
+    def test_stale_connection(self):
+        with transport.PooledTransport() as t:
+            self.stub.server.drop_connections = True
+            t.request("GET", self.stub.address + "/a").read()
+            time.sleep(0.05)
+            with t.request("GET", self.stub.address + "/a") as resp:
+                self.assertEqual(resp.status, 200)
+                resp.read()
+            self.assertEqual(t.stats, {"opened": 2, "reused": 1})
+
+    def test_stale_connection_post(self):
+        with transport.PooledTransport() as t:
+            self.stub.server.drop_connections = True
+            t.request("GET", self.stub.address + "/a").read()
+            time.sleep(0.05)
+            # the server may have received a POST already: not sent again
+            with self.assertRaises(urllib.error.URLError):
+                t.request("POST", self.stub.address + "/a", data=b"x")
+            self.assertEqual(t.stats, {"opened": 1, "reused": 1})
+            self.assertEqual(len(self.stub.requests), 1)
+
+    def test_connection_error(self):
+        address = self.stub.address
+        self.stub.close()
+        with transport.PooledTransport() as t:
+            with self.assertRaises(urllib.error.URLError):
+                t.request("GET", address + "/a")
+
+    def test_threads(self):
+        results = []
+        with transport.PooledTransport(pool_size=4) as t:
+
+            def work():
+                for _ in range(10):
+                    with t.request("GET", self.stub.address + "/a") as resp:
+                        results.append(resp.status)
+                        resp.read()
+
+            threads = [threading.Thread(target=work) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(results, [200] * 80)
+            self.assertEqual(t.stats["opened"] + t.stats["reused"], 80)
+            self.assertLessEqual(t.stats["opened"], 8)
+
+
+class TestClientTransport(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubServer()
+        self.addCleanup(self.stub.close)
+        self.transport = transport.PooledTransport()
+        self.addCleanup(self.transport.close)
+
+    def test_default_transport(self):
+        client = algod.AlgodClient("token", self.stub.address)
+        self.assertIs(client.transport, transport.default_transport())
+        self.assertEqual(client.algod_request("GET", "/x")["path"], "/v2/x")
+
+    def test_algod(self):
+        client = algod.AlgodClient(
+            "token",
+            self.stub.address,
+            headers={"X-Extra": "1"},
+            transport=self.transport,
+        )
+        self.assertEqual(
+            client.algod_request("GET", "/x", params={"a": 1})["path"],
+            "/v2/x?a=1",
+        )
+        self.assertEqual(
+            client.algod_request("GET", "/x", response_format="msgpack"),
+            json.dumps({"path": "/v2/x", "z": {"b": 1, "a": 2}}).encode(),
+        )
+        _, _, headers = self.stub.requests[0]
+        self.assertEqual(headers["X-Algo-API-Token"], "token")
+        self.assertEqual(headers["X-Extra"], "1")
+        self.assertEqual(self.transport.stats["reused"], 1)
+
+        self.stub.routes["/v2/x"] = (404, {"message": "not found"})
+        with self.assertRaises(error.AlgodHTTPError) as cm:
+            client.algod_request("GET", "/x")
+        self.assertEqual(str(cm.exception), "not found")
+        self.assertEqual(cm.exception.code, 404)
+
+        self.stub.routes["/v2/x"] = (200, b"not json")
+        with self.assertRaises(error.AlgodResponseError):
+            client.algod_request("GET", "/x")
+
+    def test_indexer(self):
+        client = indexer.IndexerClient(
+            "", self.stub.address, transport=self.transport
+        )
+        response = client.indexer_request("GET", "/x")
+        self.assertEqual(list(response["z"]), ["b", "a"])
+        _, _, headers = self.stub.requests[0]
+        self.assertNotIn("X-Indexer-API-Token", headers)
+
+        self.stub.routes["/v2/x"] = (500, {"message": "failed"})
+        with self.assertRaisesRegex(error.IndexerHTTPError, "failed"):
+            client.indexer_request("GET", "/x")
+
+    def test_kmd(self):
+        client = kmd.KMDClient(
+            "token", self.stub.address, transport=self.transport
+        )
+        self.stub.routes["/versions"] = (200, {"versions": ["v1"]})
+        self.assertEqual(client.versions(), ["v1"])
+        self.assertEqual(
+            client.kmd_request("POST", "/x", data={"a": 1})["path"], "/v1/x"
+        )
+        self.stub.routes["/v1/x"] = (400, b"bad request")
+        with self.assertRaisesRegex(error.KMDHTTPError, "bad request"):
+            client.kmd_request("GET", "/x")
+        self.assertEqual(self.transport.stats["opened"], 1)
+
+    def test_shared_transport(self):
+        algod_client = algod.AlgodClient(
+            "token", self.stub.address, transport=self.transport
+        )
+        indexer_client = indexer.IndexerClient(
+            "token", self.stub.address, transport=self.transport
+        )
+        algod_client.algod_request("GET", "/x")
+        indexer_client.indexer_request("GET", "/x")
+        self.assertEqual(self.transport.stats, {"opened": 1, "reused": 1})
+
+
+class TestAsyncTransport(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.stub = StubServer()
+        self.addCleanup(self.stub.close)
+
+    async def test_pool_reuse(self):
+        async with transport.AsyncPooledTransport() as t:
+            for _ in range(3):
+                resp = await t.request("GET", self.stub.address + "/a?b=c")
+                self.assertEqual(resp.status, 200)
+                body = json.loads(await resp.read())
+                self.assertEqual(body["path"], "/a?b=c")
+            self.assertEqual(t.stats, {"opened": 1, "reused": 2})
+
+    async def test_chunked(self):
+        self.stub.routes["/chunked"] = (200, [b"ab", b"cde", b"f"])
+        async with transport.AsyncPooledTransport() as t:
+            resp = await t.request("GET", self.stub.address + "/chunked")
+            self.assertEqual(await resp.read(), b"abcdef")
+            resp = await t.request("GET", self.stub.address + "/chunked")
+            chunks = []
+            while True:
+                chunk = await resp.read(2)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            self.assertEqual(chunks, [b"ab", b"cd", b"e", b"f"])
+            self.assertEqual(t.stats, {"opened": 1, "reused": 1})
+
+    async def test_post(self):
+        async with transport.AsyncPooledTransport() as t:
+            for _ in range(2):
+                resp = await t.request(
+                    "POST", self.stub.address + "/a", data=b"xyz"
+                )
+                await resp.read()
+            self.assertEqual(t.stats, {"opened": 1, "reused": 1})
+
+    async def test_unread_body_not_reused(self):
+        async with transport.AsyncPooledTransport() as t:
+            async with await t.request("GET", self.stub.address + "/a"):
+                pass
+            resp = await t.request("GET", self.stub.address + "/a")
+            await resp.read()
+            self.assertEqual(t.stats, {"opened": 2, "reused": 0})
+
+    async def test_stale_connection(self):
+        async with transport.AsyncPooledTransport() as t:
+            self.stub.server.drop_connections = True
+            await (await t.request("GET", self.stub.address + "/a")).read()
+            await asyncio.sleep(0.05)
+            resp = await t.request("GET", self.stub.address + "/a")
+            self.assertEqual(resp.status, 200)
+            await resp.read()
+            self.assertEqual(t.stats["opened"], 2)
+
+    async def test_stale_connection_post(self):
+        class ClosedWriter:
+            def write(self, data):
+                raise ConnectionResetError
+
+            def is_closing(self):
+                return False
+
+            def close(self):
+                pass
+
+        async with transport.AsyncPooledTransport() as t:
+            reader = asyncio.StreamReader()
+            url = self.stub.address + "/a"
+            key = ("http", "127.0.0.1", parse.urlsplit(url).port)
+            # the server may have received a POST already: not sent again
+            t._put(key, (reader, ClosedWriter()))
+            with self.assertRaises(urllib.error.URLError):
+                await t.request("POST", url, data=b"x")
+            t._put(key, (reader, ClosedWriter()))
+            resp = await t.request("GET", url)
+            self.assertEqual(resp.status, 200)
+            await resp.read()
+            self.assertEqual(t.stats, {"opened": 1, "reused": 2})
+
+    async def test_connection_error(self):
+        address = self.stub.address
+        self.stub.close()
+        async with transport.AsyncPooledTransport() as t:
+            with self.assertRaises(urllib.error.URLError):
+                await t.request("GET", address + "/a")
+
+    async def test_concurrent(self):
+        async with transport.AsyncPooledTransport(pool_size=4) as t:
+
+            async def get():
+                async with await t.request(
+                    "GET", self.stub.address + "/a"
+                ) as resp:
+                    return json.loads(await resp.read())["path"]
+
+            for _ in range(3):
+                paths = await asyncio.gather(*[get() for _ in range(8)])
+                self.assertEqual(paths, ["/a"] * 8)
+            self.assertEqual(t.stats["opened"] + t.stats["reused"], 24)
+            self.assertLess(t.stats["opened"], 24)
+
+
+class TestMultiAlgodClient(unittest.TestCase):
+    def setUp(self):
+        self.stubs = []
+        for i in range(3):
+            stub = StubServer()
+            self.addCleanup(stub.close)
+            stub.routes["/v2/status"] = (200, {"node": i})
+            self.stubs.append(stub)
+        self.transport = transport.PooledTransport()
+        self.addCleanup(self.transport.close)
+
+    def client(self, **kwargs):
+        kwargs.setdefault("backoff", 0)
+        client = algod.MultiAlgodClient(
+            [("token", stub.address) for stub in self.stubs],
+            transport=self.transport,
+            **kwargs
+        )
+        self.addCleanup(client.close)
+        return client
+
+    def test_routing(self):
+        client = self.client()
+        # each node is tried once, then the fastest is used
+        self.assertEqual(
+            sorted(client.status()["node"] for _ in range(3)), [0, 1, 2]
+        )
+        client._endpoints[1].latency = 0.0
+        self.assertEqual(client.status()["node"], 1)
+        stats = client.endpoint_stats()
+        self.assertEqual([s["requests"] for s in stats], [1, 2, 1])
+        self.assertTrue(all(s["healthy"] for s in stats))
+
+    def test_failover(self):
+        client = self.client(failure_threshold=2)
+        self.stubs[0].close()
+        self.stubs[1].routes["/v2/status"] = (503, {"message": "busy"})
+        self.assertEqual(client.status()["node"], 2)
+        stats = client.endpoint_stats()
+        self.assertEqual([s["errors"] for s in stats], [1, 1, 0])
+        self.assertEqual([s["healthy"] for s in stats], [True, True, True])
+        self.assertGreater(stats[1]["error_rate"], 0)
+        # nodes not used successfully yet are tried first
+        self.assertEqual(client.status()["node"], 2)
+        stats = client.endpoint_stats()
+        self.assertEqual([s["errors"] for s in stats], [2, 2, 0])
+        self.assertEqual([s["healthy"] for s in stats], [False, False, True])
+        self.assertEqual(client.status()["node"], 2)
+        self.assertEqual(len(self.stubs[1].requests), 2)
+        self.assertEqual(len(self.stubs[2].requests), 3)
+
+    def test_retries(self):
+        client = self.client(retries=1)
+        for stub in self.stubs:
+            stub.routes["/v2/status"] = (503, {"message": "busy"})
+        with self.assertRaisesRegex(error.AlgodHTTPError, "busy"):
+            client.status()
+        self.assertEqual(sum(len(s.requests) for s in self.stubs), 2)
+
+    def test_no_retry(self):
+        client = self.client()
+        for stub in self.stubs:
+            stub.routes["/v2/status"] = (404, {"message": "missing"})
+        with self.assertRaisesRegex(error.AlgodHTTPError, "missing"):
+            client.status()
+        self.assertEqual(sum(len(s.requests) for s in self.stubs), 1)
+        for stub in self.stubs:
+            stub.routes["/v2/transactions"] = (503, {"message": "busy"})
+        with self.assertRaisesRegex(error.AlgodHTTPError, "busy"):
+            client.send_raw_transaction(base64.b64encode(b"\x80"))
+        self.assertEqual(sum(len(s.requests) for s in self.stubs), 2)
+
+    def test_pinning(self):
+        client = self.client()
+        sk, addr = account.generate_account()
+        sp = transaction.SuggestedParams(0, 1, 1000, "A" * 44)
+        txns = [transaction.PaymentTxn(addr, sp, addr, i) for i in range(2)]
+        stxns = [txn.sign(sk) for txn in transaction.assign_group_id(txns)]
+        for stub in self.stubs:
+            stub.routes["/v2/transactions"] = (200, {"txId": "TXID"})
+        for endpoint in client._endpoints:
+            endpoint.latency = 0.5
+        client._endpoints[2].latency = 0.0
+        client.send_transactions(stxns)
+        self.assertEqual(len(self.stubs[2].requests), 1)
+        client._endpoints[2].latency = 1.0
+        client._endpoints[0].latency = 0.0
+        for txn in txns:
+            client.pending_transaction_info(txn.get_txid())
+        client.pending_transaction_info("OTHER")
+        self.assertEqual(len(self.stubs[2].requests), 3)
+        self.assertEqual(len(self.stubs[0].requests), 1)
+
+    def test_hedging(self):
+        client = self.client(hedge=True)
+        for endpoint in client._endpoints:
+            endpoint.latency = 1.0
+        client._endpoints[0].latency = 0.0
+        client._endpoints[0].latencies.extend([0.01] * 20)
+        self.stubs[0].server.delay = 0.5
+        start = time.monotonic()
+        self.assertIn(client.status()["node"], (1, 2))
+        self.assertLess(time.monotonic() - start, 0.4)
+        self.assertEqual(sum(len(s.requests) for s in self.stubs), 2)
+
+    def test_hedging_threads(self):
+        client = self.client(hedge=True)
+        for endpoint in client._endpoints:
+            endpoint.latencies.extend([1.0] * 20)
+        threads = [
+            threading.Thread(target=client.status, daemon=True)
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        executor = client._executor
+        self.assertIsNotNone(executor)
+        client.close()
+        self.assertIsNone(client._executor)
+        self.assertTrue(executor._shutdown)
+        self.assertIn("node", client.status())
+        self.assertIsNot(client._executor, executor)
+        client.close()
+
+
+class TestAsyncAlgodClient(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.stub = StubServer()
+        self.addCleanup(self.stub.close)
+
+    def test_parity(self):
+        # coroutines are declared for type checkers too
+        source = inspect.getsource(algod.AsyncAlgodClient)
+        for name, method in vars(algod.AlgodClient).items():
+            if name.startswith("_") or not inspect.isfunction(method):
+                continue
+            with self.subTest(name):
+                async_method = getattr(algod.AsyncAlgodClient, name)
+                self.assertTrue(inspect.iscoroutinefunction(async_method))
+                self.assertEqual(
+                    inspect.signature(method).parameters.keys(),
+                    inspect.signature(async_method).parameters.keys(),
+                )
+                self.assertIn("async def {}(".format(name), source)
+
+    async def test_requests(self):
+        self.stub.routes["/v2/transactions"] = (200, {"txId": "TXID"})
+        self.stub.routes["/v2/transactions/params"] = (
+            200,
+            {
+                "fee": 0,
+                "last-round": 10,
+                "genesis-hash": "hash",
+                "genesis-id": "id",
+                "consensus-version": "v1",
+                "min-fee": 1000,
+            },
+        )
+        async with algod.AsyncAlgodClient("token", self.stub.address) as c:
+            status = await c.status()
+            self.assertEqual(status["path"], "/v2/status")
+            response = await c.block_info(5, response_format="msgpack")
+            self.assertIsInstance(response, bytes)
+
+            sp = await c.suggested_params()
+            self.assertEqual((sp.first, sp.last, sp.gen), (10, 1010, "id"))
+
+            sk, addr = account.generate_account()
+            stxn = transaction.PaymentTxn(addr, sp, addr, 1).sign(sk)
+            self.assertEqual(await c.send_transactions([stxn]), "TXID")
+            _, _, headers = self.stub.requests[-1]
+            self.assertEqual(headers["Content-Type"], "application/x-binary")
+            encoded = encoding.msgpack_encode_bytes(stxn)
+            self.assertEqual(
+                await c.send_encoded_transactions([encoded, stxn]), "TXID"
+            )
+            self.assertEqual(self.stub.bodies[-1], encoded + encoded)
+            self.assertEqual(c.transport.stats["opened"], 1)
+
+            self.stub.routes["/v2/status"] = (404, {"message": "missing"})
+            with self.assertRaisesRegex(error.AlgodHTTPError, "missing"):
+                await c.status()
+            with self.assertRaises(error.AlgodRequestError):
+                await c.suggested_params(response_format="msgpack")
+
+
+def signed_payment(amount=1):
+    sk, addr = account.generate_account()
+    sp = transaction.SuggestedParams(
+        1000, 10, 1010, base64.b64encode(bytes(32)).decode(), "testnet-v1"
+    )
+    return transaction.PaymentTxn(addr, sp, addr, amount).sign(sk)
+
+
+def packed(obj):
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+class TestDecodedResponses(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubServer()
+        self.addCleanup(self.stub.close)
+        self.client = algod.AlgodClient("token", self.stub.address)
+
+    def test_block(self):
+        stxns = [signed_payment(1), signed_payment(2)]
+        txns = []
+        for stxn in stxns:
+            stib = stxn.dictify()
+            # genesis fields are removed from transactions in blocks
+            del stib["txn"]["gh"], stib["txn"]["gen"]
+            stib["hgi"] = True
+            stib["ca"] = 5
+            txns.append(stib)
+        block = {
+            "rnd": 20,
+            "ts": 1700000000,
+            "gen": "testnet-v1",
+            "gh": bytes(32),
+            "txns": txns,
+        }
+        self.stub.routes["/v2/blocks/20"] = (200, packed({"block": block}))
+
+        decoded = self.client.block_info(20, response_format="decoded")
+        self.assertIn("format=msgpack", self.stub.requests[0][1])
+        self.assertIsInstance(decoded, responses.Block)
+        self.assertEqual((decoded.round, decoded.timestamp), (20, 1700000000))
+        self.assertEqual(decoded.genesis_hash, bytes(32))
+        self.assertNotIn("txns", decoded.header)
+        self.assertIsNone(decoded.certificate)
+        self.assertEqual(len(decoded), 2)
+        for btxn, stxn in zip(decoded, stxns):
+            self.assertEqual(btxn.txid, stxn.get_txid())
+            self.assertEqual(btxn.signed_transaction, stxn)
+            self.assertEqual(btxn.apply_data, {"ca": 5})
+
+        raw = self.client.block_info(20, response_format="msgpack")
+        self.assertEqual(raw, packed({"block": block}))
+
+    def test_pending_transactions(self):
+        stxns = [signed_payment(1), signed_payment(2)]
+        self.stub.routes["/v2/transactions/pending"] = (
+            200,
+            packed(
+                {
+                    "top-transactions": [s.dictify() for s in stxns],
+                    "total-transactions": 2,
+                }
+            ),
+        )
+        response = self.client.pending_transactions(response_format="decoded")
+        self.assertEqual(response["top-transactions"], stxns)
+        self.assertEqual(response["total-transactions"], 2)
+
+        txid = stxns[0].get_txid()
+        self.stub.routes["/v2/transactions/pending/" + txid] = (
+            200,
+            packed({"txn": stxns[0].dictify(), "pool-error": ""}),
+        )
+        response = self.client.pending_transaction_info(
+            txid, response_format="decoded"
+        )
+        self.assertIsInstance(response["txn"], transaction.SignedTransaction)
+        self.assertEqual(response["txn"].get_txid(), txid)
+
+    def test_account_info(self):
+        _, addr = account.generate_account()
+        self.stub.routes["/v2/accounts/" + addr] = (
+            200,
+            packed({"address": addr, "amount": 10, "auth-addr": bytes(32)}),
+        )
+        response = self.client.account_info(addr, response_format="decoded")
+        self.assertEqual(response["amount"], 10)
+        self.assertEqual(response["auth-addr"], bytes(32))
+        self.assertEqual(
+            self.stub.requests[0][1].split("?")[1], "format=msgpack"
+        )
+
+        self.stub.routes["/v2/accounts/" + addr] = (200, {"amount": 10})
+        self.assertEqual(self.client.account_info(addr)["amount"], 10)
+        self.assertNotIn("?", self.stub.requests[1][1])
+
+    def test_params_pairs(self):
+        self.stub.routes["/v2/status"] = (200, packed({"last-round": 3}))
+        for params in (
+            [("format", "decoded"), ("a", "b")],
+            (("format", "decoded"), ("a", "b")),
+        ):
+            response = self.client.algod_request(
+                "GET", "/status", params, response_format="decoded"
+            )
+            self.assertEqual(response, {"last-round": 3})
+            self.assertEqual(
+                self.stub.requests[-1][1].split("?")[1], "format=msgpack&a=b"
+            )
+
+    def test_invalid(self):
+        self.stub.routes["/v2/blocks/1"] = (200, b"\xc1")
+        with self.assertRaises(error.AlgodResponseError):
+            self.client.block_info(1, response_format="decoded")
+
+    def test_decode_signed_transaction(self):
+        stxn = signed_payment()
+        self.assertIsInstance(
+            responses.decode_signed_transaction(stxn.dictify()),
+            transaction.SignedTransaction,
+        )
+        self.assertEqual(
+            encoding.msgpack_encode(
+                responses.decode_signed_transaction(
+                    {**stxn.dictify(), "ca": 1}
+                )
+            ),
+            encoding.msgpack_encode(stxn),
+        )
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubServer()
+        self.addCleanup(self.stub.close)
+
+    def client(self, response_cache):
+        return algod.AlgodClient(
+            "token",
+            self.stub.address,
+            transport=cache.CachingTransport(
+                transport.PooledTransport(), response_cache
+            ),
+        )
+
+    def test_policies(self):
+        response_cache = cache.ResponseCache()
+        client = self.client(response_cache)
+        self.assertEqual(
+            client.block_info(5)["path"], "/v2/blocks/5?format=json"
+        )
+        self.assertEqual(
+            client.block_info(5)["path"], "/v2/blocks/5?format=json"
+        )
+        client.block_info(5, response_format="msgpack")
+        client.get_block_hash(5)
+        client.get_block_hash(5)
+        client.status()
+        client.status()
+        self.assertEqual(len(self.stub.requests), 5)
+        self.assertEqual(response_cache.stats["hits"], 2)
+        self.assertEqual(response_cache.stats["misses"], 3)
+        self.assertEqual(response_cache.stats["entries"], 3)
+
+        self.stub.routes["/v2/blocks/100"] = (404, {"message": "no block"})
+        for _ in range(2):
+            with self.assertRaises(error.AlgodHTTPError):
+                client.block_info(100)
+        self.assertEqual(len(self.stub.requests), 7)
+
+        self.assertEqual(
+            response_cache.policy("GET", self.stub.address + "/v2/assets/1"),
+            (True, 60.0),
+        )
+        self.assertEqual(
+            response_cache.policy("POST", self.stub.address + "/v2/blocks/1"),
+            (False, None),
+        )
+
+    def test_ttl(self):
+        response_cache = cache.ResponseCache([(r"/v2/assets/\d+$", 0.05)])
+        client = self.client(response_cache)
+        client.asset_info(1)
+        client.asset_info(1)
+        self.assertEqual(len(self.stub.requests), 1)
+        time.sleep(0.06)
+        client.asset_info(1)
+        self.assertEqual(len(self.stub.requests), 2)
+        client.block_info(1)
+        client.block_info(1)
+        self.assertEqual(len(self.stub.requests), 4)
+
+    def test_eviction(self):
+        response_cache = cache.ResponseCache(max_entries=2)
+        client = self.client(response_cache)
+        for block in (1, 2, 1, 3, 1, 2):
+            client.block_info(block)
+        # 2 is evicted by 3, being the least recently used
+        self.assertEqual(len(self.stub.requests), 4)
+        self.assertEqual(response_cache.stats["evicted"], 2)
+        self.assertEqual(response_cache.stats["entries"], 2)
+
+        body = json.dumps({"path": "/v2/blocks/1?format=json"}).encode()
+        response_cache = cache.ResponseCache(max_bytes=len(body) * 2)
+        response_cache.put("GET", "a", {}, body, None)
+        response_cache.put("GET", "b", {}, body, None)
+        response_cache.put("GET", "c", {}, body + body, None)
+        self.assertEqual(response_cache.stats["entries"], 1)
+        self.assertIsNone(response_cache.get("GET", "a"))
+        self.assertEqual(response_cache.get("GET", "c"), ({}, body + body))
+
+    def test_directory(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.client(cache.ResponseCache(directory=directory.name)).block_info(
+            7, response_format="msgpack"
+        )
+        response_cache = cache.ResponseCache(directory=directory.name)
+        client = self.client(response_cache)
+        self.assertEqual(
+            json.loads(client.block_info(7, response_format="msgpack")),
+            {"path": "/v2/blocks/7?format=msgpack", "z": {"b": 1, "a": 2}},
+        )
+        client.block_info(7, response_format="msgpack")
+        self.assertEqual(len(self.stub.requests), 1)
+        self.assertEqual(response_cache.stats["disk_hits"], 1)
+        self.assertEqual(response_cache.stats["hits"], 1)
+
+        response_cache.clear()
+        client.block_info(7, response_format="msgpack")
+        self.assertEqual(len(self.stub.requests), 2)
+
+        # files of interrupted writes are removed too
+        open(os.path.join(directory.name, "tmpx.tmp"), "wb").close()
+        response_cache.clear()
+        self.assertEqual(os.listdir(directory.name), [])
+
+
+class TestAsyncResponseCache(unittest.IsolatedAsyncioTestCase):
+    async def test_shared_cache(self):
+        stub = StubServer()
+        self.addCleanup(stub.close)
+        response_cache = cache.ResponseCache()
+        algod.AlgodClient(
+            "token",
+            stub.address,
+            transport=cache.CachingTransport(cache=response_cache),
+        ).genesis()
+        async with algod.AsyncAlgodClient(
+            "token",
+            stub.address,
+            transport=cache.AsyncCachingTransport(cache=response_cache),
+        ) as client:
+            self.assertEqual((await client.genesis())["path"], "/genesis")
+            await client.block_info(3)
+            await client.block_info(3)
+            await client.status()
+        self.assertEqual(len(stub.requests), 3)
+        self.assertEqual(response_cache.stats["hits"], 2)
+
+    async def test_directory_in_executor(self):
+        stub = StubServer()
+        self.addCleanup(stub.close)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        response_cache = cache.ResponseCache(directory=directory.name)
+        threads = []
+        for name in ("get", "put"):
+            method = getattr(response_cache, name)
+
+            def record(*args, method=method):
+                threads.append(threading.get_ident())
+                return method(*args)
+
+            setattr(response_cache, name, record)
+        async with algod.AsyncAlgodClient(
+            "token",
+            stub.address,
+            transport=cache.AsyncCachingTransport(cache=response_cache),
+        ) as client:
+            await client.block_info(3)
+            await client.block_info(3)
+        self.assertEqual(len(stub.requests), 1)
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(threading.get_ident(), threads)
+
+
+class _ParamsClient:
+    """Client whose rounds advance when put in its queue."""
+
+    def __init__(self, fetch_delay=0):
+        self.round = 10
+        self.fee = 0
+        self.rounds = queue.Queue()
+        self.fetches = 0
+        self.fetch_delay = fetch_delay
+
+    def suggested_params(self):
+        self.fetches += 1
+        time.sleep(self.fetch_delay)
+        return transaction.SuggestedParams(
+            self.fee,
+            self.round,
+            self.round + 1000,
+            "gh",
+            "gen",
+            False,
+            "v1",
+            1000,
+        )
+
+    def status(self):
+        return {"last-round": self.round}
+
+    def status_after_block(self, block_num):
+        next_round = self.rounds.get(timeout=5)
+        if isinstance(next_round, Exception):
+            raise next_round
+        self.round = next_round
+        return {"last-round": next_round}
+
+
+class TestSuggestedParamsProvider(unittest.TestCase):
+    def wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.005)
+
+    def test_cache(self):
+        client = _ParamsClient()
+        provider = algod.SuggestedParamsProvider(client, validity_window=20)
+        sp = provider.suggested_params()
+        self.assertEqual(
+            (sp.first, sp.last, sp.gh, sp.min_fee), (10, 30, "gh", 1000)
+        )
+        sp.fee = 5000
+        sp.flat_fee = True
+        sp = provider.suggested_params()
+        self.assertEqual((sp.fee, sp.flat_fee), (0, False))
+        self.assertEqual(provider.stats, {"hits": 1, "fetches": 1})
+
+        provider.max_age = 0
+        client.round = 11
+        self.assertEqual(provider.suggested_params().first, 11)
+        self.assertEqual(provider.stats["fetches"], 2)
+
+    def test_concurrent(self):
+        client = _ParamsClient(fetch_delay=0.05)
+        provider = algod.SuggestedParamsProvider(client)
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(provider.suggested_params())
+            )
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(client.fetches, 1)
+        self.assertEqual(len({id(sp) for sp in results}), 8)
+        self.assertEqual(provider.stats, {"hits": 7, "fetches": 1})
+
+    def test_follow(self):
+        client = _ParamsClient()
+        with algod.SuggestedParamsProvider(
+            client, retry_delay=0.05
+        ) as provider:
+            self.wait_for(lambda: provider.stats["fetches"] == 1)
+            self.assertEqual(provider.round, 10)
+
+            client.fee = 10
+            client.rounds.put(12)
+            self.wait_for(lambda: provider.stats["fetches"] == 2)
+            sp = provider.suggested_params()
+            self.assertEqual((sp.first, sp.fee), (12, 10))
+            self.assertEqual(provider.stats["hits"], 1)
+
+            client.rounds.put(error.AlgodHTTPError("unavailable", 503))
+            self.wait_for(lambda: provider.error is not None)
+            # the thread starts over from status
+            self.wait_for(lambda: provider.error is None)
+            self.assertEqual(provider.stats["fetches"], 3)
+        client.rounds.put(13)
+
+
+class TestCoalescingTransport(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubServer()
+        self.addCleanup(self.stub.close)
+        self.transport = transport.CoalescingTransport(
+            transport.PooledTransport()
+        )
+        self.client = algod.AlgodClient(
+            "token", self.stub.address, transport=self.transport
+        )
+
+    def concurrently(self, fn, n=8):
+        results = [None] * n
+
+        def run(i):
+            try:
+                results[i] = fn()
+            except Exception as e:
+                results[i] = e
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_coalesced(self):
+        self.stub.server.delay = 0.1
+        results = self.concurrently(self.client.status)
+        self.assertEqual(
+            results, [{"path": "/v2/status", "z": {"b": 1, "a": 2}}] * 8
+        )
+        self.assertEqual(len(self.stub.requests), 1)
+        self.assertEqual(self.transport.stats, {"requests": 1, "coalesced": 7})
+
+        # sequential requests are all sent
+        self.stub.server.delay = 0
+        self.client.status()
+        self.client.status()
+        self.assertEqual(len(self.stub.requests), 3)
+
+    def test_distinct(self):
+        self.stub.server.delay = 0.1
+        other = algod.AlgodClient(
+            "other", self.stub.address, transport=self.transport
+        )
+        calls = [
+            self.client.status,
+            lambda: self.client.block_info(1),
+            other.status,
+            lambda: self.client.algod_request("POST", "/x", data=b"x"),
+            lambda: self.client.algod_request("POST", "/x", data=b"x"),
+        ]
+        self.concurrently(lambda: calls.pop()(), n=len(calls))
+        self.assertEqual(len(self.stub.requests), 5)
+        self.assertEqual(self.transport.stats, {"requests": 3, "coalesced": 0})
+
+    def test_error(self):
+        self.stub.close()
+        results = self.concurrently(self.client.status, n=4)
+        for result in results:
+            self.assertIsInstance(result, urllib.error.URLError)
+        self.assertEqual(self.transport._calls, {})
+
+
+class TestAsyncCoalescingTransport(unittest.IsolatedAsyncioTestCase):
+    async def test_coalesced(self):
+        stub = StubServer()
+        self.addCleanup(stub.close)
+        stub.server.delay = 0.1
+        coalescing = transport.AsyncCoalescingTransport()
+        async with algod.AsyncAlgodClient(
+            "token", stub.address, transport=coalescing
+        ) as client:
+            first = asyncio.ensure_future(client.status())
+            await asyncio.sleep(0.02)
+            first.cancel()
+            results = await asyncio.gather(
+                *(client.status() for _ in range(4))
+            )
+            self.assertEqual([r["path"] for r in results], ["/v2/status"] * 4)
+            with self.assertRaises(asyncio.CancelledError):
+                await first
+        self.assertEqual(len(stub.requests), 1)
+        self.assertEqual(coalescing.stats, {"requests": 1, "coalesced": 4})
+
+
+def block_of(rnd, stxns):
+    txns = []
+    for stxn in stxns:
+        stib = stxn.dictify()
+        del stib["txn"]["gh"], stib["txn"]["gen"]
+        stib["hgi"] = True
+        txns.append(stib)
+    return {"rnd": rnd, "gen": "testnet-v1", "gh": bytes(32), "txns": txns}
+
+
+class _ChainClient:
+    """Client of a chain whose rounds advance when put in its queue."""
+
+    def __init__(self, last_round=10):
+        self.round = last_round
+        self.rounds = queue.Queue()
+        self.blocks = {}
+        self.pending = {}
+        self.block_requests = []
+
+    def status(self):
+        return {"last-round": self.round}
+
+    def status_after_block(self, block_num):
+        next_round = self.rounds.get(timeout=5)
+        if isinstance(next_round, Exception):
+            raise next_round
+        self.round = next_round
+        return {"last-round": next_round}
+
+    def block_info(self, block, response_format="json"):
+        self.block_requests.append(block)
+        return responses.Block(self.blocks.get(block) or block_of(block, []))
+
+    def pending_transaction_info(self, txid):
+        if txid not in self.pending:
+            raise error.AlgodHTTPError("not found", 404)
+        return self.pending[txid]
+
+
+class TestConfirmationTracker(unittest.TestCase):
+    def setUp(self):
+        self.client = _ChainClient()
+        self.tracker = confirmation.ConfirmationTracker(
+            self.client, retry_delay=0.01
+        )
+        self.addCleanup(self.tracker.close)
+        # let the thread exit
+        self.addCleanup(self.client.rounds.put, 1000)
+
+    def test_confirmed(self):
+        stxns = [signed_payment(i) for i in range(4)]
+        self.client.blocks[10] = block_of(10, stxns[:1])
+        self.client.blocks[11] = block_of(11, [signed_payment()] + stxns[1:3])
+        self.client.blocks[13] = block_of(13, stxns[3:])
+        called = []
+        futures = [
+            self.tracker.track_transaction(stxn, callback=called.append)
+            for stxn in stxns
+        ]
+        self.assertIs(self.tracker.track_transaction(stxns[0]), futures[0])
+        self.tracker.start()
+        for rnd in (11, 12, 13):
+            self.client.rounds.put(rnd)
+        for stxn, future, rnd in zip(stxns, futures, (10, 11, 11, 13)):
+            btxn = future.result(timeout=5)
+            self.assertEqual(btxn.txid, stxn.get_txid())
+            self.assertEqual(btxn.confirmed_round, rnd)
+        # callbacks are called after waiters are notified
+        deadline = time.monotonic() + 5
+        while len(called) < 4 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertEqual(called, futures)
+        self.assertEqual(self.tracker.pending, 0)
+        self.assertEqual(self.tracker.stats["confirmed"], 4)
+        self.assertEqual(self.client.block_requests, [10, 11, 12, 13])
+
+        # rounds are not read while nothing is tracked
+        self.client.rounds.put(14)
+        self.client.rounds.put(15)
+        stxn = signed_payment()
+        self.client.blocks[16] = block_of(16, [stxn])
+        while self.tracker._round < 15:
+            time.sleep(0.005)
+        future = self.tracker.track_transaction(stxn)
+        self.client.rounds.put(16)
+        self.assertEqual(future.result(timeout=5).confirmed_round, 16)
+        self.assertEqual(self.client.block_requests, [10, 11, 12, 13, 16])
+
+    def test_expired(self):
+        self.tracker.start()
+        future = self.tracker.track("TXID", 12)
+        cancelled = self.tracker.track("OTHER", 1000)
+        self.assertTrue(cancelled.cancel())
+        for rnd in (11, 12):
+            self.client.rounds.put(rnd)
+        with self.assertRaises(error.ConfirmationTimeoutError):
+            future.result(timeout=5)
+        self.assertEqual(self.tracker.pending, 0)
+        self.assertEqual(self.tracker.stats["expired"], 1)
+
+    def test_checks(self):
+        self.tracker.check_rounds = 2
+        stxn = signed_payment()
+        self.client.blocks[5] = block_of(5, [stxn])
+        self.client.pending["REJECTED"] = {"pool-error": "overspend"}
+        self.client.pending[stxn.get_txid()] = {
+            "confirmed-round": 5,
+            "pool-error": "",
+        }
+        self.tracker.start()
+        self.client.rounds.put(11)
+        rejected = self.tracker.track("REJECTED", 1000)
+        confirmed = self.tracker.track_transaction(stxn)
+        unknown = self.tracker.track("UNKNOWN", 1000)
+        for rnd in (12, 13, 14):
+            self.client.rounds.put(rnd)
+        with self.assertRaisesRegex(
+            error.TransactionRejectedError, "overspend"
+        ):
+            rejected.result(timeout=5)
+        self.assertEqual(confirmed.result(timeout=5).confirmed_round, 5)
+        self.assertFalse(unknown.done())
+        self.assertEqual(self.tracker.pending, 1)
+
+    def test_no_checks_at_start(self):
+        # tracked before the round is known: checked from the first round
+        for i in range(50):
+            self.tracker.track("TXID{}".format(i), 1000)
+        self.tracker.start()
+        for rnd in (11, 12, 13):
+            self.client.rounds.put(rnd)
+        while self.tracker._round < 13:
+            time.sleep(0.005)
+        self.assertEqual(self.tracker.stats["checks"], 0)
+        self.client.rounds.put(14)
+        deadline = time.monotonic() + 5
+        while (
+            self.tracker.stats["checks"] < 50 and time.monotonic() < deadline
+        ):
+            time.sleep(0.005)
+        self.assertEqual(self.tracker.stats["checks"], 50)
+
+    def test_error(self):
+        self.tracker.start()
+        future = self.tracker.track("TXID", 1000)
+        self.client.rounds.put(error.AlgodHTTPError("unavailable", 503))
+        while self.tracker.error is None:
+            time.sleep(0.005)
+        self.client.rounds.put(11)
+        while 11 not in self.client.block_requests:
+            time.sleep(0.005)
+        self.assertFalse(future.done())
+
+
+class _SlowChainClient(_ChainClient):
+    def __init__(self, last_round=10, delay=0.02, failures=0):
+        super().__init__(last_round)
+        self.delay = delay
+        self.failures = failures
+        self.concurrent = 0
+        self.max_concurrent = 0
+        self.lock = threading.Lock()
+
+    def block_info(self, block, response_format="json"):
+        with self.lock:
+            self.concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self.concurrent)
+            fail = self.failures > 0
+            self.failures -= 1
+        try:
+            time.sleep(self.delay)
+            if fail:
+                raise error.AlgodHTTPError("unavailable", 503)
+            return super().block_info(block, response_format)
+        finally:
+            with self.lock:
+                self.concurrent -= 1
+
+
+class TestBlockFollower(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.checkpoint = directory.name + "/checkpoint"
+
+    def test_follow(self):
+        client = _SlowChainClient()
+        self.addCleanup(client.rounds.put, 1000)
+        blocks = iter(
+            follower.BlockFollower(
+                client, start_round=5, prefetch=3, checkpoint=self.checkpoint
+            )
+        )
+        rounds = [next(blocks).round for _ in range(6)]
+        self.assertEqual(rounds, [5, 6, 7, 8, 9, 10])
+        self.assertEqual(client.max_concurrent, 3)
+        # 10 is being processed
+        self.assertEqual(follower.FileCheckpoint(self.checkpoint).load(), 10)
+
+        client.rounds.put(12)
+        self.assertEqual([next(blocks).round for _ in range(2)], [11, 12])
+        blocks.close()
+        self.assertEqual(follower.FileCheckpoint(self.checkpoint).load(), 12)
+
+        # started again, with start_round ignored
+        client.round = 20
+        resumed = follower.BlockFollower(
+            client, start_round=1, checkpoint=self.checkpoint
+        )
+        self.assertEqual(resumed.next_round, 12)
+        self.assertEqual(next(iter(resumed)).round, 12)
+
+    def test_start_round(self):
+        client = _ChainClient()
+        self.addCleanup(client.rounds.put, 1000)
+        blocks = follower.BlockFollower(client, retry_delay=0)
+        self.assertIsNone(blocks.next_round)
+        self.assertEqual(next(iter(blocks)).round, 10)
+        self.assertEqual(blocks.next_round, 10)
+        with self.assertRaises(ValueError):
+            follower.BlockFollower(client, prefetch=0)
+
+    def test_retries(self):
+        client = _SlowChainClient(delay=0, failures=2)
+        blocks = follower.BlockFollower(
+            client, start_round=10, prefetch=1, retry_delay=0
+        )
+        self.assertEqual(next(iter(blocks)).round, 10)
+
+        client.failures = 4
+        with self.assertRaises(error.AlgodHTTPError):
+            next(iter(blocks))
+
+
+class _AsyncChainClient:
+    def __init__(self, chain):
+        self.chain = chain
+
+    async def status(self):
+        return self.chain.status()
+
+    async def status_after_block(self, block_num):
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.chain.status_after_block, block_num
+        )
+
+    async def block_info(self, block, response_format="json"):
+        await asyncio.sleep(0.01)
+        return self.chain.block_info(block, response_format)
+
+
+class TestAsyncBlockFollower(unittest.IsolatedAsyncioTestCase):
+    async def test_follow(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        checkpoint = directory.name + "/checkpoint"
+        chain = _ChainClient()
+        self.addCleanup(chain.rounds.put, 1000)
+        blocks = follower.AsyncBlockFollower(
+            _AsyncChainClient(chain),
+            start_round=8,
+            prefetch=2,
+            checkpoint=checkpoint,
+        )
+        chain.rounds.put(11)
+        rounds = []
+        async for block in blocks:
+            rounds.append(block.round)
+            if block.round == 11:
+                break
+        self.assertEqual(rounds, [8, 9, 10, 11])
+        self.assertEqual(blocks.next_round, 11)
+        self.assertEqual(follower.FileCheckpoint(checkpoint).load(), 11)
+
+
+class _SubmissionClient:
+    """Client answering submissions with the errors in its queue."""
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def send_encoded_transactions(self, txns):
+        with self.lock:
+            self.sent.append(txns)
+            e = self.errors.pop(0) if self.errors else None
+        if e is not None:
+            raise e
+        return "TXID"
+
+
+class TestSubmissionPipeline(unittest.TestCase):
+    def test_classify_error(self):
+        def http_error(message, code=400):
+            return error.AlgodHTTPError(message, code)
+
+        cases = [
+            (urllib.error.URLError("refused"), "retry"),
+            (http_error("busy", 503), "retry"),
+            (http_error("too many requests", 429), "retry"),
+            (
+                http_error(
+                    "TransactionPool.checkPendingQueueSize: transaction pool "
+                    "have reached capacity"
+                ),
+                "backoff",
+            ),
+            (
+                http_error(
+                    "TransactionPool.Remember: transaction X: fee 1000 below "
+                    "threshold 2000 (2 per byte * 1000 bytes)"
+                ),
+                "backoff",
+            ),
+            (
+                http_error("transaction already in ledger: X"),
+                "committed",
+            ),
+            (
+                http_error("txn dead: round 100 outside of 200--1200"),
+                "backoff",
+            ),
+            (
+                http_error("txn dead: round 1300 outside of 200--1200"),
+                "expired",
+            ),
+            (http_error("overspend (account X)"), "rejected"),
+            (error.AlgodResponseError("bad json"), "rejected"),
+        ]
+        for e, expected in cases:
+            with self.subTest(str(e)):
+                self.assertEqual(submission.classify_error(e), expected)
+
+    def test_submit(self):
+        stub = StubServer()
+        self.addCleanup(stub.close)
+        stub.routes["/v2/transactions"] = (200, {"txId": "TXID"})
+        stub.server.delay = 0.01
+        client = algod.AlgodClient(
+            "token", stub.address, transport=transport.PooledTransport()
+        )
+        groups = [[signed_payment(i), signed_payment(i)] for i in range(12)]
+        pulled = []
+
+        def produce():
+            for i, group in enumerate(groups):
+                pulled.append(i)
+                yield group
+
+        pipeline = submission.SubmissionPipeline(client, window=4)
+        results = []
+        for result in pipeline.submit(produce()):
+            # backpressure: groups are pulled as results are consumed
+            self.assertLessEqual(len(pulled), len(results) + 5)
+            results.append(result)
+        self.assertEqual(
+            sorted(r.index for r in results), list(range(len(groups)))
+        )
+        for result in results:
+            self.assertEqual(result.status, "accepted")
+            self.assertEqual(result.txid, groups[result.index][0].get_txid())
+            self.assertEqual(result.attempts, 1)
+        self.assertEqual(len(stub.requests), 12)
+        self.assertLessEqual(client.transport.stats["opened"], 4)
+
+        stats = pipeline.stats()
+        self.assertEqual(stats["accepted"], 12)
+        self.assertEqual(stats["latency"]["count"], 12)
+        self.assertEqual(
+            sum(n for _, n in stats["request_latency"]["buckets"]), 12
+        )
+        self.assertGreater(stats["groups_per_second"], 0)
+
+    def test_retries(self):
+        pool_full = error.AlgodHTTPError(
+            "TransactionPool.checkPendingQueueSize: transaction pool have "
+            "reached capacity",
+            400,
+        )
+        client = _SubmissionClient(
+            [urllib.error.URLError("reset"), pool_full, pool_full]
+        )
+        pipeline = submission.SubmissionPipeline(
+            client,
+            window=1,
+            backoff=0.001,
+            pressure_backoff=0.02,
+        )
+        group = [signed_payment()]
+        start = time.monotonic()
+        (result,) = pipeline.submit([group])
+        self.assertEqual((result.status, result.attempts), ("accepted", 4))
+        # 0.02 + 0.04 of pressure backoff
+        self.assertGreaterEqual(time.monotonic() - start, 0.06)
+        self.assertEqual(
+            client.sent, [encoding.msgpack_encode_bytes(group[0])] * 4
+        )
+        self.assertEqual(pipeline.stats()["retries"], 3)
+
+        client.errors = [pool_full] * 3
+        pipeline.retries = 2
+        pipeline.pressure_backoff = 0
+        (result,) = pipeline.submit([group])
+        self.assertEqual((result.status, result.attempts), ("failed", 3))
+        self.assertIs(result.error, pool_full)
+
+    def test_outcomes(self):
+        client = _SubmissionClient(
+            [
+                error.AlgodHTTPError("transaction already in ledger: X", 400),
+                error.AlgodHTTPError("txn dead: round 9 outside of 1--5", 400),
+                error.AlgodHTTPError("overspend", 400),
+            ]
+        )
+        pipeline = submission.SubmissionPipeline(client, window=1)
+        results = list(pipeline.submit([[signed_payment()] for _ in range(4)]))
+        self.assertEqual(
+            [r.status for r in results],
+            ["committed", "expired", "rejected", "accepted"],
+        )
+        self.assertEqual([r.attempts for r in results], [1, 1, 1, 1])
+        stats = pipeline.stats()
+        self.assertEqual(
+            [stats[s] for s in submission._OUTCOMES], [1, 1, 1, 1, 0]
+        )
+        self.assertEqual(stats["retries"], 0)
+
+
+class TestSendTransactions(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubServer()
+        self.addCleanup(self.stub.close)
+        self.stub.routes["/v2/transactions"] = (200, {"txId": "TXID"})
+        self.client = algod.AlgodClient("token", self.stub.address)
+
+    def test_bodies(self):
+        stxns = [signed_payment(i) for i in range(3)]
+        encoded = [encoding.msgpack_encode_bytes(stxn) for stxn in stxns]
+        body = b"".join(encoded)
+
+        self.assertEqual(self.client.send_transaction(stxns[0]), "TXID")
+        self.assertEqual(self.client.send_transactions(stxns), "TXID")
+        self.client.send_raw_transaction(base64.b64encode(body))
+        self.client.send_encoded_transactions(body)
+        self.client.send_encoded_transactions(bytearray(body))
+        self.client.send_encoded_transactions(
+            [encoded[0], stxns[1], memoryview(encoded[2])]
+        )
+        self.assertEqual(self.stub.bodies, [encoded[0]] + [body] * 5)
+        for _, _, headers in self.stub.requests:
+            self.assertEqual(headers["Content-Type"], "application/x-binary")
+
+        self.client.send_encoded_transactions(body, headers={"X-Extra": "1"})
+        _, _, headers = self.stub.requests[-1]
+        self.assertEqual(headers["X-Extra"], "1")
+        self.assertEqual(headers["Content-Type"], "application/x-binary")
+
+    def test_simulate(self):
+        self.stub.routes["/v2/transactions/simulate"] = (200, {"version": 2})
+        stxns = [signed_payment(i) for i in range(2)]
+        body = b"".join(encoding.msgpack_encode_bytes(s) for s in stxns)
+        self.assertEqual(
+            self.client.simulate_transactions(stxns), {"version": 2}
+        )
+        self.client.simulate_raw_transaction(base64.b64encode(body))
+        self.assertEqual(self.stub.bodies, [body, body])
+        for _, _, headers in self.stub.requests:
+            self.assertEqual(headers["Content-Type"], "application/x-binary")
+
+    def test_invalid(self):
+        with self.assertRaises(AssertionError):
+            self.client.send_encoded_transactions(
+                [signed_payment().transaction]
+            )
+        with self.assertRaises(error.AlgodRequestError):
+            self.client.send_encoded_transactions(
+                b"", response_format="msgpack"
+            )
+        self.assertEqual(self.stub.requests, [])
+
+
+def paged(results, key):
+    """Route paging through results with next-tokens, by limit."""
+
+    def page(query):
+        start = int(query.get("next", ["0"])[0])
+        end = start + int(query.get("limit", ["2"])[0])
+        page = {key: results[start:end], "current-round": 1}
+        if start < len(results):
+            page["next-token"] = str(end)
+        return page
+
+    return page
+
+
+class TestIndexerIterators(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubServer()
+        self.addCleanup(self.stub.close)
+        self.txns = [{"id": str(i)} for i in range(7)]
+        self.stub.routes["/v2/transactions"] = (
+            200,
+            paged(self.txns, "transactions"),
+        )
+        self.transport = transport.PooledTransport()
+        self.addCleanup(self.transport.close)
+        self.client = indexer.IndexerClient(
+            "", self.stub.address, transport=self.transport
+        )
+
+    def test_methods(self):
+        for name in indexer._paginated_methods:
+            self.assertTrue(callable(getattr(self.client, "iter_" + name)))
+
+    def test_iter(self):
+        for prefetch in (0, 1, 3):
+            with self.subTest(prefetch=prefetch):
+                txns = self.client.iter_search_transactions(
+                    limit=2, prefetch=prefetch
+                )
+                self.assertEqual(list(txns), self.txns)
+                self.assertEqual(list(txns), [])
+        txns = self.client.iter_search_transactions(limit=3, next_page="5")
+        self.assertEqual(list(txns), self.txns[5:])
+        # next_page given positionally
+        txns = self.client.iter_search_transactions(3, "5")
+        self.assertEqual(list(txns), self.txns[5:])
+
+    def test_other_methods(self):
+        self.stub.routes["/v2/accounts/A/assets"] = (
+            200,
+            paged(list(range(5)), "assets"),
+        )
+        self.stub.routes["/v2/applications/1/logs"] = (
+            200,
+            paged(list(range(3)), "log-data"),
+        )
+        self.assertEqual(
+            list(self.client.iter_lookup_account_assets("A", limit=2)),
+            list(range(5)),
+        )
+        self.assertEqual(
+            list(self.client.iter_application_logs(1)), list(range(3))
+        )
+
+    def test_cursor(self):
+        for prefetch in (0, 2):
+            with self.subTest(prefetch=prefetch):
+                txns = self.client.iter_search_transactions(
+                    limit=2, prefetch=prefetch
+                )
+                first = [next(txns) for _ in range(3)]
+                self.assertEqual(txns.cursor, ("2", 1))
+                txns.close()
+                rest = self.client.iter_search_transactions(
+                    limit=2, prefetch=prefetch, cursor=txns.cursor
+                )
+                self.assertEqual(first + list(rest), self.txns)
+                self.assertEqual(rest.cursor, ("6", 1))
+                again = self.client.iter_search_transactions(
+                    limit=2, cursor=rest.cursor
+                )
+                self.assertEqual(list(again), [])
+
+    def test_prefetch(self):
+        with self.client.iter_search_transactions(limit=1, prefetch=2) as txns:
+            self.assertEqual(next(txns), self.txns[0])
+            time.sleep(0.2)
+            # the page being iterated over and two pages ahead
+            self.assertEqual(len(self.stub.requests), 3)
+            self.assertEqual(next(txns), self.txns[1])
+            time.sleep(0.2)
+            self.assertEqual(len(self.stub.requests), 4)
+
+    def test_error(self):
+        self.stub.routes["/v2/accounts"] = (500, {"message": "failed"})
+        with self.assertRaisesRegex(error.IndexerHTTPError, "failed"):
+            list(self.client.iter_accounts())
+
+    def test_retry_after_error(self):
+        failures = ["2"]
+
+        def fetch(token):
+            if token in failures:
+                failures.remove(token)
+                raise ConnectionError("dropped")
+            start = int(token or 0)
+            page = {"transactions": self.txns[start : start + 2]}
+            if start < len(self.txns):
+                page["next-token"] = str(start + 2)
+            return page
+
+        for prefetch in (0, 2):
+            with self.subTest(prefetch=prefetch):
+                failures[:] = ["2"]
+                txns = indexer.ResultIterator(
+                    fetch, "transactions", prefetch=prefetch
+                )
+                first = [next(txns), next(txns)]
+                with self.assertRaises(ConnectionError):
+                    next(txns)
+                self.assertEqual(txns.cursor, (None, 2))
+                self.assertEqual(first + list(txns), self.txns)
+
+
+def transactions_by_round(txns):
+    """
+    Route searching transactions by round, paging by limit and answering
+    latest first.
+    """
+
+    def page(query):
+        lo = int(query.get("min-round", ["0"])[0])
+        hi = int(query.get("max-round", ["1000000"])[0])
+        found = [
+            txn for txn in txns[::-1] if lo <= txn["confirmed-round"] <= hi
+        ]
+        return paged(found, "transactions")(query)
+
+    return page
+
+
+class TestIndexerResponseFormats(unittest.TestCase):
+    body = {
+        "current-round": 7,
+        "transactions": [
+            {"id": "ü" * 3, "fee": 1000, "z": {"b": [1.5, -2], "a": None}},
+            {"id": "b", "fee": 123456789, "note": 'x\\"]},'},
+            {"id": "c", "fee": 0, "ok": True},
+        ],
+        "next-token": "abc",
+        "counts": [1, 2],
+    }
+
+    def setUp(self):
+        self.stub = StubServer()
+        self.addCleanup(self.stub.close)
+        self.transport = transport.PooledTransport()
+        self.addCleanup(self.transport.close)
+        self.client = indexer.IndexerClient(
+            "", self.stub.address, transport=self.transport
+        )
+        self.data = json.dumps(self.body, indent=1).encode()
+        self.stub.routes["/v2/transactions"] = (200, self.data)
+
+    def test_parser(self):
+        for size in (1, 2, 7, len(self.data)):
+            with self.subTest(size=size):
+                parser = indexer._ArrayItemParser()
+                items = []
+                for i in range(0, len(self.data), size):
+                    items += parser.feed(self.data[i : i + size])
+                items += parser.feed(b"", True)
+                self.assertEqual(items, self.body["transactions"])
+                self.assertEqual(parser.array_key, "transactions")
+                self.assertEqual(
+                    parser.fields,
+                    {
+                        "current-round": 7,
+                        "next-token": "abc",
+                        "counts": [1, 2],
+                    },
+                )
+
+    def test_parser_errors(self):
+        for data in (b"[1, 2]", b'{"a": [1, 2}', b'{"a": 1', b'{"a": 1} 2'):
+            with self.subTest(data=data):
+                parser = indexer._ArrayItemParser()
+                with self.assertRaises(error.IndexerHTTPError):
+                    parser.feed(data)
+                    parser.feed(b"", True)
+
+    def test_sort_responses(self):
+        response = self.client.search_transactions()
+        self.assertEqual(list(response), list(self.body))
+        self.assertEqual(response, self.body)
+        client = indexer.IndexerClient(
+            "", self.stub.address, sort_responses=True
+        )
+        response = client.search_transactions()
+        self.assertEqual(list(response), sorted(self.body))
+        # dicts in lists are not sorted
+        self.assertEqual(list(response["transactions"][0]["z"]), ["b", "a"])
+
+    def test_raw(self):
+        response = self.client.search_transactions(response_format="raw")
+        self.assertEqual(response, self.data)
+        with self.assertRaises(ValueError):
+            self.client.search_transactions(response_format="msgpack")
+
+    def test_stream(self):
+        with self.client.search_transactions(response_format="stream") as s:
+            self.assertEqual(list(s), self.body["transactions"])
+            self.assertEqual(s.key, "transactions")
+            self.assertEqual(s.fields["next-token"], "abc")
+        # chunked, and read to the end so that the connection is reused
+        self.stub.routes["/v2/transactions"] = (
+            200,
+            [self.data[i : i + 5] for i in range(0, len(self.data), 5)],
+        )
+        s = self.client.search_transactions(response_format="stream")
+        self.assertEqual(list(s), self.body["transactions"])
+        self.assertEqual(self.transport.stats, {"opened": 1, "reused": 1})
+
+        # closed before the end of a body larger than a read
+        txns = [{"id": i, "note": "x" * 100} for i in range(2000)]
+        self.stub.routes["/v2/transactions"] = (200, {"transactions": txns})
+        s = self.client.search_transactions(response_format="stream")
+        self.assertEqual(next(s), txns[0])
+        s.close()
+        self.client.search_transactions(response_format="stream").close()
+        self.assertEqual(self.transport.stats, {"opened": 2, "reused": 2})
+
+        self.stub.routes["/v2/transactions"] = (404, {"message": "none"})
+        with self.assertRaisesRegex(error.IndexerHTTPError, "none"):
+            self.client.search_transactions(response_format="stream")
+
+    def test_async_stream(self):
+        async def stream():
+            async with indexer.AsyncIndexerClient(
+                "", self.stub.address
+            ) as client:
+                s = await client.search_transactions(response_format="stream")
+                async with s:
+                    items = [item async for item in s]
+                self.assertEqual(s.fields["current-round"], 7)
+                raw = await client.search_transactions(response_format="raw")
+                self.assertEqual(raw, self.data)
+                self.assertEqual(client.transport.stats["opened"], 1)
+                return items
+
+        self.assertEqual(asyncio.run(stream()), self.body["transactions"])
+
+
+class TestScanTransactions(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubServer()
+        self.addCleanup(self.stub.close)
+        # rounds 1 to 100 hold no transaction, then 3 per round up to 200
+        self.txns = [
+            {"confirmed-round": r, "intra-round-offset": i}
+            for r in range(101, 201)
+            for i in range(3)
+        ]
+        self.stub.routes["/v2/transactions"] = (
+            200,
+            transactions_by_round(self.txns),
+        )
+        self.transport = transport.PooledTransport()
+        self.addCleanup(self.transport.close)
+        self.client = indexer.IndexerClient(
+            "", self.stub.address, transport=self.transport
+        )
+
+    def shards(self):
+        return sorted(
+            {
+                (int(q["min-round"][0]), int(q["max-round"][0]))
+                for q in (
+                    parse.parse_qs(parse.urlsplit(path).query)
+                    for _, path, _ in self.stub.requests
+                )
+            }
+        )
+
+    def test_scan(self):
+        for workers in (1, 3):
+            with self.subTest(workers=workers):
+                txns = self.client.scan_transactions(
+                    1, 200, workers=workers, shard_rounds=20, limit=4
+                )
+                self.assertEqual(list(txns), self.txns)
+
+    def test_shard_sizes(self):
+        txns = self.client.scan_transactions(
+            1, 200, workers=1, shard_rounds=10, shard_results=30, limit=100
+        )
+        self.assertEqual(list(txns), self.txns)
+        # empty shards double in size, then shards aim at 30 transactions
+        self.assertEqual(
+            self.shards(),
+            [
+                (1, 10),
+                (11, 30),
+                (31, 70),
+                (71, 150),
+                (151, 166),
+                (167, 176),
+                (177, 186),
+                (187, 196),
+                (197, 200),
+            ],
+        )
+
+    def test_partial_range(self):
+        txns = self.client.scan_transactions(150, 151, shard_rounds=1)
+        self.assertEqual(list(txns), self.txns[147:153])
+
+
+class TestAsyncIndexerClient(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.stub = StubServer()
+        self.addCleanup(self.stub.close)
+        self.txns = [{"id": str(i)} for i in range(7)]
+        self.stub.routes["/v2/transactions"] = (
+            200,
+            paged(self.txns, "transactions"),
+        )
+
+    def test_parity(self):
+        for name, method in vars(indexer.IndexerClient).items():
+            if name.startswith(("_", "iter_")) or not inspect.isfunction(
+                method
+            ):
+                continue
+            if name == "scan_transactions":
+                continue
+            with self.subTest(name):
+                async_method = getattr(indexer.AsyncIndexerClient, name)
+                self.assertTrue(inspect.iscoroutinefunction(async_method))
+        for name in indexer._paginated_methods:
+            self.assertTrue(
+                callable(getattr(indexer.AsyncIndexerClient, "iter_" + name))
+            )
+        client = indexer.AsyncIndexerClient("", self.stub.address)
+        self.assertIsInstance(
+            client.iter_search_transactions(), indexer.AsyncResultIterator
+        )
+
+    async def test_requests(self):
+        async with indexer.AsyncIndexerClient("", self.stub.address) as c:
+            response = await c.health()
+            self.assertEqual(list(response["z"]), ["b", "a"])
+            page = await c.search_transactions(limit=3, next_page="3")
+            self.assertEqual(page["transactions"], self.txns[3:6])
+            self.stub.routes["/v2/accounts"] = (400, {"message": "bad"})
+            with self.assertRaisesRegex(error.IndexerHTTPError, "bad"):
+                await c.accounts()
+
+    async def test_iter(self):
+        async with indexer.AsyncIndexerClient("", self.stub.address) as c:
+            for prefetch in (0, 1, 3):
+                with self.subTest(prefetch=prefetch):
+                    txns = [
+                        txn
+                        async for txn in c.iter_search_transactions(
+                            limit=2, prefetch=prefetch
+                        )
+                    ]
+                    self.assertEqual(txns, self.txns)
+            txns = [
+                txn
+                async for txn in c.iter_search_transactions(
+                    limit=3, next_page="5"
+                )
+            ]
+            self.assertEqual(txns, self.txns[5:])
+            txns = [txn async for txn in c.iter_search_transactions(3, "5")]
+            self.assertEqual(txns, self.txns[5:])
+            self.assertEqual(c.transport.stats["opened"], 1)
+
+    async def test_iter_cursor(self):
+        async with indexer.AsyncIndexerClient("", self.stub.address) as c:
+            for prefetch in (0, 2):
+                with self.subTest(prefetch=prefetch):
+                    async with c.iter_search_transactions(
+                        limit=2, prefetch=prefetch
+                    ) as txns:
+                        first = [await txns.__anext__() for _ in range(3)]
+                        self.assertEqual(txns.cursor, ("2", 1))
+                    rest = c.iter_search_transactions(
+                        limit=2, prefetch=prefetch, cursor=txns.cursor
+                    )
+                    self.assertEqual(
+                        first + [txn async for txn in rest], self.txns
+                    )
+                    self.assertEqual(rest.cursor, ("6", 1))
+
+    async def test_iter_retry_after_error(self):
+        failures = ["2"]
+
+        async def fetch(token):
+            if token in failures:
+                failures.remove(token)
+                raise ConnectionError("dropped")
+            start = int(token or 0)
+            page = {"transactions": self.txns[start : start + 2]}
+            if start < len(self.txns):
+                page["next-token"] = str(start + 2)
+            return page
+
+        for prefetch in (0, 2):
+            with self.subTest(prefetch=prefetch):
+                failures[:] = ["2"]
+                txns = indexer.AsyncResultIterator(
+                    fetch, "transactions", prefetch=prefetch
+                )
+                first = [await txns.__anext__(), await txns.__anext__()]
+                with self.assertRaises(ConnectionError):
+                    await txns.__anext__()
+                self.assertEqual(txns.cursor, (None, 2))
+                rest = [txn async for txn in txns]
+                self.assertEqual(first + rest, self.txns)
+
+    async def test_iter_prefetch(self):
+        async with indexer.AsyncIndexerClient("", self.stub.address) as c:
+            results = c.iter_search_transactions(limit=1, prefetch=2)
+            self.assertEqual(await results.__anext__(), self.txns[0])
+            await asyncio.sleep(0.2)
+            # the page being iterated over and two pages ahead
+            self.assertEqual(len(self.stub.requests), 3)
+            await results.aclose()
+
+    async def test_scan(self):
+        txns = [
+            {"confirmed-round": r, "intra-round-offset": i}
+            for r in range(1, 51)
+            for i in range(2)
+        ]
+        self.stub.routes["/v2/transactions"] = (
+            200,
+            transactions_by_round(txns),
+        )
+        async with indexer.AsyncIndexerClient("", self.stub.address) as c:
+            results = c.scan_transactions(1, 50, shard_rounds=7, limit=3)
+            self.assertEqual([txn async for txn in results], txns)
+
+    async def test_iter_error(self):
+        self.stub.routes["/v2/accounts"] = (500, {"message": "failed"})
+        async with indexer.AsyncIndexerClient("", self.stub.address) as c:
+            with self.assertRaisesRegex(error.IndexerHTTPError, "failed"):
+                async for _ in c.iter_accounts():
+                    pass
+
+
+if __name__ == "__main__":
+    unittest.main()